@@ -0,0 +1,93 @@
+import string
+from collections import Counter
+from typing import Callable, Dict, Any, Iterable, List, Optional
+
+from hypothesis_registry import REGISTRY, HypothesisRegistry, HypothesisSession, Model
+
+# Endpoints whose documented behaviour depends on input length
+LENGTH_RULE_ENDPOINTS = ("/alpha", "/glitch")
+
+
+def length_rule_family(max_len: int = 16, moduli: Iterable[int] = (2, 3, 4, 5, 6, 7)) -> Dict[str, Model]:
+    """Parametric length rules, so the search space is larger than a handful of guesses"""
+    models: Dict[str, Model] = {}
+    for k in range(1, max_len + 1):
+        models[f"len_ge_{k}"] = lambda s, k=k: len(s) >= k
+        models[f"len_eq_{k}"] = lambda s, k=k: len(s) == k
+    for m in moduli:
+        for r in range(m):
+            models[f"len_mod_{m}_eq_{r}"] = lambda s, m=m, r=r: len(s) % m == r
+    return models
+
+
+def default_pool(max_len: int = 12) -> List[str]:
+    """Candidate inputs covering lengths, character classes and known keywords"""
+    pool = {""}
+    classes = [string.ascii_lowercase, string.ascii_uppercase, string.digits,
+               "!@#$%^&*()", "aB", "a1", "a!", "ñé", "你好"]
+    for chars in classes:
+        for n in range(1, max_len + 1):
+            pool.add((chars * n)[:n])
+    pool.update(["hello", "Hello", "glitch", "error", "bug", "fail", "fizz", "buzz",
+                 "3", "5", "15", "30", "0", "15abc", "abc15", "-15", "15.5",
+                 "hello world", "123abc", "abc123", "🚀", "a b"])
+    return sorted(pool, key=lambda s: (len(s), s))
+
+
+def _prediction_key(value: Any) -> Any:
+    if isinstance(value, Exception):
+        return ("error",)
+    return (type(value).__name__, value)
+
+
+class ActiveProbeScheduler:
+    """Pick each next probe so that it best splits the surviving candidate rules
+
+    Every pool input is scored by partitioning the survivors on their
+    predicted output. The input whose largest partition is smallest is sent
+    next, so each answer removes as many candidates as possible and a rule is
+    pinned down in roughly log2(candidates) requests.
+    """
+
+    def __init__(self, endpoint: str, models: Dict[str, Model] = None,
+                 pool: List[str] = None, registry: HypothesisRegistry = REGISTRY):
+        if models is None:
+            models = registry.models(endpoint)
+            if endpoint in LENGTH_RULE_ENDPOINTS:
+                models.update(length_rule_family())
+        self.session = HypothesisSession(endpoint, models)
+        self.pool = list(pool if pool is not None else default_pool())
+        self.asked: List[str] = []
+        self._predictions: Dict[str, Dict[str, Any]] = {
+            value: {name: _prediction_key(self.session.predict(name, value)) for name in models}
+            for value in self.pool
+        }
+
+    def split_score(self, value: str):
+        """Sort key for a candidate input: largest partition first, then fewest groups"""
+        predictions = self._predictions[value]
+        groups = Counter(predictions[name] for name in self.session.survivors)
+        return max(groups.values()), -len(groups), len(value)
+
+    def next_input(self) -> Optional[str]:
+        """The unused pool input that best splits the survivors, or None if none splits them"""
+        if self.session.settled:
+            return None
+        asked = set(self.asked)
+        best = min((v for v in self.pool if v not in asked), key=self.split_score, default=None)
+        if best is None or self.split_score(best)[0] == len(self.session.survivors):
+            return None
+        return best
+
+    def observe(self, value: str, output: Any) -> List[str]:
+        self.asked.append(value)
+        return self.session.observe(value, output)
+
+    def run(self, send: Callable[[str], Any], max_probes: int = 64) -> HypothesisSession:
+        """Probe with send(value) -> output until the rule is pinned down or the pool is exhausted"""
+        while len(self.asked) < max_probes:
+            value = self.next_input()
+            if value is None:
+                break
+            self.observe(value, send(value))
+        return self.session
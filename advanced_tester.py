@@ -1,39 +1,53 @@
-import requests
 import json
 import time
 import hashlib
 import base64
 import re
 from typing import Dict, Any, List
-from collections import defaultdict
+
+import numpy as np
+
+from active_scheduler import ActiveProbeScheduler
+from checkpoint import RunCheckpoint
+from feature_table import FeatureTable
+from hypothesis_matcher import BatchHypothesisMatcher
+from hypothesis_registry import REGISTRY
+from probe_engine import ProbeEngine, result_output
+from reporter import Reporter
+from result_sink import JSONLResultSink
+from rule_induction import explain, format_rules
+from timing import report_latency
+from transport import DEFAULT_BASE_URL, HTTPTransport
 
 class AdvancedAPITester:
-    def __init__(self, base_url: str = "https://blackbox-interface.vercel.app"):
-        self.base_url = base_url
-        self.session = requests.Session()
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, concurrency: int = 16,
+                 transport: HTTPTransport = None, sink: JSONLResultSink = None,
+                 checkpoint: RunCheckpoint = None, reporter: Reporter = None):
+        self.transport = transport or HTTPTransport(base_url, pool_size=concurrency)
+        self.base_url = self.transport.base_url
+        self.reporter = reporter or Reporter()
+        self.engine = ProbeEngine(self.test_endpoint, concurrency=concurrency, sink=sink,
+                                  checkpoint=checkpoint, reporter=self.reporter)
         self.results = {}
     
-    def test_endpoint(self, endpoint: str, method: str = "POST", data: Dict = None) -> Dict:
+    def test_endpoint(self, endpoint: str, method: str = "POST", data: Dict = None,
+                      use_memo: bool = True) -> Dict:
         """Test an endpoint and return the response"""
-        url = f"{self.base_url}{endpoint}"
-        
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url)
-            else:
-                response = self.session.post(url, json=data)
+            response = self.transport.request(endpoint, method=method, data=data, use_memo=use_memo)
             
             return {
                 "status_code": response.status_code,
                 "response": response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text,
-                "headers": dict(response.headers)
+                "headers": dict(response.headers),
+                "timing": response.timing
             }
         except Exception as e:
             return {"error": str(e)}
     
     def test_data_endpoint_advanced(self):
         """Advanced testing of /data endpoint"""
-        print("🔍 Advanced /data endpoint analysis...")
+        self.reporter.summary("🔍 Advanced /data endpoint analysis...")
         
         # Test with systematic inputs
         test_cases = [
@@ -75,8 +89,8 @@ class AdvancedAPITester:
         ]
         
         results = []
-        for test_input, description in test_cases:
-            result = self.test_endpoint("/data", data={"data": test_input})
+        responses = self.engine.map("/data", [test_input for test_input, _ in test_cases])
+        for (test_input, description), result in zip(test_cases, responses):
             output = result.get("response", {}).get("result")
             results.append({
                 "input": test_input,
@@ -85,7 +99,7 @@ class AdvancedAPITester:
                 "input_length": len(test_input),
                 "input_sum": sum(ord(c) for c in test_input) if test_input else 0
             })
-            print(f"  {description}: '{test_input}' -> {output}")
+            self.reporter.detail(f"  {description}: '{test_input}' -> {output}")
         
         # Analyze patterns
         self.analyze_data_patterns_advanced(results)
@@ -93,36 +107,25 @@ class AdvancedAPITester:
     
     def analyze_data_patterns_advanced(self, results: List[Dict]):
         """Advanced pattern analysis for /data endpoint"""
-        print("\n📊 Advanced /data pattern analysis:")
-        
-        # Check for hash functions
-        hash_functions = [
-            ("md5_int", lambda s: int(hashlib.md5(s.encode()).hexdigest()[:8], 16)),
-            ("sha1_int", lambda s: int(hashlib.sha1(s.encode()).hexdigest()[:8], 16)),
-            ("simple_hash", lambda s: hash(s) % 10000000),
-            ("sum_ascii", lambda s: sum(ord(c) for c in s)),
-            ("product_ascii", lambda s: 1 if not s else ord(s[0]) * len(s)),
-            ("xor_ascii", lambda s: 0 if not s else ord(s[0]) ^ len(s)),
-            ("crc32", lambda s: abs(hash(s)) % (2**32)),
-        ]
+        self.reporter.summary("\n📊 Advanced /data pattern analysis:")
         
-        for name, func in hash_functions:
-            matches = 0
-            for result in results:
-                try:
-                    if func(result["input"]) == result["output"]:
-                        matches += 1
-                except:
-                    continue
-            
-            if matches == len(results):
-                print(f"  ✅ EXACT MATCH: {name} function")
-                return
-            elif matches > 0:
-                print(f"  🔍 Partial match ({matches}/{len(results)}): {name}")
+        # Check for hash functions, all candidates at once against precomputed digests
+        matches = BatchHypothesisMatcher().match([r["input"] for r in results],
+                                                 [r["output"] for r in results])
+        
+        if matches and matches[0].exact:
+            self.reporter.summary(f"  ✅ EXACT MATCH: {matches[0].name} function")
+            return
+        
+        for match in matches:
+            if match.error:
+                self.reporter.summary(f"  ⚠️ {match.name} failed: {match.error}")
+            elif match.matches > 0:
+                self.reporter.summary(f"  🔍 Partial match ({match.matches}/{match.total}, "
+                                      f"{match.score:.0%}): {match.name} [{match.seconds * 1000:.2f} ms]")
         
         # Check for mathematical patterns
-        print("  🔍 Checking mathematical patterns...")
+        self.reporter.summary("  🔍 Checking mathematical patterns...")
         for result in results:
             if result["output"] and isinstance(result["output"], (int, str)):
                 input_str = result["input"]
@@ -136,14 +139,14 @@ class AdvancedAPITester:
                     for c in input_str:
                         ascii_product *= ord(c)
                     
-                    print(f"    '{input_str}' -> {output}")
-                    print(f"      ASCII sum: {ascii_sum}")
-                    print(f"      ASCII product: {ascii_product}")
-                    print(f"      Length: {len(input_str)}")
+                    self.reporter.detail(f"    '{input_str}' -> {output}")
+                    self.reporter.detail(f"      ASCII sum: {ascii_sum}")
+                    self.reporter.detail(f"      ASCII product: {ascii_product}")
+                    self.reporter.detail(f"      Length: {len(input_str)}")
     
     def test_fizzbuzz_endpoint_advanced(self):
         """Advanced testing of /fizzbuzz endpoint"""
-        print("\n🔍 Advanced /fizzbuzz endpoint analysis...")
+        self.reporter.summary("\n🔍 Advanced /fizzbuzz endpoint analysis...")
         
         # Test with numbers and mixed inputs
         test_cases = [
@@ -184,15 +187,15 @@ class AdvancedAPITester:
         ]
         
         results = []
-        for test_input, description in test_cases:
-            result = self.test_endpoint("/fizzbuzz", data={"data": test_input})
+        responses = self.engine.map("/fizzbuzz", [test_input for test_input, _ in test_cases])
+        for (test_input, description), result in zip(test_cases, responses):
             output = result.get("response", {}).get("result")
             results.append({
                 "input": test_input,
                 "description": description,
                 "output": output
             })
-            print(f"  {description}: '{test_input}' -> {output}")
+            self.reporter.detail(f"  {description}: '{test_input}' -> {output}")
         
         # Analyze FizzBuzz patterns
         self.analyze_fizzbuzz_patterns_advanced(results)
@@ -200,10 +203,10 @@ class AdvancedAPITester:
     
     def analyze_fizzbuzz_patterns_advanced(self, results: List[Dict]):
         """Advanced pattern analysis for /fizzbuzz endpoint"""
-        print("\n📊 Advanced /fizzbuzz pattern analysis:")
+        self.reporter.summary("\n📊 Advanced /fizzbuzz pattern analysis:")
         
         # Check for classic FizzBuzz (divisible by 3 and 5)
-        print("  🔍 Testing classic FizzBuzz logic:")
+        self.reporter.summary("  🔍 Testing classic FizzBuzz logic:")
         for result in results:
             input_str = result["input"]
             
@@ -219,20 +222,26 @@ class AdvancedAPITester:
                         # Classic FizzBuzz: divisible by both 3 and 5
                         is_fizzbuzz = num % 3 == 0 and num % 5 == 0 and num != 0
                         
-                        print(f"    '{input_str}' -> {num} -> FizzBuzz: {is_fizzbuzz} -> API: {result['output']}")
+                        self.reporter.detail(f"    '{input_str}' -> {num} -> FizzBuzz: {is_fizzbuzz} -> API: {result['output']}")
                         
                         if is_fizzbuzz == result["output"]:
-                            print(f"      ✅ MATCH: Classic FizzBuzz logic confirmed!")
+                            self.reporter.detail(f"      ✅ MATCH: Classic FizzBuzz logic confirmed!")
                         else:
-                            print(f"      ❌ MISMATCH: Expected {is_fizzbuzz}, got {result['output']}")
+                            self.reporter.detail(f"      ❌ MISMATCH: Expected {is_fizzbuzz}, got {result['output']}")
                 except:
-                    print(f"    '{input_str}' -> Could not parse number")
+                    self.reporter.detail(f"    '{input_str}' -> Could not parse number")
             else:
-                print(f"    '{input_str}' -> No number found -> API: {result['output']}")
+                self.reporter.detail(f"    '{input_str}' -> No number found -> API: {result['output']}")
+        
+        # Check registered candidate models
+        session = REGISTRY.evaluate("/fizzbuzz", ((r["input"], r["output"]) for r in results))
+        self.reporter.summary(f"\n  🧪 Surviving models: {', '.join(session.survivors) or 'none'}")
+        if not session.survivors:
+            self.print_induced_rules("/fizzbuzz", results)
     
     def test_glitch_endpoint_advanced(self):
         """Advanced testing of /glitch endpoint"""
-        print("\n🔍 Advanced /glitch endpoint analysis...")
+        self.reporter.summary("\n🔍 Advanced /glitch endpoint analysis...")
         
         # Test with systematic patterns
         test_cases = [
@@ -278,16 +287,15 @@ class AdvancedAPITester:
         ]
         
         results = []
-        for test_input, description in test_cases:
-            result = self.test_endpoint("/glitch", data={"data": test_input})
+        responses = self.engine.map("/glitch", [test_input for test_input, _ in test_cases])
+        for (test_input, description), result in zip(test_cases, responses):
             output = result.get("response", {}).get("result")
             results.append({
                 "input": test_input,
                 "description": description,
-                "output": output,
-                "length": len(test_input)
+                "output": output
             })
-            print(f"  {description}: '{test_input}' -> {output}")
+            self.reporter.detail(f"  {description}: '{test_input}' -> {output}")
         
         # Analyze glitch patterns
         self.analyze_glitch_patterns_advanced(results)
@@ -295,47 +303,53 @@ class AdvancedAPITester:
     
     def analyze_glitch_patterns_advanced(self, results: List[Dict]):
         """Advanced pattern analysis for /glitch endpoint"""
-        print("\n📊 Advanced /glitch pattern analysis:")
+        self.reporter.summary("\n📊 Advanced /glitch pattern analysis:")
+        table = FeatureTable([r["input"] for r in results], [r["output"] for r in results])
         
         # Group by output
-        true_inputs = [r for r in results if r["output"] is True]
-        false_inputs = [r for r in results if r["output"] is False]
-        
-        print(f"  True responses ({len(true_inputs)}):")
-        for result in true_inputs:
-            print(f"    '{result['input']}' (length: {result['length']})")
-        
-        print(f"  False responses ({len(false_inputs)}):")
-        for result in false_inputs:
-            print(f"    '{result['input']}' (length: {result['length']})")
+        for label, mask in (("True", table.true), ("False", table.false)):
+            self.reporter.summary(f"  {label} responses ({mask.sum()}):")
+            for input_str, length in zip(table.inputs[mask], table.length[mask]):
+                self.reporter.detail(f"    '{input_str}' (length: {length})")
         
         # Check for length-based patterns
-        print("\n  🔍 Length analysis:")
-        length_groups = defaultdict(list)
-        for result in results:
-            length_groups[result["length"]].append(result)
-        
-        for length, group in sorted(length_groups.items()):
-            true_count = sum(1 for r in group if r["output"] is True)
-            false_count = sum(1 for r in group if r["output"] is False)
-            print(f"    Length {length}: {true_count} true, {false_count} false")
+        self.reporter.summary("\n  🔍 Length analysis:")
+        for length, true_count, false_count in table.crosstab("length"):
+            self.reporter.detail(f"    Length {length}: {true_count} true, {false_count} false")
         
         # Check for content-based patterns
-        print("\n  🔍 Content analysis:")
-        for result in results:
-            input_str = result["input"]
-            
-            # Check for specific words
-            if "glitch" in input_str.lower():
-                print(f"    Contains 'glitch': '{input_str}' -> {result['output']}")
-            if "error" in input_str.lower():
-                print(f"    Contains 'error': '{input_str}' -> {result['output']}")
-            if "bug" in input_str.lower():
-                print(f"    Contains 'bug': '{input_str}' -> {result['output']}")
+        self.reporter.summary("\n  🔍 Content analysis:")
+        words = {word: table.contains(word) for word in ("glitch", "error", "bug")}
+        for i in np.flatnonzero(np.any(list(words.values()), axis=0)):
+            for word, mask in words.items():
+                if mask[i]:
+                    self.reporter.detail(f"    Contains '{word}': '{table.inputs[i]}' -> {results[i]['output']}")
+        self.print_feature_correlations(table)
+        
+        # Check registered candidate models
+        session = REGISTRY.evaluate("/glitch", ((r["input"], r["output"]) for r in results))
+        self.reporter.summary(f"\n  🧪 Surviving models: {', '.join(session.survivors) or 'none'}")
+        if not session.survivors:
+            self.print_induced_rules("/glitch", results, table)
+    
+    def print_induced_rules(self, endpoint: str, results: List[Dict], table: FeatureTable = None):
+        """Fit a compact rule set to the observed boolean outputs and print it"""
+        induced = explain(endpoint, [r["input"] for r in results], [r["output"] for r in results], table)
+        if induced is not None:
+            for line in format_rules(induced):
+                self.reporter.summary(f"  🧠 {line}")
+    
+    def print_feature_correlations(self, table: FeatureTable, top: int = 5):
+        """Print the input features most correlated with a boolean output"""
+        correlations = list(table.correlations().items())[:top]
+        if correlations:
+            self.reporter.summary("\n  🔍 Strongest features:")
+            for name, value in correlations:
+                self.reporter.summary(f"    {name}: {value:+.2f}")
     
     def test_zap_endpoint_advanced(self):
         """Advanced testing of /zap endpoint"""
-        print("\n🔍 Advanced /zap endpoint analysis...")
+        self.reporter.summary("\n🔍 Advanced /zap endpoint analysis...")
         
         # Test with various inputs
         test_cases = [
@@ -366,8 +380,8 @@ class AdvancedAPITester:
         ]
         
         results = []
-        for test_input, description in test_cases:
-            result = self.test_endpoint("/zap", data={"data": test_input})
+        responses = self.engine.map("/zap", [test_input for test_input, _ in test_cases])
+        for (test_input, description), result in zip(test_cases, responses):
             output = result.get("response", {}).get("result")
             results.append({
                 "input": test_input,
@@ -375,7 +389,7 @@ class AdvancedAPITester:
                 "output": output,
                 "is_echo": test_input == output
             })
-            print(f"  {description}: '{test_input}' -> '{output}'")
+            self.reporter.detail(f"  {description}: '{test_input}' -> '{output}'")
         
         # Analyze zap patterns
         self.analyze_zap_patterns_advanced(results)
@@ -383,26 +397,26 @@ class AdvancedAPITester:
     
     def analyze_zap_patterns_advanced(self, results: List[Dict]):
         """Advanced pattern analysis for /zap endpoint"""
-        print("\n📊 Advanced /zap pattern analysis:")
+        self.reporter.summary("\n📊 Advanced /zap pattern analysis:")
         
         # Check echo behavior
         echo_count = sum(1 for r in results if r["is_echo"])
         total_count = len(results)
         
-        print(f"  Echo behavior: {echo_count}/{total_count} inputs echoed exactly")
+        self.reporter.summary(f"  Echo behavior: {echo_count}/{total_count} inputs echoed exactly")
         
         if echo_count == total_count:
-            print("  ✅ PERFECT ECHO: All inputs returned as-is")
+            self.reporter.summary("  ✅ PERFECT ECHO: All inputs returned as-is")
         else:
-            print("  🔍 Partial echo - checking for transformations...")
+            self.reporter.summary("  🔍 Partial echo - checking for transformations...")
             
             for result in results:
                 if not result["is_echo"]:
-                    print(f"    Transformation: '{result['input']}' -> '{result['output']}'")
+                    self.reporter.detail(f"    Transformation: '{result['input']}' -> '{result['output']}'")
     
     def test_alpha_endpoint_advanced(self):
         """Advanced testing of /alpha endpoint"""
-        print("\n🔤 Advanced /alpha endpoint analysis...")
+        self.reporter.summary("\n🔤 Advanced /alpha endpoint analysis...")
         
         # Test with systematic patterns
         test_cases = [
@@ -441,19 +455,15 @@ class AdvancedAPITester:
         ]
         
         results = []
-        for test_input, description in test_cases:
-            result = self.test_endpoint("/alpha", data={"data": test_input})
+        responses = self.engine.map("/alpha", [test_input for test_input, _ in test_cases])
+        for (test_input, description), result in zip(test_cases, responses):
             output = result.get("response", {}).get("result")
             results.append({
                 "input": test_input,
                 "description": description,
-                "output": output,
-                "length": len(test_input),
-                "is_alpha": test_input.isalpha(),
-                "is_digit": test_input.isdigit(),
-                "is_alphanumeric": test_input.isalnum()
+                "output": output
             })
-            print(f"  {description}: '{test_input}' -> {output}")
+            self.reporter.detail(f"  {description}: '{test_input}' -> {output}")
         
         # Analyze alpha patterns
         self.analyze_alpha_patterns_advanced(results)
@@ -461,58 +471,70 @@ class AdvancedAPITester:
     
     def analyze_alpha_patterns_advanced(self, results: List[Dict]):
         """Advanced pattern analysis for /alpha endpoint"""
-        print("\n📊 Advanced /alpha pattern analysis:")
+        self.reporter.summary("\n📊 Advanced /alpha pattern analysis:")
+        table = FeatureTable([r["input"] for r in results], [r["output"] for r in results])
         
         # Group by output
-        true_inputs = [r for r in results if r["output"] is True]
-        false_inputs = [r for r in results if r["output"] is False]
-        
-        print(f"  True responses ({len(true_inputs)}):")
-        for result in true_inputs:
-            print(f"    '{result['input']}' (length: {result['length']}, alpha: {result['is_alpha']})")
-        
-        print(f"  False responses ({len(false_inputs)}):")
-        for result in false_inputs:
-            print(f"    '{result['input']}' (length: {result['length']}, alpha: {result['is_alpha']})")
+        for label, mask in (("True", table.true), ("False", table.false)):
+            self.reporter.summary(f"  {label} responses ({mask.sum()}):")
+            for input_str, length, is_alpha in zip(table.inputs[mask], table.length[mask], table.is_alpha[mask]):
+                self.reporter.detail(f"    '{input_str}' (length: {length}, alpha: {is_alpha})")
         
         # Check for alphabetical patterns
-        print("\n  🔍 Alphabetical analysis:")
-        alpha_true = [r for r in true_inputs if r["is_alpha"]]
-        alpha_false = [r for r in false_inputs if r["is_alpha"]]
-        non_alpha_true = [r for r in true_inputs if not r["is_alpha"]]
-        non_alpha_false = [r for r in false_inputs if not r["is_alpha"]]
-        
-        print(f"    Alphabetic strings - True: {len(alpha_true)}, False: {len(alpha_false)}")
-        print(f"    Non-alphabetic strings - True: {len(non_alpha_true)}, False: {len(non_alpha_false)}")
+        self.reporter.summary("\n  🔍 Alphabetical analysis:")
+        counts = {value: (t, f) for value, t, f in table.crosstab("is_alpha")}
+        alpha_true, alpha_false = counts.get(True, (0, 0))
+        non_alpha_true, non_alpha_false = counts.get(False, (0, 0))
+        self.reporter.summary(f"    Alphabetic strings - True: {alpha_true}, False: {alpha_false}")
+        self.reporter.summary(f"    Non-alphabetic strings - True: {non_alpha_true}, False: {non_alpha_false}")
         
         # Check for length-based patterns
-        print("\n  🔍 Length analysis:")
-        length_groups = defaultdict(list)
-        for result in results:
-            length_groups[result["length"]].append(result)
-        
-        for length, group in sorted(length_groups.items()):
-            true_count = sum(1 for r in group if r["output"] is True)
-            false_count = sum(1 for r in group if r["output"] is False)
-            print(f"    Length {length}: {true_count} true, {false_count} false")
+        self.reporter.summary("\n  🔍 Length analysis:")
+        for length, true_count, false_count in table.crosstab("length"):
+            self.reporter.detail(f"    Length {length}: {true_count} true, {false_count} false")
         
         # Check for specific content patterns
-        print("\n  🔍 Content analysis:")
-        for result in results:
-            input_str = result["input"]
-            
-            # Check for specific words
-            if "alpha" in input_str.lower():
-                print(f"    Contains 'alpha': '{input_str}' -> {result['output']}")
-            if input_str.isdigit():
-                print(f"    All digits: '{input_str}' -> {result['output']}")
-            if input_str.isalpha():
-                print(f"    All alphabetic: '{input_str}' -> {result['output']}")
+        self.reporter.summary("\n  🔍 Content analysis:")
+        contains_alpha = table.contains("alpha")
+        for i in np.flatnonzero(contains_alpha | table.is_digit | table.is_alpha):
+            if contains_alpha[i]:
+                self.reporter.detail(f"    Contains 'alpha': '{table.inputs[i]}' -> {results[i]['output']}")
+            if table.is_digit[i]:
+                self.reporter.detail(f"    All digits: '{table.inputs[i]}' -> {results[i]['output']}")
+            if table.is_alpha[i]:
+                self.reporter.detail(f"    All alphabetic: '{table.inputs[i]}' -> {results[i]['output']}")
+        self.print_feature_correlations(table)
+        
+        # Check registered candidate models
+        session = REGISTRY.evaluate("/alpha", ((r["input"], r["output"]) for r in results))
+        self.reporter.summary(f"\n  🧪 Surviving models: {', '.join(session.survivors) or 'none'}")
+        if not session.survivors:
+            self.print_induced_rules("/alpha", results, table)
+    
+    def identify_rule_adaptively(self, endpoint: str, max_probes: int = 32):
+        """Pin down a boolean endpoint's rule with as few requests as possible"""
+        self.reporter.summary(f"\n🎯 Adaptive rule search for {endpoint}...")
+        scheduler = ActiveProbeScheduler(endpoint)
+        candidates = len(scheduler.session.survivors)
+        
+        def send(value):
+            output = result_output(self.test_endpoint(endpoint, data={"data": value}))
+            self.reporter.detail(f"  '{value}' -> {output}")
+            return output
+        
+        session = scheduler.run(send, max_probes=max_probes)
+        if session.resolved:
+            self.reporter.summary(f"  ✅ Rule: {session.answer} ({len(scheduler.asked)} requests, {candidates} candidates)")
+        elif session.survivors:
+            self.reporter.summary(f"  🔍 Indistinguishable on the probe pool: {', '.join(session.survivors)}")
+        else:
+            self.reporter.summary("  ❓ No candidate rule matches - needs more investigation")
+        return session
     
     def run_advanced_analysis(self):
         """Run advanced analysis on all endpoints"""
-        print("🚀 Starting advanced API analysis...")
-        print("=" * 60)
+        self.reporter.summary("🚀 Starting advanced API analysis...")
+        self.reporter.summary("=" * 60)
         
         # Test all endpoints with advanced methods
         self.results["data"] = self.test_data_endpoint_advanced()
@@ -526,47 +548,51 @@ class AdvancedAPITester:
     
     def generate_advanced_report(self):
         """Generate advanced analysis report"""
-        print("\n" + "=" * 60)
-        print("📋 ADVANCED ANALYSIS REPORT")
-        print("=" * 60)
+        self.reporter.summary("\n" + "=" * 60)
+        self.reporter.summary("📋 ADVANCED ANALYSIS REPORT")
+        self.reporter.summary("=" * 60)
         
-        print("\n🎯 CONFIRMED BEHAVIORS:")
-        print("-" * 30)
+        self.reporter.summary("\n🎯 CONFIRMED BEHAVIORS:")
+        self.reporter.summary("-" * 30)
         
         # Data endpoint
-        print("\n📊 /data endpoint:")
-        print("  ✅ Confirmed: Returns integer hash/transformation of input")
-        print("  🔍 Pattern: Mathematical function of input string")
+        self.reporter.summary("\n📊 /data endpoint:")
+        self.reporter.summary("  ✅ Confirmed: Returns integer hash/transformation of input")
+        self.reporter.summary("  🔍 Pattern: Mathematical function of input string")
         
         # FizzBuzz endpoint
-        print("\n🎯 /fizzbuzz endpoint:")
-        print("  ✅ Confirmed: Implements FizzBuzz logic")
-        print("  🔍 Pattern: Returns true for numbers divisible by both 3 and 5")
+        self.reporter.summary("\n🎯 /fizzbuzz endpoint:")
+        self.reporter.summary("  ✅ Confirmed: Implements FizzBuzz logic")
+        self.reporter.summary("  🔍 Pattern: Returns true for numbers divisible by both 3 and 5")
         
         # Glitch endpoint
-        print("\n⚡ /glitch endpoint:")
-        print("  🔍 Pattern: Boolean response based on input characteristics")
-        print("  📝 Analysis: Length and content-based logic")
+        self.reporter.summary("\n⚡ /glitch endpoint:")
+        self.reporter.summary("  🔍 Pattern: Boolean response based on input characteristics")
+        self.reporter.summary("  📝 Analysis: Length and content-based logic")
         
         # Zap endpoint
-        print("\n⚡ /zap endpoint:")
-        print("  ✅ Confirmed: Echo function")
-        print("  🔍 Pattern: Returns input string as-is")
+        self.reporter.summary("\n⚡ /zap endpoint:")
+        self.reporter.summary("  ✅ Confirmed: Echo function")
+        self.reporter.summary("  🔍 Pattern: Returns input string as-is")
         
         # Alpha endpoint
-        print("\n🎯 /alpha endpoint:")
-        print("  ✅ Confirmed: Returns true for alphabetic strings")
-        print("  🔍 Pattern: Returns true for alphabetic strings")
-        
-        print("\n" + "=" * 60)
-        print("🎯 FINAL CONCLUSIONS:")
-        print("-" * 30)
-        print("1. /data: Hash function or mathematical transformation")
-        print("2. /time: Fixed value (not time-based)")
-        print("3. /fizzbuzz: Classic FizzBuzz algorithm")
-        print("4. /glitch: Pattern-based boolean logic")
-        print("5. /zap: Simple echo function")
-        print("6. /alpha: Returns true for alphabetic strings")
+        self.reporter.summary("\n🎯 /alpha endpoint:")
+        self.reporter.summary("  ✅ Confirmed: Returns true for alphabetic strings")
+        self.reporter.summary("  🔍 Pattern: Returns true for alphabetic strings")
+        
+        self.reporter.summary("\n" + "=" * 60)
+        self.reporter.summary("🎯 FINAL CONCLUSIONS:")
+        self.reporter.summary("-" * 30)
+        self.reporter.summary("1. /data: Hash function or mathematical transformation")
+        self.reporter.summary("2. /time: Fixed value (not time-based)")
+        self.reporter.summary("3. /fizzbuzz: Classic FizzBuzz algorithm")
+        self.reporter.summary("4. /glitch: Pattern-based boolean logic")
+        self.reporter.summary("5. /zap: Simple echo function")
+        self.reporter.summary("6. /alpha: Returns true for alphabetic strings")
+
+        if self.transport.memo is not None:
+            self.reporter.summary(f"\n♻️  Duplicate requests saved: {self.transport.memo.saved}")
+        report_latency(self.transport, self.reporter)
 
 if __name__ == "__main__":
     tester = AdvancedAPITester()
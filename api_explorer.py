@@ -1,26 +1,42 @@
-import requests
 import json
 import time
 from typing import Dict, Any, List
 import base64
 import hashlib
 import re
+from collections import Counter
+
+from checkpoint import RunCheckpoint
+from corpus import Corpus, default_corpus
+from drift import DEFAULT_BASELINE_PATH, BaselineSnapshot, DriftMonitor, format_drift_report
+from fanout import FanOut, format_diff_matrix
+from hypothesis_registry import REGISTRY, identify
+from offline_analysis import analyze_file, format_pattern_stats
+from payload_probe import MB, PayloadProber, format_payload_report
+from probe_engine import ProbeEngine
+from reporter import Reporter
+from result_sink import JSONLResultSink
+from rule_induction import explain, format_rules
+from time_sampler import TimeSampler, format_time_report
+from timing import report_latency
+from transport import DEFAULT_BASE_URL, HTTPTransport
 
 class APIExplorer:
-    def __init__(self, base_url: str = "https://blackbox-interface.vercel.app"):
-        self.base_url = base_url
-        self.session = requests.Session()
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, concurrency: int = 16,
+                 transport: HTTPTransport = None, sink: JSONLResultSink = None,
+                 checkpoint: RunCheckpoint = None, reporter: Reporter = None):
+        self.transport = transport or HTTPTransport(base_url, pool_size=concurrency)
+        self.base_url = self.transport.base_url
+        self.reporter = reporter or Reporter()
+        self.engine = ProbeEngine(self.test_endpoint, concurrency=concurrency, sink=sink,
+                                  checkpoint=checkpoint, reporter=self.reporter)
         self.findings = {}
     
-    def test_endpoint(self, endpoint: str, method: str = "POST", data: Dict = None) -> Dict:
+    def test_endpoint(self, endpoint: str, method: str = "POST", data: Dict = None,
+                      use_memo: bool = True) -> Dict:
         """Test an endpoint and return the response"""
-        url = f"{self.base_url}{endpoint}"
-        
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url)
-            else:
-                response = self.session.post(url, json=data)
+            response = self.transport.request(endpoint, method=method, data=data, use_memo=use_memo)
             
             # Check if response is JSON
             if response.headers.get('content-type', '').startswith('application/json'):
@@ -31,31 +47,26 @@ class APIExplorer:
             return {
                 "status_code": response.status_code,
                 "response": response_data,
-                "headers": dict(response.headers)
+                "headers": dict(response.headers),
+                "timing": response.timing
             }
         except Exception as e:
             return {"error": str(e), "response": {}, "status_code": None}
     
-    def explore_data_endpoint(self):
+    def explore_data_endpoint(self, corpus: Corpus = None):
         """Explore the /data endpoint"""
-        print("🔍 Exploring /data endpoint...")
+        self.reporter.summary("🔍 Exploring /data endpoint...")
         findings = []
         
-        # Test with different string inputs
-        test_cases = [
-            "hello", "world", "test", "123", "abc", "", "a", "aa", "aaa",
-            "Hello World", "hello world", "HELLO", "hello123", "123hello",
-            "special!@#$%", "unicode: 🚀", "very long string " * 100
-        ]
-        
-        for test_input in test_cases:
-            result = self.test_endpoint("/data", data={"data": test_input})
+        # Stream the corpus through the engine rather than building it up front
+        inputs = corpus if corpus is not None else default_corpus("/data")
+        for test_input, result in self.engine.map_stream("/data", inputs):
             findings.append({
                 "input": test_input,
                 "output": result.get("response", {}).get("result"),
                 "status": result.get("status_code")
             })
-            print(f"  Input: '{test_input}' -> Output: {result.get('response', {}).get('result')}")
+            self.reporter.detail(f"  Input: '{test_input}' -> Output: {result.get('response', {}).get('result')}")
         
         # Analyze patterns
         self.analyze_data_patterns(findings)
@@ -63,78 +74,155 @@ class APIExplorer:
     
     def analyze_data_patterns(self, findings: List[Dict]):
         """Analyze patterns in /data endpoint responses"""
-        print("\n📊 Analyzing /data patterns:")
-        
-        # Check if it's a hash function
-        for finding in findings:
-            if finding["output"] and isinstance(finding["output"], (int, str)):
-                # Try common hash functions
-                input_str = str(finding["input"])
-                
-                # Check if it's a simple hash
-                if isinstance(finding["output"], int):
-                    # Try different hash methods
-                    hash_functions = [
-                        ("len", len),
-                        ("sum_ascii", lambda s: sum(ord(c) for c in s)),
-                        ("product_ascii", lambda s: 1 if not s else ord(s[0]) * len(s)),
-                        ("crc32", lambda s: abs(hash(s)) % (2**32)),
-                        ("simple_hash", lambda s: hash(s) % 10000000)
-                    ]
-                    
-                    for name, func in hash_functions:
-                        try:
-                            if func(input_str) == finding["output"]:
-                                print(f"  ✅ Found pattern: {name} function")
-                                return
-                        except:
-                            continue
-        
-        print("  ❓ Pattern not immediately obvious - needs more investigation")
+        self.reporter.summary("\n📊 Analyzing /data patterns:")
+        self.report_hypotheses("/data", findings)
+    
+    def report_hypotheses(self, endpoint: str, findings: List[Dict]):
+        """Prune the registered models for an endpoint and print what survives"""
+        session = REGISTRY.evaluate(endpoint, ((f["input"], f["output"]) for f in findings))
+        
+        if session.resolved:
+            self.reporter.summary(f"  ✅ Found pattern: {session.answer} function")
+        elif session.survivors:
+            self.reporter.summary(f"  🔍 Still consistent with: {', '.join(session.survivors)}")
+        else:
+            induced = explain(endpoint, [f["input"] for f in findings], [f["output"] for f in findings])
+            if induced is None:
+                self.reporter.summary("  ❓ Pattern not immediately obvious - needs more investigation")
+            else:
+                for line in format_rules(induced):
+                    self.reporter.summary(f"  🧠 {line}")
+        return session
+    
+    def identify_endpoint(self, endpoint: str, test_cases: List[str]):
+        """Probe an endpoint only until a single registered model survives"""
+        self.reporter.summary(f"\n🔍 Identifying {endpoint} endpoint...")
+        session = identify(self.engine, endpoint, test_cases)
+        
+        if session.resolved:
+            self.reporter.summary(f"  ✅ Found pattern: {session.answer} after {session.observations} probes")
+        elif session.survivors:
+            self.reporter.summary(f"  🔍 Still consistent with: {', '.join(session.survivors)}")
+        else:
+            self.reporter.summary("  ❓ No registered model matches - needs more investigation")
+        return session
+    
+    def fuzz_endpoint(self, endpoint: str, corpus: Corpus, window: int = None):
+        """Stream a large corpus at an endpoint, keeping only summary counts in memory
+
+        Per-input rows go to the result sink, if there is one. Fuzz probes
+        skip the request memo, so nothing is held per input.
+        """
+        self.reporter.summary(f"\n🧨 Fuzzing {endpoint} endpoint...")
+        statuses = Counter()
+        output_types = Counter()
+        distinct = set()
+        for test_input, result in self.engine.map_stream(endpoint, corpus, window=window, memo=False):
+            statuses[result.get("status_code")] += 1
+            output = result.get("response", {}).get("result")
+            output_types[type(output).__name__] += 1
+            if len(distinct) < 10_000:
+                distinct.add(repr(output))
+        
+        total = sum(statuses.values())
+        self.reporter.summary(f"  Sent: {total} inputs")
+        self.reporter.summary(f"  Status codes: {dict(statuses)}")
+        self.reporter.summary(f"  Output types: {dict(output_types)}")
+        self.reporter.summary(f"  Distinct outputs: {len(distinct)}{'+' if len(distinct) >= 10_000 else ''}")
+        return {"sent": total, "statuses": dict(statuses), "output_types": dict(output_types),
+                "distinct_outputs": len(distinct)}
+    
+    def analyze_capture(self, path: str, endpoints: List[str] = None, workers: int = None):
+        """Analyze a saved JSONL capture across a process pool, without sending requests"""
+        self.reporter.summary(f"\n🗂️  Analyzing capture {path}...")
+        merged = analyze_file(path, endpoints, workers)
+        for endpoint in sorted(merged):
+            for line in format_pattern_stats(merged[endpoint]):
+                self.reporter.summary(f"  {line}")
+        return merged
+    
+    def explore_payload_limits(self, endpoints: List[str] = ("/data", "/zap"), high: int = 100 * MB):
+        """Bisect for each endpoint's maximum accepted request body size"""
+        self.reporter.summary("\n📦 Probing payload size limits...")
+        prober = PayloadProber(self.transport, sink=self.engine.sink)
+        reports = []
+        for endpoint in endpoints:
+            reports.append(prober.find_max_payload(endpoint, high=high))
+            self.reporter.summary(f"  {format_payload_report(reports[-1])}")
+        return reports
     
-    def explore_time_endpoint(self):
+    def check_drift(self, baseline: str = DEFAULT_BASELINE_PATH,
+                    endpoints: List[str] = ("/data", "/fizzbuzz", "/glitch", "/zap", "/alpha"),
+                    rate: float = 1.0, seed: int = 0, update: bool = False):
+        """Re-probe a baseline snapshot and report changed outputs; missing baselines are recorded"""
+        self.reporter.summary(f"\n🛰️  Checking behavior drift against {baseline}...")
+        with BaselineSnapshot(baseline) as snapshot:
+            monitor = DriftMonitor(self.transport, snapshot, self.engine.concurrency,
+                                   sink=self.engine.sink, reporter=self.reporter)
+            reports = monitor.check_all(list(endpoints), rate, seed, update, record_from=default_corpus)
+        for report in reports:
+            for line in format_drift_report(report):
+                self.reporter.summary(f"  {line}")
+        return reports
+    
+    def compare_targets(self, targets: Dict[str, HTTPTransport],
+                        endpoints: List[str] = ("/data", "/fizzbuzz", "/glitch", "/zap", "/alpha"),
+                        corpus: Corpus = None, window: int = None, name: str = "base"):
+        """Send the same inputs to this explorer's target and every other one, and diff the answers
+
+        This explorer's transport is the first column, under `name`. Without a
+        corpus each endpoint gets its default_corpus(). Per-input rows go to
+        the result sink, if there is one.
+        """
+        transports = {name: self.transport, **targets}
+        self.reporter.summary(f"\n🔀 Comparing {', '.join(transports)}...")
+        fanout = FanOut(transports, self.engine.concurrency, sink=self.engine.sink, reporter=self.reporter)
+        matrices = []
+        for endpoint in endpoints:
+            inputs = corpus if corpus is not None else default_corpus(endpoint)
+            matrices.append(fanout.compare(endpoint, inputs, window=window))
+            for line in format_diff_matrix(matrices[-1]):
+                self.reporter.summary(f"  {line}")
+        return matrices
+    
+    def explore_time_endpoint(self, sampler: TimeSampler = None, duration: float = 2.0):
         """Explore the /time endpoint"""
-        print("\n🔍 Exploring /time endpoint...")
+        self.reporter.summary("\n🔍 Exploring /time endpoint...")
         
-        # Test multiple times to see if it changes
-        results = []
-        for i in range(5):
-            result = self.test_endpoint("/time", method="GET")
-            results.append(result.get("response", {}).get("result"))
-            print(f"  Call {i+1}: {result.get('response', {}).get('result')}")
-            time.sleep(1)
+        # Sample it on a tight schedule to see if it changes
+        if sampler is None:
+            sampler = TimeSampler(self.transport, interval=0.1).start()
+            time.sleep(duration)
+        report = sampler.stop(min_samples=5)
+        results = [sample.value for sample in sampler.samples]
+        for line in format_time_report(report):
+            self.reporter.summary(f"  {line}")
         
         # Check if it's related to current time
         current_time = int(time.time())
-        print(f"  Current Unix timestamp: {current_time}")
+        self.reporter.summary(f"  Current Unix timestamp: {current_time}")
         
         # Check if it's a fixed value or time-based
-        if len(set(results)) == 1:
-            print("  📝 Result: Fixed value (not time-based)")
+        if report["verdict"] == "fixed":
+            self.reporter.summary("  📝 Result: Fixed value (not time-based)")
         else:
-            print("  📝 Result: Time-based value")
+            self.reporter.summary(f"  📝 Result: Time-based value ({report['verdict']})")
         
         return results
     
-    def explore_fizzbuzz_endpoint(self):
+    def explore_fizzbuzz_endpoint(self, corpus: Corpus = None):
         """Explore the /fizzbuzz endpoint"""
-        print("\n🔍 Exploring /fizzbuzz endpoint...")
+        self.reporter.summary("\n🔍 Exploring /fizzbuzz endpoint...")
         findings = []
         
-        # Test with numbers as strings
-        test_cases = [
-            "1", "2", "3", "4", "5", "15", "30", "45", "60", "75", "90", "105",
-            "hello", "world", "abc", "123", "15abc", "abc15", "fizz", "buzz", "fizzbuzz"
-        ]
-        
-        for test_input in test_cases:
-            result = self.test_endpoint("/fizzbuzz", data={"data": test_input})
+        inputs = corpus if corpus is not None else default_corpus("/fizzbuzz")
+        for test_input, result in self.engine.map_stream("/fizzbuzz", inputs):
             findings.append({
                 "input": test_input,
                 "output": result.get("response", {}).get("result"),
                 "status": result.get("status_code")
             })
-            print(f"  Input: '{test_input}' -> Output: {result.get('response', {}).get('result')}")
+            self.reporter.detail(f"  Input: '{test_input}' -> Output: {result.get('response', {}).get('result')}")
         
         # Analyze FizzBuzz patterns
         self.analyze_fizzbuzz_patterns(findings)
@@ -142,50 +230,22 @@ class APIExplorer:
     
     def analyze_fizzbuzz_patterns(self, findings: List[Dict]):
         """Analyze patterns in /fizzbuzz endpoint responses"""
-        print("\n📊 Analyzing /fizzbuzz patterns:")
-        
-        # Check if it's classic FizzBuzz logic
-        for finding in findings:
-            input_str = str(finding["input"])
-            
-            # Try to extract number from input
-            numbers = re.findall(r'\d+', input_str)
-            if numbers:
-                num = int(numbers[0])
-                expected = False
-                
-                # Classic FizzBuzz: divisible by 3 and 5
-                if num % 3 == 0 and num % 5 == 0:
-                    expected = True
-                
-                if expected == finding["output"]:
-                    print(f"  ✅ Found pattern: Classic FizzBuzz (divisible by 3 and 5)")
-                    return
-        
-        # Check other patterns
-        print("  ❓ Pattern not immediately obvious - needs more investigation")
+        self.reporter.summary("\n📊 Analyzing /fizzbuzz patterns:")
+        self.report_hypotheses("/fizzbuzz", findings)
     
-    def explore_glitch_endpoint(self):
+    def explore_glitch_endpoint(self, corpus: Corpus = None):
         """Explore the /glitch endpoint"""
-        print("\n🔍 Exploring /glitch endpoint...")
+        self.reporter.summary("\n🔍 Exploring /glitch endpoint...")
         findings = []
         
-        # Test with various inputs
-        test_cases = [
-            "hello", "world", "test", "123", "abc", "", "a", "aa", "aaa",
-            "Hello World", "hello world", "HELLO", "hello123", "123hello",
-            "glitch", "error", "bug", "fail", "success", "true", "false",
-            "special!@#$%", "unicode: 🚀", "very long string " * 100
-        ]
-        
-        for test_input in test_cases:
-            result = self.test_endpoint("/glitch", data={"data": test_input})
+        inputs = corpus if corpus is not None else default_corpus("/glitch")
+        for test_input, result in self.engine.map_stream("/glitch", inputs):
             findings.append({
                 "input": test_input,
                 "output": result.get("response", {}).get("result"),
                 "status": result.get("status_code")
             })
-            print(f"  Input: '{test_input}' -> Output: {result.get('response', {}).get('result')}")
+            self.reporter.detail(f"  Input: '{test_input}' -> Output: {result.get('response', {}).get('result')}")
         
         # Analyze glitch patterns
         self.analyze_glitch_patterns(findings)
@@ -193,46 +253,38 @@ class APIExplorer:
     
     def analyze_glitch_patterns(self, findings: List[Dict]):
         """Analyze patterns in /glitch endpoint responses"""
-        print("\n📊 Analyzing /glitch patterns:")
+        self.reporter.summary("\n📊 Analyzing /glitch patterns:")
         
         # Check for length-based patterns
         true_count = sum(1 for f in findings if f["output"] is True)
         false_count = sum(1 for f in findings if f["output"] is False)
         
-        print(f"  True responses: {true_count}, False responses: {false_count}")
+        self.reporter.summary(f"  True responses: {true_count}, False responses: {false_count}")
         
         # Check if it's based on input length
         for finding in findings:
             input_len = len(str(finding["input"]))
             if finding["output"] is True:
-                print(f"    True for length {input_len}: '{finding['input']}'")
+                self.reporter.detail(f"    True for length {input_len}: '{finding['input']}'")
             else:
-                print(f"    False for length {input_len}: '{finding['input']}'")
+                self.reporter.detail(f"    False for length {input_len}: '{finding['input']}'")
         
         # Look for specific patterns
-        print("  ❓ Pattern not immediately obvious - needs more investigation")
+        self.report_hypotheses("/glitch", findings)
     
-    def explore_zap_endpoint(self):
+    def explore_zap_endpoint(self, corpus: Corpus = None):
         """Explore the /zap endpoint"""
-        print("\n🔍 Exploring /zap endpoint...")
+        self.reporter.summary("\n🔍 Exploring /zap endpoint...")
         findings = []
         
-        # Test with various inputs
-        test_cases = [
-            "hello", "world", "test", "123", "abc", "", "a", "aa", "aaa",
-            "Hello World", "hello world", "HELLO", "hello123", "123hello",
-            "zap", "ZAP", "Zap", "zAp", "zaP", "ZaP", "zAP", "ZAp",
-            "special!@#$%", "unicode: 🚀", "very long string " * 100
-        ]
-        
-        for test_input in test_cases:
-            result = self.test_endpoint("/zap", data={"data": test_input})
+        inputs = corpus if corpus is not None else default_corpus("/zap")
+        for test_input, result in self.engine.map_stream("/zap", inputs):
             findings.append({
                 "input": test_input,
                 "output": result.get("response", {}).get("result"),
                 "status": result.get("status_code")
             })
-            print(f"  Input: '{test_input}' -> Output: {result.get('response', {}).get('result')}")
+            self.reporter.detail(f"  Input: '{test_input}' -> Output: {result.get('response', {}).get('result')}")
         
         # Analyze zap patterns
         self.analyze_zap_patterns(findings)
@@ -240,7 +292,7 @@ class APIExplorer:
     
     def analyze_zap_patterns(self, findings: List[Dict]):
         """Analyze patterns in /zap endpoint responses"""
-        print("\n📊 Analyzing /zap patterns:")
+        self.reporter.summary("\n📊 Analyzing /zap patterns:")
         
         # Check if it's an echo function
         echo_count = 0
@@ -249,36 +301,28 @@ class APIExplorer:
                 echo_count += 1
         
         if echo_count == len(findings):
-            print("  ✅ Found pattern: Echo function (returns input as-is)")
+            self.reporter.summary("  ✅ Found pattern: Echo function (returns input as-is)")
         else:
-            print(f"  ❓ Partial echo: {echo_count}/{len(findings)} inputs echoed")
+            self.reporter.summary(f"  ❓ Partial echo: {echo_count}/{len(findings)} inputs echoed")
             
             # Check for transformations
             for finding in findings:
                 if finding["input"] != finding["output"]:
-                    print(f"    Transformation: '{finding['input']}' -> '{finding['output']}'")
+                    self.reporter.detail(f"    Transformation: '{finding['input']}' -> '{finding['output']}'")
     
-    def explore_alpha_endpoint(self):
+    def explore_alpha_endpoint(self, corpus: Corpus = None):
         """Explore the /alpha endpoint"""
-        print("\n🔤 Exploring /alpha endpoint...")
+        self.reporter.summary("\n🔤 Exploring /alpha endpoint...")
         findings = []
         
-        # Test with various inputs
-        test_cases = [
-            "hello", "world", "test", "123", "abc", "", "a", "aa", "aaa",
-            "Hello World", "hello world", "HELLO", "hello123", "123hello",
-            "alpha", "ALPHA", "Alpha", "aLPHA", "alPHA", "alpHA", "alphA",
-            "special!@#$%", "unicode: 🚀", "very long string " * 100
-        ]
-        
-        for test_input in test_cases:
-            result = self.test_endpoint("/alpha", data={"data": test_input})
+        inputs = corpus if corpus is not None else default_corpus("/alpha")
+        for test_input, result in self.engine.map_stream("/alpha", inputs):
             findings.append({
                 "input": test_input,
                 "output": result.get("response", {}).get("result"),
                 "status": result.get("status_code")
             })
-            print(f"  Input: '{test_input}' -> Output: {result.get('response', {}).get('result')}")
+            self.reporter.detail(f"  Input: '{test_input}' -> Output: {result.get('response', {}).get('result')}")
         
         # Analyze alpha patterns
         self.analyze_alpha_patterns(findings)
@@ -286,105 +330,116 @@ class APIExplorer:
     
     def analyze_alpha_patterns(self, findings: List[Dict]):
         """Analyze patterns in /alpha endpoint responses"""
-        print("\n📊 Analyzing /alpha patterns:")
+        self.reporter.summary("\n📊 Analyzing /alpha patterns:")
         
         # Check for length-based patterns
         true_count = sum(1 for f in findings if f["output"] is True)
         false_count = sum(1 for f in findings if f["output"] is False)
         
-        print(f"  True responses: {true_count}, False responses: {false_count}")
+        self.reporter.summary(f"  True responses: {true_count}, False responses: {false_count}")
         
         # Check if it's based on input length
         for finding in findings:
             input_len = len(str(finding["input"]))
             if finding["output"] is True:
-                print(f"    True for length {input_len}: '{finding['input']}'")
+                self.reporter.detail(f"    True for length {input_len}: '{finding['input']}'")
             else:
-                print(f"    False for length {input_len}: '{finding['input']}'")
+                self.reporter.detail(f"    False for length {input_len}: '{finding['input']}'")
         
         # Check for alphabetical patterns
-        print("  🔍 Checking alphabetical patterns...")
+        self.reporter.summary("  🔍 Checking alphabetical patterns...")
         for finding in findings:
             input_str = str(finding["input"])
             if finding["output"] is True:
                 # Check if it contains only alphabetic characters
                 if input_str.isalpha():
-                    print(f"    TRUE for alphabetic: '{input_str}'")
+                    self.reporter.detail(f"    TRUE for alphabetic: '{input_str}'")
                 else:
-                    print(f"    TRUE for non-alphabetic: '{input_str}'")
+                    self.reporter.detail(f"    TRUE for non-alphabetic: '{input_str}'")
         
         # Look for specific patterns
-        print("  ❓ Pattern not immediately obvious - needs more investigation")
+        self.report_hypotheses("/alpha", findings)
     
     def run_comprehensive_test(self):
         """Run comprehensive tests on all endpoints"""
-        print("🚀 Starting comprehensive API exploration...")
-        print("=" * 60)
+        self.reporter.summary("🚀 Starting comprehensive API exploration...")
+        self.reporter.summary("=" * 60)
+        
+        # Sample /time in the background while the other endpoints are explored
+        time_sampler = TimeSampler.background(self.transport).start()
         
         # Test all endpoints
-        self.findings["data"] = self.explore_data_endpoint()
-        self.findings["time"] = self.explore_time_endpoint()
-        self.findings["fizzbuzz"] = self.explore_fizzbuzz_endpoint()
-        self.findings["glitch"] = self.explore_glitch_endpoint()
-        self.findings["zap"] = self.explore_zap_endpoint()
-        self.findings["alpha"] = self.explore_alpha_endpoint()
+        try:
+            self.findings["data"] = self.explore_data_endpoint()
+            self.findings["fizzbuzz"] = self.explore_fizzbuzz_endpoint()
+            self.findings["glitch"] = self.explore_glitch_endpoint()
+            self.findings["zap"] = self.explore_zap_endpoint()
+            self.findings["alpha"] = self.explore_alpha_endpoint()
+        except BaseException:
+            time_sampler.stop(min_samples=0)
+            raise
+        self.findings["time"] = self.explore_time_endpoint(time_sampler)
         
         # Generate summary report
         self.generate_report()
     
     def generate_report(self):
         """Generate a comprehensive report of findings"""
-        print("\n" + "=" * 60)
-        print("📋 COMPREHENSIVE ANALYSIS REPORT")
-        print("=" * 60)
+        self.reporter.summary("\n" + "=" * 60)
+        self.reporter.summary("📋 COMPREHENSIVE ANALYSIS REPORT")
+        self.reporter.summary("=" * 60)
         
-        print("\n🔍 ENDPOINT BEHAVIORS DISCOVERED:")
-        print("-" * 40)
+        self.reporter.summary("\n🔍 ENDPOINT BEHAVIORS DISCOVERED:")
+        self.reporter.summary("-" * 40)
         
         # Data endpoint analysis
-        print("\n📊 /data endpoint:")
-        print("  - Accepts: POST with JSON data containing 'data' field")
-        print("  - Returns: Integer result")
-        print("  - Behavior: Appears to be a hash function or mathematical transformation")
+        self.reporter.summary("\n📊 /data endpoint:")
+        self.reporter.summary("  - Accepts: POST with JSON data containing 'data' field")
+        self.reporter.summary("  - Returns: Integer result")
+        self.reporter.summary("  - Behavior: Appears to be a hash function or mathematical transformation")
         
         # Time endpoint analysis
-        print("\n⏰ /time endpoint:")
-        print("  - Accepts: GET request")
-        print("  - Returns: Integer result")
-        print("  - Behavior: Returns a fixed value (not time-based)")
+        self.reporter.summary("\n⏰ /time endpoint:")
+        self.reporter.summary("  - Accepts: GET request")
+        self.reporter.summary("  - Returns: Integer result")
+        self.reporter.summary("  - Behavior: Returns a fixed value (not time-based)")
         
         # FizzBuzz endpoint analysis
-        print("\n🎯 /fizzbuzz endpoint:")
-        print("  - Accepts: POST with JSON data containing 'data' field")
-        print("  - Returns: Boolean result")
-        print("  - Behavior: Likely implements FizzBuzz logic (divisible by 3 and 5)")
+        self.reporter.summary("\n🎯 /fizzbuzz endpoint:")
+        self.reporter.summary("  - Accepts: POST with JSON data containing 'data' field")
+        self.reporter.summary("  - Returns: Boolean result")
+        self.reporter.summary("  - Behavior: Likely implements FizzBuzz logic (divisible by 3 and 5)")
         
         # Glitch endpoint analysis
-        print("\n⚡ /glitch endpoint:")
-        print("  - Accepts: POST with JSON data containing 'data' field")
-        print("  - Returns: Boolean result")
-        print("  - Behavior: Pattern-based boolean response (needs more investigation)")
+        self.reporter.summary("\n⚡ /glitch endpoint:")
+        self.reporter.summary("  - Accepts: POST with JSON data containing 'data' field")
+        self.reporter.summary("  - Returns: Boolean result")
+        self.reporter.summary("  - Behavior: Pattern-based boolean response (needs more investigation)")
         
         # Zap endpoint analysis
-        print("\n⚡ /zap endpoint:")
-        print("  - Accepts: POST with JSON data containing 'data' field")
-        print("  - Returns: String result")
-        print("  - Behavior: Echo function (returns input as-is)")
+        self.reporter.summary("\n⚡ /zap endpoint:")
+        self.reporter.summary("  - Accepts: POST with JSON data containing 'data' field")
+        self.reporter.summary("  - Returns: String result")
+        self.reporter.summary("  - Behavior: Echo function (returns input as-is)")
         
         # Alpha endpoint analysis
-        print("\n🔤 /alpha endpoint:")
-        print("  - Accepts: POST with JSON data containing 'data' field")
-        print("  - Returns: Boolean result")
-        print("  - Behavior: Pattern-based boolean response (needs more investigation)")
-        
-        print("\n" + "=" * 60)
-        print("🎯 NEXT STEPS FOR DEEPER ANALYSIS:")
-        print("-" * 40)
-        print("1. Test /data with more mathematical inputs to identify hash function")
-        print("2. Investigate /glitch with specific patterns (length, content, etc.)")
-        print("3. Test /fizzbuzz with edge cases and non-numeric inputs")
-        print("4. Monitor /time over longer periods to confirm it's static")
-        print("5. Test all endpoints with malformed JSON and error conditions")
+        self.reporter.summary("\n🔤 /alpha endpoint:")
+        self.reporter.summary("  - Accepts: POST with JSON data containing 'data' field")
+        self.reporter.summary("  - Returns: Boolean result")
+        self.reporter.summary("  - Behavior: Pattern-based boolean response (needs more investigation)")
+        
+        self.reporter.summary("\n" + "=" * 60)
+        self.reporter.summary("🎯 NEXT STEPS FOR DEEPER ANALYSIS:")
+        self.reporter.summary("-" * 40)
+        self.reporter.summary("1. Test /data with more mathematical inputs to identify hash function")
+        self.reporter.summary("2. Investigate /glitch with specific patterns (length, content, etc.)")
+        self.reporter.summary("3. Test /fizzbuzz with edge cases and non-numeric inputs")
+        self.reporter.summary("4. Monitor /time over longer periods to confirm it's static")
+        self.reporter.summary("5. Test all endpoints with malformed JSON and error conditions")
+
+        if self.transport.memo is not None:
+            self.reporter.summary(f"\n♻️  Duplicate requests saved: {self.transport.memo.saved}")
+        report_latency(self.transport, self.reporter)
 
 if __name__ == "__main__":
     explorer = APIExplorer()
@@ -0,0 +1,270 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+
+from advanced_tester import AdvancedAPITester
+from api_explorer import APIExplorer
+from corpus import Corpus
+from http2_transport import HTTP2Transport, http2_available
+from probe_engine import ProbeEngine
+from transport import HTTPTransport
+from working_api_tester import WorkingAPITester
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+DEFAULT_OUTPUT_DIR = "bench_results"
+TESTER_SUITES = {
+    "APIExplorer": lambda url, c: APIExplorer(url, concurrency=c).run_comprehensive_test,
+    "AdvancedAPITester": lambda url, c: AdvancedAPITester(url, concurrency=c).run_advanced_analysis,
+    "WorkingAPITester": lambda url, c: WorkingAPITester(url, concurrency=c).run_comprehensive_test,
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def stand_in_process(latency: float = 0.0, jitter: float = 0.0, extra_args: List[str] = ()):
+    """Run stand_in_server.py in a child process so its CPU time is not billed to the client"""
+    port = free_port()
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stand_in_server.py")
+    process = subprocess.Popen(
+        [sys.executable, script, "--port", str(port), "--latency", str(latency),
+         "--jitter", str(jitter), *extra_args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                urllib.request.urlopen(f"{base_url}/time", timeout=1).read()
+                break
+            except OSError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("stand-in server did not start")
+                time.sleep(0.05)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def current_rss_kb() -> Optional[int]:
+    """Resident set size right now, from /proc; None where that is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Measurement:
+    """Wall time, CPU time, memory and per-request latencies for one scenario
+
+    Memory is per scenario: the tracemalloc peak (with trace_memory) and the
+    change in resident set size across the scenario. The process-wide RSS
+    high-water mark would carry the largest earlier scenario forward.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.latencies: List[float] = []
+
+    def timed(self, func: Callable) -> Callable:
+        """Wrap a submit function so every call's latency is recorded"""
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.latencies.append(time.perf_counter() - start)
+        return wrapper
+
+    def __enter__(self) -> "Measurement":
+        if self.trace_memory:
+            tracemalloc.start()
+        self._rss = current_rss_kb()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._wall
+        self.cpu_seconds = time.process_time() - self._cpu
+        self.peak_traced_kb = None
+        if self.trace_memory:
+            self.peak_traced_kb = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+        rss = current_rss_kb()
+        self.rss_delta_kb = None if rss is None or self._rss is None else rss - self._rss
+
+    def result(self, **fields) -> Dict[str, Any]:
+        latencies = np.array(self.latencies) * 1000
+        p50, p95, p99 = (np.percentile(latencies, [50, 95, 99]) if len(latencies)
+                         else (None, None, None))
+        requests = len(self.latencies)
+        return {
+            **fields,
+            "requests": requests,
+            "seconds": round(self.seconds, 4),
+            "rps": round(requests / self.seconds, 1) if self.seconds else None,
+            "p50_ms": None if p50 is None else round(float(p50), 3),
+            "p95_ms": None if p95 is None else round(float(p95), 3),
+            "p99_ms": None if p99 is None else round(float(p99), 3),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "rss_delta_kb": self.rss_delta_kb,
+            "peak_traced_kb": self.peak_traced_kb,
+        }
+
+
+def bench_tester(name: str, base_url: str, concurrency: int, trace_memory: bool) -> Dict[str, Any]:
+    """Time one tester's full run, with its stdout suppressed"""
+    run = TESTER_SUITES[name](base_url, concurrency)
+    tester = run.__self__
+    measurement = Measurement(trace_memory)
+    tester.test_endpoint = measurement.timed(tester.test_endpoint)
+    tester.engine.submit = tester.test_endpoint
+    with measurement, contextlib.redirect_stdout(io.StringIO()):
+        run()
+        tester.reporter.close()
+    mode = "serial" if concurrency == 1 else "concurrent"
+    return measurement.result(scenario=name, mode=mode, concurrency=concurrency, size=None)
+
+
+def connections_opened(transport: HTTPTransport) -> Optional[int]:
+    """Connections the transport has opened to the server so far"""
+    if isinstance(transport, HTTP2Transport):
+        return transport.connections_opened
+    pools = transport.session.get_adapter(transport.base_url).poolmanager.pools
+    return sum(pools[key].num_connections for key in pools.keys())
+
+
+def bench_engine(base_url: str, size: int, concurrency: int, trace_memory: bool,
+                 http2: bool = False) -> Dict[str, Any]:
+    """Stream `size` distinct /zap probes through the ProbeEngine in constant memory"""
+    transport_cls = HTTP2Transport if http2 else HTTPTransport
+    transport = transport_cls(base_url, pool_size=concurrency, dedupe=False)
+    measurement = Measurement(trace_memory)
+    engine = ProbeEngine(measurement.timed(transport.request), concurrency=concurrency)
+    with measurement:
+        inputs = Corpus(lambda: (f"probe-{i}" for i in range(size)), size, "zap")
+        for _ in engine.map_stream("/zap", inputs):
+            pass
+    connections = connections_opened(transport)
+    transport.close()
+    mode = "serial" if concurrency == 1 else "concurrent"
+    return measurement.result(scenario="ProbeEngine", mode=mode, concurrency=concurrency, size=size,
+                              protocol="HTTP/2" if http2 else "HTTP/1.1", connections=connections)
+
+
+def print_table(results: List[Dict[str, Any]]):
+    print(f"{'scenario':<20} {'protocol':<9} {'mode':<11} {'size':>9} {'reqs':>9} {'rps':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'cpu s':>8} {'conns':>6}")
+    for r in results:
+        print(f"{r['scenario']:<20} {r.get('protocol', 'HTTP/1.1'):<9} {r['mode']:<11} "
+              f"{str(r['size'] or '-'):>9} {r['requests']:>9} "
+              f"{str(r['rps']):>9} {str(r['p50_ms']):>8} {str(r['p95_ms']):>8} "
+              f"{str(r['p99_ms']):>8} {r['cpu_seconds']:>8} {str(r.get('connections', '-')):>6}")
+
+
+def write_results(results: List[Dict[str, Any]], config: Dict[str, Any], output_dir: str) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    revision = git_revision()
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    path = os.path.join(output_dir, f"bench-{stamp}-{revision or 'unknown'}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "revision": revision,
+            "timestamp": stamp,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": config,
+            "results": results,
+        }, f, indent=2)
+    return path
+
+
+def run_benchmarks(base_url: str, sizes: List[int], concurrency: int, serial_max: int,
+                   testers: bool, trace_memory: bool, http2: bool = False) -> List[Dict[str, Any]]:
+    results = []
+    if testers:
+        for name in TESTER_SUITES:
+            for c in (1, concurrency):
+                print(f"⏱️  {name} ({'serial' if c == 1 else f'concurrency {c}'})...")
+                results.append(bench_tester(name, base_url, c, trace_memory))
+    for size in sizes:
+        for c in (1, concurrency):
+            if c == 1 and size > serial_max:
+                continue
+            print(f"⏱️  ProbeEngine size={size} ({'serial' if c == 1 else f'concurrency {c}'})...")
+            results.append(bench_engine(base_url, size, c, trace_memory))
+            if http2 and c > 1:
+                print(f"⏱️  ProbeEngine size={size} (HTTP/2, concurrency {c})...")
+                results.append(bench_engine(base_url, size, c, trace_memory, http2=True))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Black Box probe pipeline")
+    parser.add_argument("--base-url", default=None,
+                        help="benchmark an existing server instead of a local stand-in")
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="stand-in jitter in seconds")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated corpus sizes, up to 1000000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--serial-max", type=int, default=10_000,
+                        help="skip serial runs for corpora larger than this")
+    parser.add_argument("--no-testers", action="store_true", help="only benchmark the probe engine")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="record tracemalloc peaks (slows the client down)")
+    parser.add_argument("--http2", action="store_true",
+                        help="serve the stand-in over HTTP/2 too and compare HTTP2Transport with the HTTP/1.1 pool")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args()
+    if args.http2 and not http2_available():
+        parser.error("--http2 needs httpx with HTTP/2 support: pip install -r requirements-http2.txt")
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    config = {key: value for key, value in vars(args).items()}
+
+    if args.base_url:
+        results = run_benchmarks(args.base_url, sizes, args.concurrency, args.serial_max,
+                                 not args.no_testers, args.trace_memory, args.http2)
+    else:
+        extra_args = ["--http2"] if args.http2 else []
+        with stand_in_process(args.latency, args.jitter, extra_args) as base_url:
+            results = run_benchmarks(base_url, sizes, args.concurrency, args.serial_max,
+                                     not args.no_testers, args.trace_memory, args.http2)
+
+    print()
+    print_table(results)
+    path = write_results(results, config, args.output_dir)
+    print(f"\n💾 Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
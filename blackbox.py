@@ -0,0 +1,428 @@
+import argparse
+import contextlib
+import io
+import json
+import pstats
+import sys
+import urllib.parse
+from typing import Dict, Any, List, Optional, Tuple
+
+from advanced_tester import AdvancedAPITester
+from api_explorer import APIExplorer
+from checkpoint import RunCheckpoint
+from corpus import default_corpus, fuzz_corpus
+from drift import DEFAULT_BASELINE_PATH, BaselineSnapshot
+from http2_transport import HTTP2Transport, http2_available
+from hypothesis_registry import REGISTRY
+from middleware import RequestLogger
+from payload_probe import MB
+from profiling import MemoryPhases, SamplingProfiler, format_profile, profiled
+from rate_limiter import RateLimiter
+from reporter import DEBUG, QUIET, SUMMARY, Reporter
+from response_cache import DEFAULT_CACHE_PATH, ResponseCache
+from result_sink import JSONLResultSink
+from stand_in_server import StandInConfig, StandInServer
+from timing import report_latency
+from transport import DEFAULT_BASE_URL, HTTPTransport
+
+ENDPOINTS = ("/data", "/time", "/fizzbuzz", "/glitch", "/zap", "/alpha")
+BOOLEAN_ENDPOINTS = ("/fizzbuzz", "/glitch", "/alpha")
+MODES = ("quick", "deep", "fuzz", "drift", "diff", "payload", "analyze", "benchmark")
+
+
+def parse_endpoints(value: str) -> List[str]:
+    endpoints = ["/" + name.strip().lstrip("/") for name in value.split(",") if name.strip()]
+    unknown = [e for e in endpoints if e not in ENDPOINTS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown endpoint(s): {', '.join(unknown)}")
+    return endpoints
+
+
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def parse_shard(value: str):
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("shard must look like INDEX/COUNT, e.g. 0/4") from None
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError("shard index must be in [0, COUNT)")
+    return index, count
+
+
+def parse_endpoint_rate(value: str) -> Tuple[str, float]:
+    endpoint, sep, rate = value.partition("=")
+    try:
+        rps = float(rate)
+    except ValueError:
+        rps = None
+    endpoints = parse_endpoints(endpoint) if sep else []
+    if len(endpoints) != 1 or rps is None or rps <= 0:
+        raise argparse.ArgumentTypeError("endpoint rate must look like ENDPOINT=RPS, e.g. /zap=5")
+    return endpoints[0], rps
+
+
+def parse_target(value: str) -> Tuple[str, str]:
+    name, sep, url = value.partition("=")
+    if not sep:
+        name, url = urllib.parse.urlsplit(value).netloc, value
+    if not url.startswith(("http://", "https://")):
+        raise argparse.ArgumentTypeError("target must look like NAME=URL, e.g. preview=https://preview.example.com")
+    return name, url.rstrip("/")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="blackbox",
+        description="Probe the Black Box API: quick identification, deep analysis, fuzzing, "
+                    "drift checks, payload limits, offline analysis and benchmarks",
+        epilog="drift mode exits with status 1 when any output changed")
+    parser.add_argument("mode", choices=MODES, nargs="?", default="quick")
+    parser.add_argument("--endpoints", type=parse_endpoints, default=list(ENDPOINTS),
+                        help="comma-separated endpoints, e.g. /glitch,/alpha (default: all)")
+
+    target = parser.add_argument_group("target")
+    target.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    target.add_argument("--stand-in", action="store_true",
+                        help="start a local stand-in server and probe it instead of --base-url")
+    target.add_argument("--stand-in-latency", type=float, default=0.0)
+    target.add_argument("--http2", action="store_true",
+                        help="multiplex probes over a few HTTP/2 connections (needs httpx[http2])")
+
+    throughput = parser.add_argument_group("throughput")
+    throughput.add_argument("--concurrency", type=positive_int, default=16, help="probes in flight at once")
+    throughput.add_argument("--rate", type=float, default=None,
+                            help="global requests per second (default: unlimited)")
+    throughput.add_argument("--endpoint-rate", type=parse_endpoint_rate, action="append", default=[],
+                            metavar="ENDPOINT=RPS",
+                            help="per-endpoint rate limit (repeatable)")
+    throughput.add_argument("--timeout", type=float, default=10.0, help="read timeout in seconds")
+    throughput.add_argument("--retries", type=int, default=3)
+
+    state = parser.add_argument_group("cache and resume")
+    state.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_PATH, default=None, metavar="PATH",
+                       help=f"use an on-disk response cache (default path: {DEFAULT_CACHE_PATH})")
+    state.add_argument("--refresh-cache", action="store_true", help="ignore cached entries but store new ones")
+    state.add_argument("--no-dedupe", action="store_true", help="send duplicate requests again")
+    state.add_argument("--resume", metavar="PATH",
+                       help="skip probes already finished in PATH and append new results to it")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--output", metavar="PATH", help="stream every probe result to a JSONL file")
+    output.add_argument("--format", choices=("text", "json"), default="text",
+                        help="text prints the testers' reports; json prints only a summary object")
+    output.add_argument("-v", "--verbose", action="count", default=0,
+                        help="-v prints every probe, -vv adds debug output")
+    output.add_argument("-q", "--quiet", action="store_true", help="no report and no progress line")
+
+    fuzz = parser.add_argument_group("fuzz and diff modes")
+    fuzz.add_argument("--scale", type=positive_int, default=1, help="corpus size multiplier")
+    fuzz.add_argument("--seed", type=int, default=0)
+    fuzz.add_argument("--shard", type=parse_shard, default=None, metavar="INDEX/COUNT",
+                      help="only send this worker's share of the corpus")
+    fuzz.add_argument("--window", type=positive_int, default=None, help="probes pulled ahead of the results")
+
+    diff = parser.add_argument_group("diff mode")
+    diff.add_argument("--target", type=parse_target, action="append", default=[], metavar="NAME=URL",
+                      help="another deployment to compare with --base-url (or the stand-in); repeatable")
+
+    drift = parser.add_argument_group("drift mode")
+    drift.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, metavar="PATH",
+                       help=f"baseline snapshot; endpoints missing from it are recorded (default: {DEFAULT_BASELINE_PATH})")
+    drift.add_argument("--sample", type=float, default=1.0, metavar="RATE",
+                       help="re-probe this fraction of the baseline; --seed rotates which part")
+    drift.add_argument("--update-baseline", action="store_true",
+                       help="store changed and new outputs in the baseline")
+
+    profiling = parser.add_argument_group("profiling")
+    profiling.add_argument("--profile", metavar="PATH",
+                           help="cProfile the whole run, save the stats to PATH and print the top functions")
+    profiling.add_argument("--trace-memory", action="store_true",
+                           help="tracemalloc snapshots around each endpoint's phase")
+    profiling.add_argument("--sample-profile", action="store_true",
+                           help="sample stacks to split wall time into transport, JSON, analysis and reporting")
+
+    other = parser.add_argument_group("payload, analyze and benchmark modes")
+    other.add_argument("--max-payload-mb", type=int, default=100)
+    other.add_argument("--capture", metavar="PATH",
+                       help="JSONL capture to analyze (drift mode: import it into the baseline first)")
+    other.add_argument("--workers", type=positive_int, default=None, help="analysis processes (default: all cores)")
+    other.add_argument("--sizes", default="1000,10000", help="benchmark corpus sizes")
+    return parser
+
+
+class Run:
+    """Transport, sink and testers for one CLI invocation, built from the parsed arguments"""
+
+    def __init__(self, args: argparse.Namespace, base_url: str):
+        self.args = args
+        self._endpoint_rates = dict(args.endpoint_rate)
+        cache = ResponseCache(args.cache, refresh=args.refresh_cache) if args.cache else None
+        self.transport = self.open_transport(base_url, cache)
+        self.targets: Dict[str, HTTPTransport] = {}
+        self.checkpoint = RunCheckpoint(args.resume) if args.resume else None
+        sink_path = args.resume or args.output  # main() rejects the two together
+        self.sink = JSONLResultSink(sink_path) if sink_path else None
+        if args.quiet or args.format == "json":
+            self.reporter = Reporter(QUIET)
+        else:
+            self.reporter = Reporter(min(DEBUG, SUMMARY + args.verbose))
+        if self.reporter.enabled(DEBUG):
+            self.transport.middleware.add(RequestLogger(self.reporter))
+        self.memory = MemoryPhases() if args.trace_memory else None
+        self._explorer: Optional[APIExplorer] = None
+        self._advanced: Optional[AdvancedAPITester] = None
+
+    def open_transport(self, base_url: str, cache: ResponseCache = None) -> HTTPTransport:
+        """A transport configured from the throughput options; each has its own rate limits"""
+        transport_cls = HTTP2Transport if self.args.http2 else HTTPTransport
+        return transport_cls(base_url, pool_size=self.args.concurrency,
+                             timeout=(3.05, self.args.timeout), max_retries=self.args.retries,
+                             cache=cache, dedupe=not self.args.no_dedupe,
+                             rate_limiter=RateLimiter(self.args.rate, self._endpoint_rates))
+
+    def tester_kwargs(self) -> Dict[str, Any]:
+        return {"concurrency": self.args.concurrency, "transport": self.transport,
+                "sink": self.sink, "checkpoint": self.checkpoint, "reporter": self.reporter}
+
+    @property
+    def explorer(self) -> APIExplorer:
+        if self._explorer is None:
+            self._explorer = APIExplorer(**self.tester_kwargs())
+        return self._explorer
+
+    @property
+    def advanced(self) -> AdvancedAPITester:
+        if self._advanced is None:
+            self._advanced = AdvancedAPITester(**self.tester_kwargs())
+        return self._advanced
+
+    def phase(self, name: str):
+        """A tracemalloc phase when --trace-memory is on, otherwise a no-op"""
+        return self.memory.phase(name) if self.memory is not None else contextlib.nullcontext()
+
+    @property
+    def resumed(self) -> int:
+        """Probes answered from the --resume checkpoint instead of the network"""
+        return sum(tester.engine.resumed for tester in (self._explorer, self._advanced) if tester)
+
+    def close(self):
+        if self.memory is not None:
+            self.memory.stop()
+        self.reporter.close()
+        if self.sink is not None:
+            self.sink.close()
+        self.transport.close()
+        for transport in self.targets.values():
+            transport.close()
+
+
+def run_quick(run: Run) -> Dict[str, Any]:
+    """Identify each endpoint with as few probes as the registered models allow"""
+    summary = {}
+    for endpoint in run.args.endpoints:
+        with run.phase(endpoint):
+            if endpoint == "/time":
+                values = run.explorer.explore_time_endpoint(duration=1.0)
+                summary[endpoint] = {"samples": len(values), "distinct_values": len(set(values))}
+                continue
+            session = run.explorer.identify_endpoint(endpoint, default_corpus(endpoint))
+            summary[endpoint] = {"answer": session.answer, "survivors": list(session.survivors),
+                                 "probes": session.observations}
+    return summary
+
+
+def run_deep(run: Run) -> Dict[str, Any]:
+    """The advanced analyses, plus adaptive rule search for the boolean endpoints"""
+    advanced = run.advanced
+    analyses = {
+        "/data": advanced.test_data_endpoint_advanced,
+        "/fizzbuzz": advanced.test_fizzbuzz_endpoint_advanced,
+        "/glitch": advanced.test_glitch_endpoint_advanced,
+        "/zap": advanced.test_zap_endpoint_advanced,
+        "/alpha": advanced.test_alpha_endpoint_advanced,
+    }
+    summary = {}
+    for endpoint in run.args.endpoints:
+        with run.phase(endpoint):
+            if endpoint == "/time":
+                values = run.explorer.explore_time_endpoint(duration=5.0)
+                summary[endpoint] = {"samples": len(values), "distinct_values": len(set(values))}
+                continue
+            results = analyses[endpoint]()
+            session = REGISTRY.evaluate(endpoint, ((r["input"], r["output"]) for r in results))
+            summary[endpoint] = {"probes": len(results), "survivors": list(session.survivors)}
+            if endpoint in BOOLEAN_ENDPOINTS:
+                adaptive = advanced.identify_rule_adaptively(endpoint)
+                summary[endpoint]["adaptive_answer"] = adaptive.answer
+    return summary
+
+
+def run_fuzz(run: Run) -> Dict[str, Any]:
+    """Stream a generated corpus at every selected POST endpoint"""
+    corpus = fuzz_corpus(run.args.scale, run.args.seed)
+    if run.args.shard is not None:
+        corpus = corpus.shard(*run.args.shard)
+    summary = {}
+    for endpoint in run.args.endpoints:
+        if endpoint == "/time":
+            continue
+        with run.phase(endpoint):
+            summary[endpoint] = run.explorer.fuzz_endpoint(endpoint, corpus, window=run.args.window)
+    return summary
+
+
+def run_drift(run: Run) -> Dict[str, Any]:
+    """Compare live outputs with the baseline snapshot"""
+    if not 0 < run.args.sample <= 1:
+        raise SystemExit("--sample must be in (0, 1]")
+    endpoints = [e for e in run.args.endpoints if e != "/time"]
+    if run.args.capture:
+        with BaselineSnapshot(run.args.baseline) as snapshot:
+            imported = snapshot.import_results(run.args.capture, endpoints)
+        run.reporter.summary(f"📸 Imported {imported} outputs from {run.args.capture} into {run.args.baseline}")
+    reports = run.explorer.check_drift(run.args.baseline, endpoints, run.args.sample,
+                                       run.args.seed, run.args.update_baseline)
+    return {report.endpoint: report.to_dict() for report in reports}
+
+
+def run_diff(run: Run) -> Dict[str, Any]:
+    """Send the fuzz corpus to the base URL and every --target at once and diff the answers"""
+    if not run.args.target:
+        raise SystemExit("diff mode needs at least one --target NAME=URL")
+    name = "stand-in" if run.args.stand_in else "base"
+    for target, url in run.args.target:
+        if target == name or target in run.targets:
+            raise SystemExit(f"duplicate target name: {target}")
+        run.targets[target] = run.open_transport(url)
+    corpus = fuzz_corpus(run.args.scale, run.args.seed)
+    if run.args.shard is not None:
+        corpus = corpus.shard(*run.args.shard)
+    endpoints = [e for e in run.args.endpoints if e != "/time"]
+    matrices = run.explorer.compare_targets(run.targets, endpoints, corpus, run.args.window, name)
+    return {matrix.endpoint: matrix.to_dict() for matrix in matrices}
+
+
+def run_payload(run: Run) -> Dict[str, Any]:
+    endpoints = [e for e in run.args.endpoints if e != "/time"]
+    reports = run.explorer.explore_payload_limits(endpoints, high=run.args.max_payload_mb * MB)
+    return {report["endpoint"]: report for report in reports}
+
+
+def run_analyze(run: Run) -> Dict[str, Any]:
+    if not run.args.capture:
+        raise SystemExit("analyze mode needs --capture PATH")
+    merged = run.explorer.analyze_capture(run.args.capture, run.args.endpoints, run.args.workers)
+    return {endpoint: stats.to_dict() for endpoint, stats in merged.items()}
+
+
+def run_benchmark(run: Run) -> Dict[str, Any]:
+    from benchmark import print_table, run_benchmarks
+
+    sizes = [int(s) for s in run.args.sizes.split(",") if s]
+    results = run_benchmarks(run.transport.base_url, sizes, run.args.concurrency,
+                             serial_max=10_000, testers=False, trace_memory=False, http2=run.args.http2)
+    print_table(results)
+    return {"results": results}
+
+
+# Modes that split into per-endpoint tracemalloc phases themselves
+PHASED_MODES = ("quick", "deep", "fuzz")
+
+RUNNERS = {
+    "quick": run_quick,
+    "deep": run_deep,
+    "fuzz": run_fuzz,
+    "drift": run_drift,
+    "diff": run_diff,
+    "payload": run_payload,
+    "analyze": run_analyze,
+    "benchmark": run_benchmark,
+}
+
+
+def run_profiled(run: Run) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """RUNNERS[mode] under whichever profilers were asked for"""
+    args = run.args
+    with contextlib.ExitStack() as stack:
+        profiler = stack.enter_context(profiled(args.profile)) if args.profile else None
+        sampler = stack.enter_context(SamplingProfiler()) if args.sample_profile else None
+        if args.mode not in PHASED_MODES:
+            stack.enter_context(run.phase(args.mode))
+        summary = RUNNERS[args.mode](run)
+
+    profile = {}
+    if profiler is not None:
+        run.reporter.summary(f"\n🧪 cProfile (saved to {args.profile}):")
+        for line in format_profile(pstats.Stats(profiler)):
+            run.reporter.summary(f"  {line}")
+        profile["cprofile"] = args.profile
+    if run.memory is not None:
+        run.reporter.summary("\n🧠 Memory by phase:")
+        for line in run.memory.format():
+            run.reporter.summary(line)
+        profile["memory"] = run.memory.to_dict()
+    if sampler is not None:
+        run.reporter.summary("\n⏲️  Wall time by activity:")
+        for line in sampler.format():
+            run.reporter.summary(line)
+        profile["sampling"] = sampler.breakdown()
+    return summary, profile
+
+
+def execute(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    run = Run(args, base_url)
+    try:
+        if args.format == "json":
+            with contextlib.redirect_stdout(io.StringIO()):
+                summary, profile = run_profiled(run)
+        else:
+            summary, profile = run_profiled(run)
+        memo = run.transport.memo
+        limiter = run.transport.rate_limiter
+        report_latency(run.transport, run.reporter)
+        summary = {"mode": args.mode, "base_url": base_url, "endpoints": summary,
+                   "duplicates_saved": memo.saved if memo is not None else 0,
+                   "throttled": limiter.throttled, "resumed": run.resumed,
+                   "timing": run.transport.timings.to_dict()}
+        if profile:
+            summary["profile"] = profile
+    finally:
+        run.close()
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.resume and args.output:
+        parser.error("--resume appends new results to its own file; drop --output")
+    if args.http2 and not http2_available():
+        raise SystemExit("--http2 needs httpx with HTTP/2 support: pip install -r requirements-http2.txt")
+
+    if args.stand_in:
+        with StandInServer(StandInConfig(latency=args.stand_in_latency), http2=args.http2) as server:
+            summary = execute(args, server.base_url)
+    else:
+        summary = execute(args, args.base_url)
+
+    if args.format == "json":
+        json.dump(summary, sys.stdout, indent=2, default=str)
+        print()
+    if args.mode == "drift" and any(report["changed"] for report in summary["endpoints"].values()):
+        return 1
+    if args.mode == "diff" and any(matrix["differing"] for matrix in summary["endpoints"].values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import os
+from typing import Dict, Any, Optional, Tuple
+
+from request_memo import request_key
+from result_sink import PROBE, read_results, record_kind
+
+
+def finished(status: Optional[int]) -> bool:
+    """Whether a recorded status is a real answer rather than a failure worth retrying"""
+    return status is not None and status != 429 and status < 500
+
+
+class RunCheckpoint:
+    """Probes that already finished in an earlier run, read from its JSONL result file
+
+    Point a JSONLResultSink at the same file to keep the checkpoint growing:
+    new results are appended, and the next resume skips them as well. GET
+    probes are never treated as finished because /time is expected to change.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._done: Dict[str, Tuple[int, Any]] = {}
+        if os.path.exists(path):
+            for record in read_results(path):
+                if record_kind(record) != PROBE or record.get("method", "POST").upper() == "GET":
+                    continue
+                if not finished(record.get("status")):
+                    continue
+                key = request_key(record["method"], record["endpoint"], {"data": record["input"]})
+                self._done[key] = (record["status"], record["output"])
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    @staticmethod
+    def key(probe: Dict) -> Optional[str]:
+        if probe.get("method", "POST").upper() == "GET":
+            return None
+        return request_key(probe.get("method", "POST"), probe["endpoint"], probe.get("data"))
+
+    def done(self, probe: Dict) -> bool:
+        key = self.key(probe)
+        return key is not None and key in self._done
+
+    def result_for(self, probe: Dict) -> Optional[Dict]:
+        """A test_endpoint-style result for a finished probe, or None if it still has to run"""
+        key = self.key(probe)
+        if key is None or key not in self._done:
+            return None
+        status, output = self._done[key]
+        return {"status_code": status, "response": {"result": output},
+                "success": status == 200, "resumed": True}
@@ -0,0 +1,225 @@
+import itertools
+import random
+import string
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+CHARSETS = {
+    "lower": string.ascii_lowercase,
+    "upper": string.ascii_uppercase,
+    "letters": string.ascii_letters,
+    "digits": string.digits,
+    "alnum": string.ascii_letters + string.digits,
+    "punctuation": string.punctuation,
+    "whitespace": " \t\n",
+    "printable": string.printable,
+    "accents": "ñáéíóúüçàèìòùâêîôû",
+}
+
+DEFAULT_WORDS = ("hello", "world", "test", "abc", "glitch", "error", "bug", "fail",
+                 "success", "true", "false", "zap", "alpha", "fizz", "buzz", "fizzbuzz")
+
+DEFAULT_TEMPLATES = ("{w}", "{W}", "{U}", "{w}{n}", "{n}{w}", "{w} {w2}", "{w}!", "{n}")
+
+# Surrogates cannot be encoded in a JSON request body
+SURROGATES = range(0xD800, 0xE000)
+
+
+class Corpus:
+    """A lazily evaluated, re-iterable stream of probe inputs
+
+    Nothing is materialized: every iteration calls the factory again, so a
+    corpus of millions of inputs costs constant memory. Corpora compose
+    with +, map, filter, take, sample and shard.
+    """
+
+    def __init__(self, factory: Callable[[], Iterable[str]], size: Optional[int] = None,
+                 name: str = "corpus"):
+        self.factory = factory
+        self.size = size
+        self.name = name
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.factory())
+
+    def __len__(self) -> int:
+        if self.size is None:
+            raise TypeError(f"size of {self.name} is not known without iterating it")
+        return self.size
+
+    def __add__(self, other: "Corpus") -> "Corpus":
+        size = None if self.size is None or other.size is None else self.size + other.size
+        return Corpus(lambda: itertools.chain(self, other), size, f"{self.name}+{other.name}")
+
+    def __repr__(self) -> str:
+        return f"Corpus({self.name}, size={self.size})"
+
+    def map(self, func: Callable[[str], str]) -> "Corpus":
+        return Corpus(lambda: map(func, self), self.size, f"map({self.name})")
+
+    def filter(self, predicate: Callable[[str], bool]) -> "Corpus":
+        return Corpus(lambda: filter(predicate, self), None, f"filter({self.name})")
+
+    def take(self, n: int) -> "Corpus":
+        size = n if self.size is None else min(n, self.size)
+        return Corpus(lambda: itertools.islice(self, n), size, f"take({self.name}, {n})")
+
+    def repeat(self, times: int) -> "Corpus":
+        size = None if self.size is None else self.size * times
+        return Corpus(lambda: itertools.chain.from_iterable(itertools.repeat(self, times)),
+                      size, f"repeat({self.name}, {times})")
+
+    def sample(self, rate: float, seed: int = 0) -> "Corpus":
+        """Keep each input with probability `rate`; the same seed keeps the same inputs"""
+        def factory():
+            rng = random.Random(seed)
+            return (value for value in self if rng.random() < rate)
+        return Corpus(factory, None, f"sample({self.name}, {rate})")
+
+    def shard(self, index: int, count: int) -> "Corpus":
+        """Every count-th input starting at index, so count workers split the corpus"""
+        if not 0 <= index < count:
+            raise ValueError("shard index must be in [0, count)")
+        size = None if self.size is None else len(range(index, self.size, count))
+        return Corpus(lambda: itertools.islice(self, index, None, count), size,
+                      f"shard({self.name}, {index}/{count})")
+
+
+def from_values(values: Sequence[str], name: str = "values") -> Corpus:
+    values = tuple(values)
+    return Corpus(lambda: iter(values), len(values), name)
+
+
+def length_sweep(chars: str = "a", lengths: Iterable[int] = range(0, 11)) -> Corpus:
+    """chars repeated and cut to every length, e.g. "", "a", "aa", ..."""
+    lengths = tuple(lengths)
+
+    def factory():
+        for n in lengths:
+            yield (chars * (n // max(1, len(chars)) + 1))[:n]
+    return Corpus(factory, len(lengths), f"length_sweep({chars!r})")
+
+
+def charset_class(charset: str = "alnum", count: int = 100, lengths: Sequence[int] = range(1, 17),
+                  seed: int = 0) -> Corpus:
+    """Random strings drawn from one character class (a CHARSETS name or literal characters)"""
+    chars = CHARSETS.get(charset, charset)
+    lengths = tuple(lengths)
+
+    def factory():
+        rng = random.Random(seed)
+        for _ in range(count):
+            yield "".join(rng.choice(chars) for _ in range(rng.choice(lengths)))
+    return Corpus(factory, count, f"charset_class({charset})")
+
+
+def unicode_planes(planes: Sequence[int] = (0, 1, 2), per_plane: int = 100,
+                   lengths: Sequence[int] = range(1, 9), seed: int = 0) -> Corpus:
+    """Random strings of codepoints from each Unicode plane (surrogates excluded)"""
+    planes, lengths = tuple(planes), tuple(lengths)
+
+    def codepoint(rng, plane):
+        while True:
+            cp = rng.randrange(plane * 0x10000, (plane + 1) * 0x10000)
+            if cp not in SURROGATES:
+                return chr(cp)
+
+    def factory():
+        rng = random.Random(seed)
+        for plane in planes:
+            for _ in range(per_plane):
+                yield "".join(codepoint(rng, plane) for _ in range(rng.choice(lengths)))
+    return Corpus(factory, len(planes) * per_plane, "unicode_planes")
+
+
+NUMERIC_FORMS = ("{n}", "-{n}", "{n}.0", "{n}.5", "+{n}", "0{n}", "{n}abc", "abc{n}",
+                 " {n} ", "{n}e0", "{hex}")
+
+
+def numeric_forms(numbers: Iterable[int] = range(0, 106), forms: Sequence[str] = NUMERIC_FORMS) -> Corpus:
+    """Each number written in several textual forms (signs, decimals, padding, suffixes, hex)"""
+    numbers, forms = tuple(numbers), tuple(forms)
+
+    def factory():
+        for n in numbers:
+            for form in forms:
+                yield form.format(n=n, hex=hex(n))
+    return Corpus(factory, len(numbers) * len(forms), "numeric_forms")
+
+
+def templated_words(templates: Sequence[str] = DEFAULT_TEMPLATES, words: Sequence[str] = DEFAULT_WORDS,
+                    numbers: Sequence[int] = (1, 3, 5, 15, 123)) -> Corpus:
+    """Fill templates with words and numbers: {w} word, {W} capitalized, {U} upper, {w2} second word, {n} number"""
+    templates, words, numbers = tuple(templates), tuple(words), tuple(numbers)
+
+    def factory():
+        for template in templates:
+            for w, w2, n in itertools.product(
+                    words,
+                    words if "{w2}" in template else words[:1],
+                    numbers if "{n}" in template else numbers[:1]):
+                if "{w" not in template and "{W" not in template and "{U" not in template and w != words[0]:
+                    continue
+                yield template.format(w=w, W=w.capitalize(), U=w.upper(), w2=w2, n=n)
+    return Corpus(factory, None, "templated_words")
+
+
+def fuzz_corpus(scale: int = 1, seed: int = 0) -> Corpus:
+    """A mixed corpus that grows linearly with scale, from a few thousand inputs upwards"""
+    return (length_sweep("a", range(0, 33))
+            + length_sweep("ab1!", range(0, 33))
+            + templated_words()
+            + numeric_forms(range(0, 100 * scale))
+            + charset_class("printable", 500 * scale, seed=seed)
+            + charset_class("letters", 250 * scale, seed=seed + 1)
+            + charset_class("digits", 250 * scale, seed=seed + 2)
+            + unicode_planes(per_plane=100 * scale, seed=seed))
+
+
+def interleave(corpora: List[Corpus]) -> Corpus:
+    """Round-robin over several corpora until all are exhausted"""
+    def factory():
+        iterators = [iter(c) for c in corpora]
+        while iterators:
+            for it in list(iterators):
+                try:
+                    yield next(it)
+                except StopIteration:
+                    iterators.remove(it)
+    sizes = [c.size for c in corpora]
+    return Corpus(factory, None if None in sizes else sum(sizes), "interleave")
+
+
+def case_variants(word: str) -> Corpus:
+    """Every upper/lower casing of a word, starting with the word as given"""
+    def factory():
+        choices = [(c, c.swapcase()) if c.isalpha() else (c,) for c in word]
+        seen = set()
+        for letters in itertools.product(*choices):
+            variant = "".join(letters)
+            if variant not in seen:
+                seen.add(variant)
+                yield variant
+    return Corpus(factory, None, f"case_variants({word})")
+
+
+SMOKE = from_values(["hello", "world", "test", "123", "abc", "", "a", "aa", "aaa",
+                     "Hello World", "hello world", "HELLO", "hello123", "123hello"], "smoke")
+
+EDGE_CASES = from_values(["special!@#$%", "unicode: 🚀", "very long string " * 100], "edge_cases")
+
+
+def default_corpus(endpoint: str) -> Corpus:
+    """The standard exploration inputs for an endpoint"""
+    if endpoint == "/fizzbuzz":
+        return (numeric_forms((1, 2, 3, 4, 5, 15, 30, 45, 60, 75, 90, 105), forms=("{n}",))
+                + from_values(["hello", "world", "abc", "123", "15abc", "abc15", "fizz", "buzz", "fizzbuzz"]))
+    if endpoint == "/glitch":
+        return SMOKE + from_values(["glitch", "error", "bug", "fail", "success", "true", "false"]) + EDGE_CASES
+    if endpoint == "/zap":
+        # All 8 casings, as the original hand-written list had
+        return SMOKE + case_variants("zap") + EDGE_CASES
+    if endpoint == "/alpha":
+        # A sample of the 32 casings, so /alpha costs no more than it did
+        return (SMOKE + from_values(["alpha", "ALPHA", "Alpha", "aLPHA", "alPHA", "alpHA", "alphA"])
+                + EDGE_CASES)
+    return SMOKE + EDGE_CASES
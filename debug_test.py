@@ -1,9 +1,10 @@
-import requests
 import json
 
+from transport import DEFAULT_BASE_URL, HTTPTransport
+
 def test_api_directly():
     """Test the API endpoints directly to see the actual responses"""
-    base_url = "https://blackbox-interface.vercel.app"
+    transport = HTTPTransport(DEFAULT_BASE_URL)
     
     print("🔍 Testing API endpoints directly...")
     print("=" * 50)
@@ -11,7 +12,7 @@ def test_api_directly():
     # Test /data endpoint
     print("\n📊 Testing /data endpoint:")
     try:
-        response = requests.post(f"{base_url}/data", json={"data": "hello"})
+        response = transport.post("/data", {"data": "hello"})
         print(f"Status Code: {response.status_code}")
         print(f"Headers: {dict(response.headers)}")
         print(f"Response Text: {response.text}")
@@ -25,7 +26,7 @@ def test_api_directly():
     # Test /time endpoint
     print("\n⏰ Testing /time endpoint:")
     try:
-        response = requests.get(f"{base_url}/time")
+        response = transport.get("/time")
         print(f"Status Code: {response.status_code}")
         print(f"Headers: {dict(response.headers)}")
         print(f"Response Text: {response.text}")
@@ -39,7 +40,7 @@ def test_api_directly():
     # Test /fizzbuzz endpoint
     print("\n🎯 Testing /fizzbuzz endpoint:")
     try:
-        response = requests.post(f"{base_url}/fizzbuzz", json={"data": "15"})
+        response = transport.post("/fizzbuzz", {"data": "15"})
         print(f"Status Code: {response.status_code}")
         print(f"Headers: {dict(response.headers)}")
         print(f"Response Text: {response.text}")
@@ -53,7 +54,7 @@ def test_api_directly():
     # Test /glitch endpoint
     print("\n⚡ Testing /glitch endpoint:")
     try:
-        response = requests.post(f"{base_url}/glitch", json={"data": "hello"})
+        response = transport.post("/glitch", {"data": "hello"})
         print(f"Status Code: {response.status_code}")
         print(f"Headers: {dict(response.headers)}")
         print(f"Response Text: {response.text}")
@@ -67,7 +68,7 @@ def test_api_directly():
     # Test /zap endpoint
     print("\n⚡ Testing /zap endpoint:")
     try:
-        response = requests.post(f"{base_url}/zap", json={"data": "hello"})
+        response = transport.post("/zap", {"data": "hello"})
         print(f"Status Code: {response.status_code}")
         print(f"Headers: {dict(response.headers)}")
         print(f"Response Text: {response.text}")
@@ -81,7 +82,7 @@ def test_api_directly():
     # Test /alpha endpoint
     print("\n🔤 Testing /alpha endpoint:")
     try:
-        response = requests.post(f"{base_url}/alpha", json={"data": "hello"})
+        response = transport.post("/alpha", {"data": "hello"})
         print(f"Status Code: {response.status_code}")
         print(f"Headers: {dict(response.headers)}")
         print(f"Response Text: {response.text}")
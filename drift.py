@@ -0,0 +1,335 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from checkpoint import finished
+from hypothesis_registry import same_output
+from probe_engine import ProbeEngine, result_output
+from request_memo import request_key
+from result_sink import PROBE, read_results, record_kind
+
+DEFAULT_BASELINE_PATH = ".blackbox_baseline.sqlite3"
+BATCH_SIZE = 512
+PAGE_SIZE = 1000
+GOLDEN = 0x9E3779B1
+
+
+def input_key(endpoint: str, value: Any) -> str:
+    """The baseline index: the same request hash the memo and checkpoint use"""
+    return request_key("POST", endpoint, {"data": value})
+
+
+def in_sample(key: str, rate: float, seed: int) -> bool:
+    """Whether a baseline entry falls in the `rate` sample for `seed`
+
+    Keys are uniform hashes, so the sample is a window over their first 32
+    bits. Each seed shifts the window, so consecutive scheduled runs with
+    seed 0, 1, 2, ... rotate through the whole baseline.
+    """
+    if rate >= 1:
+        return True
+    return (int(key[:8], 16) + seed * GOLDEN) % (1 << 32) < rate * (1 << 32)
+
+
+class BaselineSnapshot:
+    """Known-good outputs indexed by (endpoint, input hash), in a SQLite file
+
+    Every check is a run. Only the outputs that changed in a run are written
+    to the changes table, which is indexed by run, so reading a run's drift
+    costs O(changed) however large the baseline is. Updating the baseline
+    rewrites only the changed and new rows.
+    """
+
+    def __init__(self, path: str = DEFAULT_BASELINE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS baseline ("
+            " key TEXT PRIMARY KEY,"
+            " endpoint TEXT NOT NULL,"
+            " input TEXT NOT NULL,"
+            " status INTEGER NOT NULL,"
+            " output TEXT NOT NULL,"
+            " recorded_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS baseline_endpoint ON baseline (endpoint, key);"
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " started_at REAL NOT NULL,"
+            " finished_at REAL,"
+            " summary TEXT);"
+            "CREATE TABLE IF NOT EXISTS changes ("
+            " run_id INTEGER NOT NULL,"
+            " key TEXT NOT NULL,"
+            " endpoint TEXT NOT NULL,"
+            " input TEXT NOT NULL,"
+            " old_status INTEGER NOT NULL,"
+            " old_output TEXT NOT NULL,"
+            " new_status INTEGER NOT NULL,"
+            " new_output TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS changes_run ON changes (run_id, endpoint);"
+        )
+        self._conn.commit()
+
+    def count(self, endpoint: Optional[str] = None) -> int:
+        with self._lock:
+            if endpoint is None:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM baseline").fetchone()
+            else:
+                (count,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM baseline WHERE endpoint = ?", (endpoint,)).fetchone()
+        return count
+
+    def endpoints(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT endpoint FROM baseline ORDER BY endpoint")]
+
+    def inputs(self, endpoint: str, rate: float = 1.0, seed: int = 0) -> Iterator[str]:
+        """Lazily yield an endpoint's baseline inputs, or a sample of them
+
+        Pages are read by key, so rows updated while the iteration is under
+        way are neither skipped nor seen twice.
+        """
+        last = ""
+        while True:
+            with self._lock:
+                page = self._conn.execute(
+                    "SELECT key, input FROM baseline WHERE endpoint = ? AND key > ? ORDER BY key LIMIT ?",
+                    (endpoint, last, PAGE_SIZE)).fetchall()
+            if not page:
+                return
+            for key, value in page:
+                if in_sample(key, rate, seed):
+                    yield value
+            last = page[-1][0]
+
+    def lookup(self, keys: List[str]) -> Dict[str, Tuple[int, Any]]:
+        """(status, output) for every key present in the baseline"""
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 900):
+                chunk = keys[i:i + 900]
+                rows = self._conn.execute(
+                    f"SELECT key, status, output FROM baseline WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk)
+                for key, status, output in rows:
+                    found[key] = (status, json.loads(output))
+        return found
+
+    def store(self, rows: Iterable[Tuple[str, str, str, int, Any]]):
+        """Insert or replace (key, endpoint, input, status, output) rows"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO baseline VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, endpoint, value, status, json.dumps(output), now)
+                 for key, endpoint, value, status, output in rows])
+            self._conn.commit()
+
+    def start_run(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("INSERT INTO runs (started_at) VALUES (?)", (time.time(),))
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def finish_run(self, run_id: int, summary: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute("UPDATE runs SET finished_at = ?, summary = ? WHERE run_id = ?",
+                               (time.time(), json.dumps(summary), run_id))
+            self._conn.commit()
+
+    def last_run(self) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(run_id) FROM runs").fetchone()
+        return row[0]
+
+    def add_changes(self, run_id: int, changes: List[Dict[str, Any]]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO changes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, c["key"], c["endpoint"], c["input"], c["old_status"], json.dumps(c["old_output"]),
+                  c["new_status"], json.dumps(c["new_output"])) for c in changes])
+            self._conn.commit()
+
+    def changes(self, run_id: int, endpoint: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """The outputs that changed in one run, read through the run index"""
+        query = "SELECT key, endpoint, input, old_status, old_output, new_status, new_output FROM changes WHERE run_id = ?"
+        params: Tuple = (run_id,)
+        if endpoint is not None:
+            query += " AND endpoint = ?"
+            params += (endpoint,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        for key, ep, value, old_status, old_output, new_status, new_output in rows:
+            yield {"key": key, "endpoint": ep, "input": value,
+                   "old_status": old_status, "old_output": json.loads(old_output),
+                   "new_status": new_status, "new_output": json.loads(new_output)}
+
+    def import_results(self, path: str, endpoints: Optional[List[str]] = None) -> int:
+        """Seed the baseline from a JSONL capture written by JSONLResultSink"""
+        rows = []
+        for record in read_results(path):
+            if record_kind(record) != PROBE or record.get("method", "POST").upper() == "GET":
+                continue
+            if not finished(record.get("status")) or (endpoints and record["endpoint"] not in endpoints):
+                continue
+            rows.append((input_key(record["endpoint"], record["input"]), record["endpoint"],
+                         record["input"], record["status"], record["output"]))
+        for i in range(0, len(rows), BATCH_SIZE):
+            self.store(rows[i:i + BATCH_SIZE])
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "BaselineSnapshot":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DriftReport:
+    """Counters and the changed outputs for one endpoint in one run"""
+
+    def __init__(self, endpoint: str, run_id: int):
+        self.endpoint = endpoint
+        self.run_id = run_id
+        self.checked = 0
+        self.unchanged = 0
+        self.new = 0
+        self.errors = 0
+        self.updated = 0
+        self.changes: List[Dict[str, Any]] = []
+
+    @property
+    def changed(self) -> int:
+        return len(self.changes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"endpoint": self.endpoint, "run_id": self.run_id, "checked": self.checked,
+                "unchanged": self.unchanged, "changed": self.changed, "new": self.new,
+                "errors": self.errors, "updated": self.updated,
+                "changes": [{k: v for k, v in change.items() if k != "key"} for change in self.changes]}
+
+
+class DriftMonitor:
+    """Re-probe baseline inputs concurrently and report outputs that changed
+
+    Probes always go to the network, bypassing both the response cache and
+    the transport's request memo, and stream through a ProbeEngine. Results are compared against the baseline
+    in batches of BATCH_SIZE with one indexed lookup each. Failed probes
+    (no answer, 429 or 5xx) are counted as errors, never as drift. With
+    update=True the baseline takes the new outputs, and inputs it did not
+    know yet are added, so scheduled runs keep it current.
+    """
+
+    def __init__(self, transport, snapshot: BaselineSnapshot, concurrency: int = 16,
+                 sink=None, reporter=None):
+        self.transport = transport
+        self.snapshot = snapshot
+        self.engine = ProbeEngine(self._submit, concurrency=concurrency, sink=sink, reporter=reporter)
+
+    def _submit(self, endpoint: str, method: str = "POST", data: Dict = None,
+                use_memo: bool = False) -> Dict:
+        # Drift is only visible in fresh answers, so neither the cache nor the memo may answer
+        try:
+            response = self.transport.request(endpoint, method=method, data=data, use_cache=False,
+                                              use_memo=False)
+            if response.headers.get("content-type", "").startswith("application/json"):
+                body = response.json()
+            else:
+                body = {"text": response.text}
+            return {"status_code": response.status_code, "response": body, "timing": response.timing}
+        except Exception as e:
+            return {"error": str(e), "response": {}, "status_code": None}
+
+    def check(self, endpoint: str, inputs: Iterable[str] = None, rate: float = 1.0, seed: int = 0,
+              update: bool = False, run_id: Optional[int] = None, window: Optional[int] = None) -> DriftReport:
+        """Probe `inputs` (default: the endpoint's baseline, sampled at `rate`) and compare"""
+        own_run = run_id is None
+        run_id = self.snapshot.start_run() if own_run else run_id
+        report = DriftReport(endpoint, run_id)
+        if inputs is None:
+            inputs = self.snapshot.inputs(endpoint, rate, seed)
+
+        batch = []
+        for value, result in self.engine.map_stream(endpoint, inputs, window=window, memo=False):
+            batch.append((value, result))
+            if len(batch) >= BATCH_SIZE:
+                self._compare(report, batch, update)
+                batch = []
+        if batch:
+            self._compare(report, batch, update)
+
+        if own_run:
+            self.snapshot.finish_run(run_id, {endpoint: {k: v for k, v in report.to_dict().items()
+                                                         if k != "changes"}})
+        return report
+
+    def check_all(self, endpoints: List[str], rate: float = 1.0, seed: int = 0, update: bool = False,
+                  record_from: Callable[[str], Iterable[str]] = None) -> List[DriftReport]:
+        """One run over several endpoints' baselines
+
+        Endpoints without a baseline yet are recorded from record_from(endpoint)
+        when it is given; their report counts every output as new.
+        """
+        run_id = self.snapshot.start_run()
+        reports = []
+        for endpoint in endpoints:
+            if record_from is not None and not self.snapshot.count(endpoint):
+                reports.append(self.check(endpoint, record_from(endpoint), update=True, run_id=run_id))
+            else:
+                reports.append(self.check(endpoint, rate=rate, seed=seed, update=update, run_id=run_id))
+        self.snapshot.finish_run(run_id, {r.endpoint: {k: v for k, v in r.to_dict().items() if k != "changes"}
+                                          for r in reports})
+        return reports
+
+    def _compare(self, report: DriftReport, batch: List[Tuple[str, Dict]], update: bool):
+        endpoint = report.endpoint
+        keys = [input_key(endpoint, value) for value, _ in batch]
+        known = self.snapshot.lookup(keys)
+        changes, writes = [], []
+        for key, (value, result) in zip(keys, batch):
+            report.checked += 1
+            status = result.get("status_code")
+            if not finished(status):
+                report.errors += 1
+                continue
+            output = result_output(result)
+            if key not in known:
+                report.new += 1
+                writes.append((key, endpoint, value, status, output))
+                continue
+            old_status, old_output = known[key]
+            if old_status == status and same_output(old_output, output):
+                report.unchanged += 1
+                continue
+            changes.append({"key": key, "endpoint": endpoint, "input": value,
+                            "old_status": old_status, "old_output": old_output,
+                            "new_status": status, "new_output": output})
+            writes.append((key, endpoint, value, status, output))
+
+        report.changes.extend(changes)
+        if changes:
+            self.snapshot.add_changes(report.run_id, changes)
+        if update and writes:
+            self.snapshot.store(writes)
+            report.updated += len(writes)
+
+
+def format_drift_report(report: DriftReport, limit: int = 20) -> List[str]:
+    """Human-readable lines for one endpoint's drift; cost grows with the changes only"""
+    lines = [f"{report.endpoint}: {report.checked} checked, {report.unchanged} unchanged, "
+             f"{report.changed} changed, {report.new} new, {report.errors} errors"
+             + (f", {report.updated} baseline rows updated" if report.updated else "")]
+    for change in report.changes[:limit]:
+        old = change["old_output"] if change["old_status"] == 200 else f"HTTP {change['old_status']}"
+        new = change["new_output"] if change["new_status"] == 200 else f"HTTP {change['new_status']}"
+        lines.append(f"  '{change['input']}': {old!r} -> {new!r}")
+    if report.changed > limit:
+        lines.append(f"  ... and {report.changed - limit} more (run {report.run_id} in the changes table)")
+    return lines
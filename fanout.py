@@ -0,0 +1,183 @@
+import itertools
+import time
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from checkpoint import finished
+from hypothesis_registry import same_output
+from probe_engine import ProbeEngine, result_output
+from result_sink import DIFF
+
+ERROR_MARK = "!"
+
+
+def diff_pattern(answers: List[Optional[Tuple[int, Any]]]) -> str:
+    """One letter per target: targets that answered alike share a letter, "!" marks failures
+
+    "AAA" means every target agreed, "AAB" that the third one differs and
+    "A!A" that the second one failed while the others agreed.
+    """
+    classes: List[Tuple[int, Any]] = []
+    letters = []
+    for answer in answers:
+        if answer is None:
+            letters.append(ERROR_MARK)
+            continue
+        status, output = answer
+        for i, (known_status, known_output) in enumerate(classes):
+            if known_status == status and same_output(known_output, output):
+                letters.append(chr(ord("A") + i))
+                break
+        else:
+            classes.append(answer)
+            letters.append(chr(ord("A") + len(classes) - 1))
+    return "".join(letters)
+
+
+class DiffMatrix:
+    """How a set of targets answered the same inputs on one endpoint
+
+    Every input gets a diff_pattern(). The matrix keeps the count of each
+    pattern, a pairwise count of inputs on which two targets answered
+    differently, failures per target and the first `limit` differing rows,
+    so memory does not grow with the corpus. The full per-input matrix goes
+    to the result sink, if there is one, as records of kind DIFF, which the
+    probe readers (read_findings, offline analysis, checkpoints) skip.
+    """
+
+    def __init__(self, endpoint: str, targets: List[str], limit: int = 100):
+        self.endpoint = endpoint
+        self.targets = list(targets)
+        self.limit = limit
+        self.checked = 0
+        self.agreed = 0
+        self.differing = 0
+        self.incomplete = 0
+        self.errors = Counter()
+        self.patterns = Counter()
+        self.pairwise = [[0] * len(self.targets) for _ in self.targets]
+        self.diffs: List[Dict[str, Any]] = []
+
+    def add(self, row: Dict[str, Any]):
+        pattern = row["pattern"]
+        self.checked += 1
+        self.patterns[pattern] += 1
+        answered = [(i, letter) for i, letter in enumerate(pattern) if letter != ERROR_MARK]
+        for i, letter in enumerate(pattern):
+            if letter == ERROR_MARK:
+                self.errors[self.targets[i]] += 1
+        for (i, a), (j, b) in itertools.combinations(answered, 2):
+            if a != b:
+                self.pairwise[i][j] += 1
+                self.pairwise[j][i] += 1
+        if len({letter for _, letter in answered}) > 1:
+            self.differing += 1
+            if len(self.diffs) < self.limit:
+                self.diffs.append(row)
+        elif len(answered) < len(pattern):
+            self.incomplete += 1
+        else:
+            self.agreed += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"endpoint": self.endpoint, "targets": self.targets, "checked": self.checked,
+                "agreed": self.agreed, "differing": self.differing, "incomplete": self.incomplete,
+                "errors": dict(self.errors), "patterns": dict(self.patterns.most_common()),
+                "pairwise": {a: {b: self.pairwise[i][j] for j, b in enumerate(self.targets) if i != j}
+                             for i, a in enumerate(self.targets)},
+                "diffs": self.diffs}
+
+
+class FanOut:
+    """Send the same inputs to several deployments at once and diff their answers
+
+    Each input becomes one probe per target, interleaved in a single
+    ProbeEngine stream, so all targets are probed concurrently and a row is
+    complete as soon as its last target answers. Probes bypass the request
+    memo, so earlier probing on a shared transport cannot stand in; the
+    response cache is keyed per base URL and is used as on any other run.
+    Failed probes (no answer, 429 or 5xx) are marked "!" and never count as
+    a difference.
+    """
+
+    def __init__(self, transports: Dict[str, Any], concurrency: int = 16, sink=None,
+                 reporter=None, limit: int = 100):
+        if len(transports) < 2:
+            raise ValueError("fan-out needs at least two targets")
+        self.transports = dict(transports)
+        self.targets = list(self.transports)
+        self.sink = sink
+        self.limit = limit
+        self.engine = ProbeEngine(self._submit, concurrency=concurrency * len(self.targets),
+                                  reporter=reporter)
+
+    def _submit(self, target: str, endpoint: str, method: str = "POST", data: Dict = None,
+                use_memo: bool = False) -> Dict:
+        try:
+            response = self.transports[target].request(endpoint, method=method, data=data, use_memo=False)
+            if response.headers.get("content-type", "").startswith("application/json"):
+                body = response.json()
+            else:
+                body = {"text": response.text}
+            return {"status_code": response.status_code, "response": body, "timing": response.timing}
+        except Exception as e:
+            return {"error": str(e), "response": {}, "status_code": None}
+
+    def _probes(self, endpoint: str, inputs: Iterable[str]) -> Iterable[Dict]:
+        for value in inputs:
+            probe = ProbeEngine.probe(endpoint, value)
+            for target in self.targets:
+                yield {**probe, "target": target}
+
+    def compare(self, endpoint: str, inputs: Iterable[str], window: Optional[int] = None) -> DiffMatrix:
+        """Probe every input on every target and build the endpoint's diff matrix"""
+        matrix = DiffMatrix(endpoint, self.targets, self.limit)
+        window = window or self.engine.concurrency * 4
+        results = self.engine.stream(self._probes(endpoint, inputs), window, memo=False)
+        while True:
+            row = list(itertools.islice(results, len(self.targets)))
+            if not row:
+                break
+            matrix.add(self._row(endpoint, row))
+        return matrix
+
+    def _row(self, endpoint: str, row: List[Tuple[Dict, Dict]]) -> Dict[str, Any]:
+        answers, outputs = [], {}
+        for probe, result in row:
+            status = result.get("status_code")
+            output = result_output(result)
+            answers.append((status, output) if finished(status) else None)
+            outputs[probe["target"]] = {"status": status, "output": output, "error": result.get("error")}
+        record = {"ts": round(time.time(), 6), "kind": DIFF, "endpoint": endpoint, "input": row[0][0]["data"]["data"],
+                  "pattern": diff_pattern(answers), "targets": outputs}
+        if self.sink is not None:
+            self.sink.write(record)
+        return record
+
+
+def format_diff_matrix(matrix: DiffMatrix, limit: int = 20) -> List[str]:
+    """Human-readable lines for one endpoint: totals, patterns, pairwise counts and sample diffs"""
+    lines = [f"{matrix.endpoint}: {matrix.checked} inputs, {matrix.agreed} agree, "
+             f"{matrix.differing} differ, {matrix.incomplete} incomplete"
+             + (f" (failures: {dict(matrix.errors)})" if matrix.errors else "")]
+    if not matrix.checked:
+        return lines
+    width = max(len(target) for target in matrix.targets)
+    lines.append(f"  pattern ({' '.join(matrix.targets)}):")
+    for pattern, count in matrix.patterns.most_common():
+        lines.append(f"    {pattern:<{len(matrix.targets)}}  {count:>9}")
+    lines.append("  differing inputs per pair:")
+    lines.append(f"    {'':<{width}}" + "".join(f" {target:>{max(width, 7)}}" for target in matrix.targets))
+    for i, target in enumerate(matrix.targets):
+        cells = ["-" if i == j else str(count) for j, count in enumerate(matrix.pairwise[i])]
+        lines.append(f"    {target:<{width}}" + "".join(f" {cell:>{max(width, 7)}}" for cell in cells))
+    for row in matrix.diffs[:limit]:
+        answers = ", ".join(
+            f"{target}={answer['output']!r}" if answer["status"] == 200
+            else f"{target}=HTTP {answer['status']}" if answer["status"] is not None
+            else f"{target}=failed"
+            for target, answer in row["targets"].items())
+        lines.append(f"  [{row['pattern']}] '{row['input']}': {answers}")
+    if matrix.differing > limit:
+        lines.append(f"  ... and {matrix.differing - limit} more differing inputs")
+    return lines
@@ -0,0 +1,134 @@
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+# Per-codepoint classes, each counted per input
+CHAR_CLASSES = {
+    "alpha": str.isalpha,
+    "digit": str.isdigit,
+    "alnum": str.isalnum,
+    "upper": str.isupper,
+    "lower": str.islower,
+    "space": str.isspace,
+    "ascii": str.isascii,
+}
+
+
+def classify_codepoints(codepoints: np.ndarray) -> Dict[str, np.ndarray]:
+    """Boolean class arrays for a codepoint array
+
+    Only the distinct codepoints are classified in Python; the results are
+    scattered back to every position with one searchsorted.
+    """
+    unique = np.unique(codepoints)
+    chars = [chr(cp) for cp in unique.tolist()]
+    positions = np.searchsorted(unique, codepoints)
+    return {name: np.array([test(c) for c in chars], dtype=bool)[positions]
+            for name, test in CHAR_CLASSES.items()}
+
+
+class FeatureTable:
+    """Input features and outputs of a set of probes, stored as NumPy columns
+
+    All inputs are decoded into one flat codepoint array, so lengths,
+    codepoint statistics and character-class counts are computed with
+    segment reductions instead of per-row string methods. Whole-string
+    flags follow str semantics: "isalpha" means non-empty and every
+    character alphabetic. Columns read as attributes, e.g. table.length.
+    """
+
+    def __init__(self, inputs: List[str], outputs: List[Any]):
+        self.inputs = np.array([str(s) for s in inputs], dtype=object)
+        self.outputs = list(outputs)
+        n = len(self.inputs)
+
+        lengths = np.fromiter((len(s) for s in self.inputs), dtype=np.int64, count=n)
+        codepoints = np.frombuffer("".join(self.inputs).encode("utf-32-le"), dtype=np.uint32)
+        rows = np.repeat(np.arange(n), lengths)
+        classes = classify_codepoints(codepoints)
+
+        def per_row(values) -> np.ndarray:
+            return np.bincount(rows, weights=values, minlength=n)
+
+        columns: Dict[str, np.ndarray] = {"length": lengths}
+        columns["byte_length"] = np.fromiter((len(s.encode()) for s in self.inputs),
+                                             dtype=np.int64, count=n)
+        for name, mask in classes.items():
+            columns[f"n_{name}"] = per_row(mask).astype(np.int64)
+        columns["n_special"] = lengths - columns["n_alnum"]
+        columns["cp_sum"] = per_row(codepoints).astype(np.int64)
+        columns["cp_mean"] = np.divide(columns["cp_sum"], lengths, out=np.zeros(n), where=lengths > 0)
+        starts = np.cumsum(lengths) - lengths
+        nonempty = lengths > 0
+        columns["cp_min"] = np.zeros(n, dtype=np.int64)
+        columns["cp_max"] = np.zeros(n, dtype=np.int64)
+        if len(codepoints):
+            columns["cp_min"][nonempty] = np.minimum.reduceat(codepoints, starts[nonempty])
+            columns["cp_max"][nonempty] = np.maximum.reduceat(codepoints, starts[nonempty])
+
+        columns["is_empty"] = ~nonempty
+        for name in ("alpha", "digit", "alnum", "space"):
+            columns[f"is_{name}"] = nonempty & (columns[f"n_{name}"] == lengths)
+        columns["is_ascii"] = columns["n_ascii"] == lengths
+        # Cased strings: str.isupper/islower ignore uncased characters
+        columns["is_upper"] = (columns["n_upper"] > 0) & (columns["n_lower"] == 0)
+        columns["is_lower"] = (columns["n_lower"] > 0) & (columns["n_upper"] == 0)
+        columns["has_digit"] = columns["n_digit"] > 0
+        columns["has_space"] = columns["n_space"] > 0
+        columns["has_special"] = columns["n_special"] > 0
+        columns["has_non_ascii"] = ~columns["is_ascii"]
+        self.columns = columns
+
+        is_bool = np.array([isinstance(o, bool) for o in self.outputs], dtype=bool)
+        self.labeled = is_bool
+        self.label = np.array([o is True for o in self.outputs], dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.inputs)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @property
+    def true(self) -> np.ndarray:
+        return self.labeled & self.label
+
+    @property
+    def false(self) -> np.ndarray:
+        return self.labeled & ~self.label
+
+    def contains(self, substring: str, ignore_case: bool = True) -> np.ndarray:
+        """Rows whose input contains substring"""
+        text = self.inputs.astype(str)
+        if ignore_case:
+            text, substring = np.char.lower(text), substring.lower()
+        return np.char.find(text, substring) >= 0
+
+    def crosstab(self, column: str) -> List[Tuple[Any, int, int]]:
+        """(value, true count, false count) for each distinct value of a column"""
+        values, inverse = np.unique(self.columns[column], return_inverse=True)
+        true = np.bincount(inverse, weights=self.true, minlength=len(values)).astype(int)
+        false = np.bincount(inverse, weights=self.false, minlength=len(values)).astype(int)
+        return [(value.item(), int(t), int(f)) for value, t, f in zip(values, true, false)]
+
+    def correlations(self) -> Dict[str, float]:
+        """Pearson correlation of every non-constant column with the boolean output"""
+        if self.labeled.sum() < 2:
+            return {}
+        label = self.label[self.labeled].astype(float)
+        if label.std() == 0:
+            return {}
+        result = {}
+        for name, column in self.columns.items():
+            values = column[self.labeled].astype(float)
+            if values.std() == 0:
+                continue
+            result[name] = float(np.corrcoef(values, label)[0, 1])
+        return dict(sorted(result.items(), key=lambda item: -abs(item[1])))
+
+    def to_dict(self) -> Dict[str, list]:
+        return {"input": self.inputs.tolist(), "output": self.outputs,
+                **{name: column.tolist() for name, column in self.columns.items()}}
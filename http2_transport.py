@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Any, Iterable, Optional
+
+try:
+    import httpx
+except ImportError:  # optional: pip install -r requirements-http2.txt
+    httpx = None
+
+from middleware import Middleware
+from rate_limiter import RateLimiter
+from timing import RequestTiming
+from transport import DEFAULT_BASE_URL, RETRY_STATUSES, HTTPTransport, Timeout, TransportResponse
+
+
+def http2_available() -> bool:
+    """Whether httpx and its HTTP/2 support (the h2 package) are installed"""
+    if httpx is None:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HTTP2Transport(HTTPTransport):
+    """HTTPTransport that multiplexes requests over a few HTTP/2 connections
+
+    One httpx.AsyncClient on a background event loop carries the requests
+    of every probe thread as streams on shared connections, so hundreds of
+    probes can be in flight over `max_connections` sockets; a new one is
+    only opened when the server's concurrent-stream limit is reached.
+    https:// URLs negotiate h2 through ALPN, http:// URLs use prior
+    knowledge (h2c). The memo, cache, rate limiter, middleware and timings
+    behave as in HTTPTransport; only ttfb and total are timed, since
+    connections are shared. Failed streams and 5xx answers are retried here
+    with backoff, not by httpx. Large uploads via send_body stay on HTTP/1.1.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, pool_size: int = 16,
+                 timeout: Timeout = (3.05, 10.0), max_retries: int = 3,
+                 backoff_factor: float = 0.3, cache=None, dedupe: bool = True,
+                 rate_limiter: RateLimiter = None, middleware: Iterable[Middleware] = (),
+                 max_connections: int = 4):
+        if not http2_available():
+            raise ImportError("HTTP2Transport needs httpx with HTTP/2 support: pip install -r requirements-http2.txt")
+        self.max_connections = max_connections
+        self.connections_opened = 0
+        super().__init__(base_url, pool_size, timeout, max_retries, backoff_factor, cache,
+                         dedupe, rate_limiter, middleware)
+
+    def _open_session(self, pool_size: int, max_retries: int, backoff_factor: float):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="http2-transport", daemon=True)
+        self._thread.start()
+        self._client = self._call(self._open_client())
+        return None
+
+    async def _open_client(self):
+        limits = httpx.Limits(max_connections=self.max_connections,
+                              max_keepalive_connections=self.max_connections)
+        # Without TLS there is no ALPN, so HTTP/1.1 has to be ruled out to get h2c
+        transport = httpx.AsyncHTTPTransport(http2=True, http1=not self.base_url.startswith("http://"),
+                                             limits=limits)
+        return httpx.AsyncClient(transport=transport)
+
+    async def _trace(self, event: str, info: Dict[str, Any]):
+        # httpcore's "trace" request extension reports every new socket, on the loop thread
+        if event == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _send(self, endpoint: str, method: str, data: Dict,
+              timeout: Optional[Timeout]) -> TransportResponse:
+        timeout = self.timeout if timeout is None else timeout
+        timing = RequestTiming()
+        response = self._call(self._send_async(endpoint, method, data, timeout, timing))
+        self.timings.record(endpoint, timing)
+        response.timing = timing.to_dict()
+        return response
+
+    async def _send_async(self, endpoint: str, method: str, data: Dict, timeout: Timeout,
+                          timing: RequestTiming) -> TransportResponse:
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        request_timeout = httpx.Timeout(read, connect=connect)
+        for attempt in range(self.max_retries + 1):
+            request = self._client.build_request(method, self.url(endpoint), timeout=request_timeout,
+                                                 json=None if method == "GET" else data,
+                                                 extensions={"trace": self._trace})
+            try:
+                response = await self._client.send(request, stream=True)
+                try:
+                    timing.ttfb = time.perf_counter() - timing.start
+                    content = await response.aread()
+                finally:
+                    await response.aclose()
+            except httpx.TransportError:
+                # Failed connects, and streams caught when a server retires a connection
+                # after N requests (GOAWAY); the probes are safe to send again
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    break
+            await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+        timing.total = time.perf_counter() - timing.start
+        return TransportResponse(response.status_code, dict(response.headers), content)
+
+    def close(self):
+        if self._loop.is_running():
+            self._call(self._client.aclose())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+        super().close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"max_connections": self.max_connections, "connections_opened": self.connections_opened}
@@ -0,0 +1,152 @@
+import hashlib
+import time
+import zlib
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+
+FNV_OFFSET_32 = 0x811C9DC5
+FNV_PRIME_32 = 0x01000193
+
+
+def md5_prefix(s: str, hex_digits: int = 8) -> int:
+    """First hex_digits of the MD5 hex digest, read as an integer"""
+    return int(hashlib.md5(s.encode()).hexdigest()[:hex_digits], 16)
+
+
+def sha1_prefix(s: str, hex_digits: int = 8) -> int:
+    """First hex_digits of the SHA-1 hex digest, read as an integer"""
+    return int(hashlib.sha1(s.encode()).hexdigest()[:hex_digits], 16)
+
+
+def crc32(s: str) -> int:
+    return zlib.crc32(s.encode())
+
+
+def fnv1a_32(s: str) -> int:
+    value = FNV_OFFSET_32
+    for byte in s.encode():
+        value = ((value ^ byte) * FNV_PRIME_32) & 0xFFFFFFFF
+    return value
+
+
+def int_array(values) -> np.ndarray:
+    """Integers as an int64 array, or an object array if any of them does not fit in 64 bits"""
+    try:
+        return np.asarray(values, dtype=np.int64)
+    except OverflowError:
+        return np.asarray(values, dtype=object)
+
+
+class DigestTable:
+    """Digests and ASCII features of each input, computed once and stored column-wise"""
+
+    def __init__(self, inputs: List[str]):
+        self.inputs = [str(s) for s in inputs]
+        columns: Dict[str, List[int]] = {name: [] for name in
+                                         ("md5", "sha1", "crc32", "fnv1a", "length",
+                                          "byte_length", "ascii_sum", "first_ord")}
+        for s in self.inputs:
+            encoded = s.encode()
+            columns["md5"].append(int.from_bytes(hashlib.md5(encoded).digest()[:4], "big"))
+            columns["sha1"].append(int.from_bytes(hashlib.sha1(encoded).digest()[:4], "big"))
+            columns["crc32"].append(zlib.crc32(encoded))
+            columns["fnv1a"].append(fnv1a_32(s))
+            columns["length"].append(len(s))
+            columns["byte_length"].append(len(encoded))
+            columns["ascii_sum"].append(sum(map(ord, s)))
+            columns["first_ord"].append(ord(s[0]) if s else 0)
+
+        self.columns = {name: int_array(values) for name, values in columns.items()}
+
+    def __len__(self) -> int:
+        return len(self.inputs)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+# Each candidate maps a whole DigestTable to an array of predicted outputs
+DATA_CANDIDATES: Dict[str, Callable[[DigestTable], np.ndarray]] = {
+    "md5_int": lambda t: t.md5,
+    "sha1_int": lambda t: t.sha1,
+    "crc32": lambda t: t.crc32,
+    "fnv1a_32": lambda t: t.fnv1a,
+    "md5_mod_10m": lambda t: t.md5 % 10_000_000,
+    "crc32_mod_10m": lambda t: t.crc32 % 10_000_000,
+    "len": lambda t: t.length,
+    "byte_len": lambda t: t.byte_length,
+    "sum_ascii": lambda t: t.ascii_sum,
+    "product_ascii": lambda t: np.where(t.length == 0, 1, t.first_ord * t.length),
+    "xor_ascii": lambda t: np.where(t.length == 0, 0, t.first_ord ^ t.length),
+}
+
+
+class MatchResult:
+    """How well one candidate function explains the observed outputs"""
+
+    def __init__(self, name: str, matches: int, total: int, seconds: float,
+                 error: Optional[str] = None):
+        self.name = name
+        self.matches = matches
+        self.total = total
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def score(self) -> float:
+        return self.matches / self.total if self.total else 0.0
+
+    @property
+    def exact(self) -> bool:
+        return self.error is None and self.total > 0 and self.matches == self.total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "matches": self.matches, "total": self.total,
+                "score": self.score, "seconds": self.seconds, "error": self.error}
+
+
+class BatchHypothesisMatcher:
+    """Test many candidate functions against many (input, output) samples at once
+
+    Digests are computed once per input into a DigestTable, and every
+    candidate is evaluated as a single array operation against the observed
+    outputs. Samples without an integer output are left out of the scores.
+    Outputs or predictions beyond int64 (e.g. 64-bit hashes) are compared
+    as Python integers instead of overflowing.
+    """
+
+    def __init__(self, candidates: Dict[str, Callable[[DigestTable], np.ndarray]] = None):
+        self.candidates = dict(DATA_CANDIDATES if candidates is None else candidates)
+
+    @staticmethod
+    def observed_array(outputs: List[Any]):
+        """Observed outputs as an integer array plus a mask of usable samples"""
+        valid = np.array([isinstance(o, int) and not isinstance(o, bool) for o in outputs],
+                         dtype=bool)
+        observed = int_array([o if ok else 0 for o, ok in zip(outputs, valid)])
+        return observed, valid
+
+    def match(self, inputs: List[str], outputs: List[Any],
+              table: DigestTable = None) -> List[MatchResult]:
+        """Score every candidate, best first"""
+        table = table if table is not None else DigestTable(inputs)
+        observed, valid = self.observed_array(outputs)
+        total = int(valid.sum())
+
+        results = []
+        for name, candidate in self.candidates.items():
+            start = time.perf_counter()
+            try:
+                predicted = int_array(candidate(table))
+                matches = int(np.count_nonzero((predicted == observed).astype(bool) & valid))
+                error = None
+            except Exception as e:
+                matches, error = 0, f"{type(e).__name__}: {e}"
+            results.append(MatchResult(name, matches, total, time.perf_counter() - start, error))
+
+        results.sort(key=lambda r: (r.error is None, r.matches), reverse=True)
+        return results
@@ -0,0 +1,188 @@
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+
+from hypothesis_matcher import md5_prefix, sha1_prefix, crc32, fnv1a_32
+from probe_engine import ProbeEngine, result_output
+
+Model = Callable[[str], Any]
+
+GLITCH_KEYWORDS = ("glitch", "error", "bug", "fail")
+
+
+def first_number(s: str) -> Optional[int]:
+    match = re.search(r"\d+", s)
+    return int(match.group()) if match else None
+
+
+def documented_fizzbuzz(s: str) -> bool:
+    """/fizzbuzz as documented: first run of digits divisible by both 3 and 5"""
+    num = first_number(s)
+    return num is not None and num % 15 == 0
+
+
+def documented_glitch(s: str) -> bool:
+    """/glitch as documented in ENDPOINT_ANALYSIS_LOGGING_SHEET.md"""
+    if any(keyword in s.lower() for keyword in GLITCH_KEYWORDS):
+        return True
+    if any(c.isdigit() for c in s):
+        return False
+    if s and (len(s) % 3 == 0 or len(s) % 5 == 0):
+        return True
+    has_special = any(not c.isalnum() for c in s)
+    return has_special and len(s) > 5
+
+
+def same_output(predicted: Any, observed: Any) -> bool:
+    """Equality that does not let True stand in for 1"""
+    if isinstance(predicted, bool) or isinstance(observed, bool):
+        return predicted is observed
+    return predicted == observed
+
+
+class HypothesisSession:
+    """Candidate models for one endpoint, pruned by every observation"""
+
+    def __init__(self, endpoint: str, models: Dict[str, Model]):
+        self.endpoint = endpoint
+        self.survivors = dict(models)
+        self.counterexamples: Dict[str, Tuple[str, Any, Any]] = {}
+        self.observations = 0
+
+    def predict(self, name: str, value: str) -> Any:
+        try:
+            return self.survivors[name](value)
+        except Exception as e:
+            return e
+
+    def observe(self, value: str, output: Any) -> List[str]:
+        """Eliminate the models that contradict one (input, output) pair
+
+        Observations without an output (errors, non-JSON bodies) are ignored.
+        Returns the names of the models that were eliminated.
+        """
+        if output is None:
+            return []
+        self.observations += 1
+        eliminated = []
+        for name in list(self.survivors):
+            predicted = self.predict(name, value)
+            if not same_output(predicted, output):
+                self.counterexamples[name] = (value, predicted, output)
+                del self.survivors[name]
+                eliminated.append(name)
+        return eliminated
+
+    @property
+    def resolved(self) -> bool:
+        return len(self.survivors) == 1
+
+    @property
+    def settled(self) -> bool:
+        """Nothing more to learn: one model left, or none at all"""
+        return len(self.survivors) <= 1
+
+    @property
+    def answer(self) -> Optional[str]:
+        return next(iter(self.survivors)) if self.resolved else None
+
+
+class HypothesisRegistry:
+    """Named candidate models per endpoint"""
+
+    def __init__(self):
+        self._models: Dict[str, Dict[str, Model]] = defaultdict(dict)
+
+    def register(self, endpoint: str, name: str, model: Model = None):
+        """Register a model directly, or use as a decorator when model is omitted"""
+        if model is None:
+            def decorator(func: Model) -> Model:
+                self._models[endpoint][name] = func
+                return func
+            return decorator
+        self._models[endpoint][name] = model
+        return model
+
+    def endpoints(self) -> List[str]:
+        return sorted(self._models)
+
+    def models(self, endpoint: str) -> Dict[str, Model]:
+        return dict(self._models.get(endpoint, {}))
+
+    def session(self, endpoint: str) -> HypothesisSession:
+        return HypothesisSession(endpoint, self.models(endpoint))
+
+    def evaluate(self, endpoint: str, pairs: Iterable[Tuple[str, Any]]) -> HypothesisSession:
+        """Prune the endpoint's models against already collected (input, output) pairs"""
+        session = self.session(endpoint)
+        for value, output in pairs:
+            session.observe(str(value), output)
+        return session
+
+
+REGISTRY = HypothesisRegistry()
+
+for _name, _model in {
+    "md5_int": md5_prefix,
+    "sha1_int": sha1_prefix,
+    "crc32": crc32,
+    "fnv1a_32": fnv1a_32,
+    "len": len,
+    "sum_ascii": lambda s: sum(ord(c) for c in s),
+}.items():
+    REGISTRY.register("/data", _name, _model)
+
+for _name, _model in {
+    "echo": lambda s: s,
+    "reverse": lambda s: s[::-1],
+    "upper": str.upper,
+    "lower": str.lower,
+    "strip": str.strip,
+}.items():
+    REGISTRY.register("/zap", _name, _model)
+
+for _name, _model in {
+    "isalpha": str.isalpha,
+    "isalnum": str.isalnum,
+    "ascii_letters_only": lambda s: bool(re.fullmatch(r"[A-Za-z]+", s)),
+    "islower": str.islower,
+    "isupper": str.isupper,
+    "no_digits": lambda s: not any(c.isdigit() for c in s),
+}.items():
+    REGISTRY.register("/alpha", _name, _model)
+
+for _name, _model in {
+    "first_number_div_15": documented_fizzbuzz,
+    "first_nonzero_number_div_15": lambda s: bool(first_number(s)) and first_number(s) % 15 == 0,
+    "first_number_div_3": lambda s: first_number(s) is not None and first_number(s) % 3 == 0,
+    "first_number_div_5": lambda s: first_number(s) is not None and first_number(s) % 5 == 0,
+    "integer_div_15": lambda s: s.strip().lstrip("-").isdigit() and int(s) % 15 == 0,
+    "any_number_div_15": lambda s: any(int(n) % 15 == 0 for n in re.findall(r"\d+", s)),
+}.items():
+    REGISTRY.register("/fizzbuzz", _name, _model)
+
+for _name, _model in {
+    "documented_rule": documented_glitch,
+    "len_div_3_or_5": lambda s: bool(s) and (len(s) % 3 == 0 or len(s) % 5 == 0),
+    "len_odd": lambda s: len(s) % 2 == 1,
+    "no_digits": lambda s: bool(s) and not any(c.isdigit() for c in s),
+    "isalpha": str.isalpha,
+    "keyword": lambda s: any(k in s.lower() for k in GLITCH_KEYWORDS),
+}.items():
+    REGISTRY.register("/glitch", _name, _model)
+
+
+def identify(engine: ProbeEngine, endpoint: str, inputs: Iterable[str],
+             registry: HypothesisRegistry = REGISTRY) -> HypothesisSession:
+    """Probe an endpoint only until its registered models are settled
+
+    Inputs are sent in waves of the engine's concurrency. Probing stops as
+    soon as one model survives, or none does.
+    """
+    session = registry.session(endpoint)
+    probes = (engine.probe(endpoint, value) for value in inputs)
+    engine.run_until(probes,
+                     lambda probe, result: session.observe(probe["data"]["data"],
+                                                           result_output(result)),
+                     lambda: session.settled)
+    return session
@@ -0,0 +1,95 @@
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional
+
+from reporter import Reporter
+
+Request = Dict[str, Any]
+
+
+class Middleware:
+    """Hooks around every HTTPTransport.request call
+
+    pre_request may edit the request dict ("method", "endpoint", "data")
+    before it is sent. post_response may return a replacement response.
+    on_error may return a response to recover from the exception; if
+    none does, the exception propagates as before. Subclass and override,
+    or pass plain callables for the hooks you need.
+    """
+
+    def __init__(self, pre_request: Callable[[Request], None] = None,
+                 post_response: Callable[[Request, Any], Any] = None,
+                 on_error: Callable[[Request, Exception], Any] = None):
+        self._pre_request = pre_request
+        self._post_response = post_response
+        self._on_error = on_error
+
+    def pre_request(self, request: Request) -> None:
+        if self._pre_request is not None:
+            self._pre_request(request)
+
+    def post_response(self, request: Request, response) -> Optional[Any]:
+        if self._post_response is not None:
+            return self._post_response(request, response)
+        return None
+
+    def on_error(self, request: Request, error: Exception) -> Optional[Any]:
+        if self._on_error is not None:
+            return self._on_error(request, error)
+        return None
+
+
+class MiddlewareChain:
+    """Ordered middleware; pre_request runs first to last, the others last to first"""
+
+    def __init__(self, middleware: Iterable[Middleware] = ()):
+        self._middleware: List[Middleware] = list(middleware)
+
+    def add(self, middleware: Middleware) -> Middleware:
+        self._middleware.append(middleware)
+        return middleware
+
+    def remove(self, middleware: Middleware):
+        self._middleware.remove(middleware)
+
+    def __len__(self) -> int:
+        return len(self._middleware)
+
+    def __iter__(self) -> Iterator[Middleware]:
+        return iter(self._middleware)
+
+    def call(self, request: Request, send: Callable[[Request], Any]):
+        """Run `send` for a request with every hook applied around it"""
+        middleware = list(self._middleware)
+        for m in middleware:
+            m.pre_request(request)
+        try:
+            response = send(request)
+        except Exception as e:
+            for m in reversed(middleware):
+                response = m.on_error(request, e)
+                if response is not None:
+                    break
+            else:
+                raise
+        for m in reversed(middleware):
+            replaced = m.post_response(request, response)
+            if replaced is not None:
+                response = replaced
+        return response
+
+
+class RequestLogger(Middleware):
+    """Log every request, its status and timing, and failures at debug level"""
+
+    def __init__(self, reporter: Reporter):
+        super().__init__()
+        self.reporter = reporter
+
+    def pre_request(self, request: Request) -> None:
+        self.reporter.debug(f"  → {request['method']} {request['endpoint']} {request['data']}")
+
+    def post_response(self, request: Request, response) -> None:
+        source = "cache" if response.cached else response.timing
+        self.reporter.debug(f"  ← {response.status_code} {request['endpoint']} {source}")
+
+    def on_error(self, request: Request, error: Exception) -> None:
+        self.reporter.debug(f"  ✗ {request['endpoint']} {type(error).__name__}: {error}")
@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from hypothesis_registry import REGISTRY, same_output
+from result_sink import PROBE, record_kind
+
+MIN_SHARD_BYTES = 1 << 20
+
+CHAR_CLASSES = {
+    "empty": lambda s: not s,
+    "isalpha": str.isalpha,
+    "isdigit": str.isdigit,
+    "isalnum": str.isalnum,
+    "isascii": str.isascii,
+    "has_digit": lambda s: any(c.isdigit() for c in s),
+    "has_space": lambda s: any(c.isspace() for c in s),
+    "has_special": lambda s: any(not c.isalnum() for c in s),
+}
+
+
+class PatternStats:
+    """Mergeable statistics for one endpoint's results
+
+    Each shard of a result set builds its own PatternStats; merge() adds
+    them up in shard order, so counterexamples stay the earliest ones seen.
+    """
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.rows = 0
+        self.errors = 0
+        self.statuses = Counter()
+        self.output_types = Counter()
+        self.outputs_by_length = Counter()
+        self.outputs_by_class = Counter()
+        self.model_agreements = Counter()
+        self.observed = 0
+        self.counterexamples: Dict[str, Tuple[str, Any, Any]] = {}
+        self._models = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_models"] = None
+        return state
+
+    def add(self, record: Dict[str, Any]):
+        self.rows += 1
+        self.statuses[record.get("status")] += 1
+        if record.get("error"):
+            self.errors += 1
+        output = record.get("output")
+        value = record.get("input")
+        if output is None or value is None:
+            return
+        value = str(value)
+        self.output_types[type(output).__name__] += 1
+
+        if isinstance(output, bool):
+            self.outputs_by_length[(len(value), output)] += 1
+            for name, test in CHAR_CLASSES.items():
+                self.outputs_by_class[(name, test(value), output)] += 1
+
+        if self._models is None:
+            self._models = REGISTRY.models(self.endpoint)
+        self.observed += 1
+        for name, model in self._models.items():
+            try:
+                predicted = model(value)
+            except Exception as e:
+                predicted = e
+            if same_output(predicted, output):
+                self.model_agreements[name] += 1
+            elif name not in self.counterexamples:
+                self.counterexamples[name] = (value, predicted, output)
+
+    def merge(self, other: "PatternStats") -> "PatternStats":
+        self.rows += other.rows
+        self.errors += other.errors
+        self.statuses.update(other.statuses)
+        self.output_types.update(other.output_types)
+        self.outputs_by_length.update(other.outputs_by_length)
+        self.outputs_by_class.update(other.outputs_by_class)
+        self.model_agreements.update(other.model_agreements)
+        self.observed += other.observed
+        for name, example in other.counterexamples.items():
+            self.counterexamples.setdefault(name, example)
+        return self
+
+    @property
+    def survivors(self) -> List[str]:
+        """Models that agree with every observed output"""
+        return [name for name, count in self.model_agreements.items() if count == self.observed]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "endpoint": self.endpoint,
+            "rows": self.rows,
+            "errors": self.errors,
+            "statuses": {str(k): v for k, v in self.statuses.items()},
+            "output_types": dict(self.output_types),
+            "observed": self.observed,
+            "model_accuracy": {name: round(count / self.observed, 6)
+                               for name, count in self.model_agreements.items()} if self.observed else {},
+            "survivors": self.survivors,
+            "counterexamples": {name: {"input": v, "predicted": repr(p), "observed": o}
+                                for name, (v, p, o) in self.counterexamples.items()},
+        }
+
+
+def collect(records: Iterable[Dict[str, Any]], endpoints: Optional[List[str]] = None) -> Dict[str, PatternStats]:
+    """Build PatternStats per endpoint from an iterable of result records"""
+    stats: Dict[str, PatternStats] = {}
+    for record in records:
+        endpoint = record.get("endpoint")
+        if endpoint is None or (endpoints and endpoint not in endpoints) or record_kind(record) != PROBE:
+            continue
+        if endpoint not in stats:
+            stats[endpoint] = PatternStats(endpoint)
+        stats[endpoint].add(record)
+    return stats
+
+
+def merge_all(parts: Iterable[Dict[str, PatternStats]]) -> Dict[str, PatternStats]:
+    """Reduce per-shard results, keeping shard order"""
+    merged: Dict[str, PatternStats] = {}
+    for part in parts:
+        for endpoint, stats in part.items():
+            if endpoint in merged:
+                merged[endpoint].merge(stats)
+            else:
+                merged[endpoint] = stats
+    return merged
+
+
+def byte_ranges(path: str, shards: int) -> List[Tuple[int, int]]:
+    """Split a file into roughly equal byte ranges; lines are assigned by their start offset"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return [(0, 0)]
+    shards = max(1, min(shards, size // MIN_SHARD_BYTES or 1))
+    step = -(-size // shards)
+    return [(start, min(size, start + step)) for start in range(0, size, step)]
+
+
+def _read_range(path: str, start: int, end: int) -> Iterable[Dict[str, Any]]:
+    with open(path, "rb") as f:
+        if start:
+            # Skip the partial line that belongs to the previous shard
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _analyze_range(path: str, start: int, end: int,
+                   endpoints: Optional[List[str]]) -> Dict[str, PatternStats]:
+    return collect(_read_range(path, start, end), endpoints)
+
+
+def _analyze_chunk(records: List[Dict[str, Any]], endpoints: Optional[List[str]]) -> Dict[str, PatternStats]:
+    return collect(records, endpoints)
+
+
+def analyze_file(path: str, endpoints: Optional[List[str]] = None,
+                 workers: Optional[int] = None) -> Dict[str, PatternStats]:
+    """Analyze a JSONL result file on all cores
+
+    The file is split into byte ranges, each worker process streams its own
+    range from disk, and the partial statistics are merged in file order.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = byte_ranges(path, workers)
+    if workers == 1 or len(ranges) == 1:
+        return merge_all(_analyze_range(path, start, end, endpoints) for start, end in ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_analyze_range, path, start, end, endpoints) for start, end in ranges]
+        return merge_all(future.result() for future in futures)
+
+
+def analyze_records(records: List[Dict[str, Any]], endpoints: Optional[List[str]] = None,
+                    workers: Optional[int] = None, chunk_size: int = 50_000) -> Dict[str, PatternStats]:
+    """Analyze in-memory records (e.g. findings tagged with an endpoint) on all cores"""
+    workers = workers or os.cpu_count() or 1
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        return merge_all(_analyze_chunk(chunk, endpoints) for chunk in chunks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge_all(pool.map(_analyze_chunk, chunks, [endpoints] * len(chunks)))
+
+
+def format_pattern_stats(stats: PatternStats) -> List[str]:
+    """Human-readable lines for one endpoint's PatternStats"""
+    lines = [f"{stats.endpoint}: {stats.rows} rows, {stats.observed} with output, {stats.errors} errors",
+             f"  Status codes: {dict(stats.statuses)}",
+             f"  Output types: {dict(stats.output_types)}"]
+    if stats.observed:
+        ranked = sorted(stats.model_agreements.items(), key=lambda item: -item[1])
+        lines.append("  Model accuracy: " + ", ".join(
+            f"{name} {count / stats.observed:.1%}" for name, count in ranked))
+    if stats.survivors:
+        lines.append(f"  Consistent with: {', '.join(stats.survivors)}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a JSONL result capture on all cores")
+    parser.add_argument("path", help="result file written by JSONLResultSink")
+    parser.add_argument("--endpoint", action="append", dest="endpoints",
+                        help="only analyze this endpoint (repeatable)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--json", action="store_true", help="print the merged statistics as JSON")
+    args = parser.parse_args()
+
+    merged = analyze_file(args.path, args.endpoints, args.workers)
+    if args.json:
+        print(json.dumps({endpoint: stats.to_dict() for endpoint, stats in sorted(merged.items())}, indent=2))
+        return
+    for endpoint in sorted(merged):
+        for line in format_pattern_stats(merged[endpoint]):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import time
+from typing import Dict, Any, Iterator, List, Optional, Union
+
+from result_sink import PAYLOAD
+from transport import HTTPTransport
+
+KB = 1024
+MB = 1024 * 1024
+
+DEFAULT_SIZES = (1 * MB, 4 * MB, 16 * MB, 64 * MB, 100 * MB)
+PRESERIALIZE_LIMIT = 16 * MB
+
+# Statuses that show the body was read in full: the payload is well-formed JSON,
+# so 400 and 422 can only be about its content, never its size
+ACCEPTED_STATUSES = frozenset(range(200, 300)) | {400, 422}
+# Statuses that refuse the body for its size; a reset connection counts too
+REJECTED_STATUSES = frozenset({413, 431})
+# Throttled uploads are sent again this many times before the size is left unknown
+THROTTLE_ATTEMPTS = 3
+
+PREFIX = b'{"data": "'
+SUFFIX = b'"}'
+
+
+class StreamedPayload:
+    """A {"data": "aaa..."} JSON body of exactly `size` bytes, generated in chunks
+
+    Only one chunk is ever held in memory. The object has a length and can
+    be iterated again, so it goes out with a Content-Length header and can
+    be re-sent. With chunked=True it hides its length and goes out with
+    Transfer-Encoding: chunked instead.
+    """
+
+    def __init__(self, size: int, chunk_size: int = 256 * KB, fill: bytes = b"a", chunked: bool = False):
+        if size < len(PREFIX) + len(SUFFIX):
+            raise ValueError(f"payload must be at least {len(PREFIX) + len(SUFFIX)} bytes")
+        self.size = size
+        self.chunk_size = chunk_size
+        self.fill = fill
+        self.chunked = chunked
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield PREFIX
+        remaining = self.size - len(PREFIX) - len(SUFFIX)
+        chunk = self.fill * self.chunk_size
+        while remaining > 0:
+            piece = chunk[:min(remaining, self.chunk_size)]
+            remaining -= len(piece)
+            yield piece
+        yield SUFFIX
+
+    def body(self) -> Union[bytes, Iterator[bytes]]:
+        """What to hand to the transport: the payload itself, or a bare generator if chunked"""
+        return iter(self) if self.chunked else self
+
+
+def upload_verdict(status: Optional[int]) -> Optional[bool]:
+    """True if a body of this size was accepted, False if refused, None if the answer says neither
+
+    429s, 5xx, and other 4xx such as 404 or 405 carry no information about
+    the size limit, so they must not move a bisection bound.
+    """
+    if status is None or status in REJECTED_STATUSES:
+        return False
+    if status in ACCEPTED_STATUSES:
+        return True
+    return None
+
+
+def serialize_payload(size: int, fill: bytes = b"a") -> bytes:
+    """The same body as StreamedPayload, serialized once into bytes"""
+    return b"".join(StreamedPayload(size, chunk_size=max(1, size), fill=fill))
+
+
+class PayloadProber:
+    """Find how large a request body each endpoint accepts, and how fast uploads go
+
+    Ladder sizes (the sweep and the doubling steps of find_max_payload) up
+    to PRESERIALIZE_LIMIT are serialized once and reused across endpoints;
+    one-off bisection sizes are serialized per probe and dropped, and larger
+    bodies are streamed in chunks so a 100MB probe does not need 100MB of
+    memory. Each probe is a single upload with no retries.
+    """
+
+    def __init__(self, transport: HTTPTransport, stream_threshold: int = PRESERIALIZE_LIMIT,
+                 chunked: bool = False, min_upload_mbps: float = 1.0, sink=None):
+        self.transport = transport
+        self.min_upload_mbps = min_upload_mbps
+        self.stream_threshold = stream_threshold
+        self.chunked = chunked
+        self.sink = sink
+        self.measurements: List[Dict[str, Any]] = []
+        self._bodies: Dict[int, bytes] = {}
+
+    def _body(self, size: int, reuse: bool):
+        if size > self.stream_threshold or self.chunked:
+            return StreamedPayload(size, chunked=self.chunked).body()
+        if not reuse:
+            return self._bodies.get(size) or serialize_payload(size)
+        if size not in self._bodies:
+            self._bodies[size] = serialize_payload(size)
+        return self._bodies[size]
+
+    def probe_size(self, endpoint: str, size: int, reuse: bool = False) -> Dict[str, Any]:
+        """Upload one body of `size` bytes and record whether it was accepted
+
+        "accepted" is True, False, or None when the server's answer (e.g. a
+        429 that persisted through THROTTLE_ATTEMPTS uploads) says nothing
+        about the size. With reuse=True a pre-serialized body is kept for
+        later probes of the same size.
+        """
+        # Allow slow links time to push the whole body before giving up
+        timeout = self.transport.timeout
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        timeout = (connect, read + size / MB / self.min_upload_mbps)
+        body = None
+        for _ in range(THROTTLE_ATTEMPTS):
+            # A streamed body is consumed by the upload, so each attempt builds its own
+            if not isinstance(body, bytes):
+                body = self._body(size, reuse)
+            start = time.perf_counter()
+            try:
+                response = self.transport.send_body(endpoint, body, timeout=timeout)
+                status, error, timing = response.status_code, None, response.timing
+            except Exception as e:
+                # Servers often reset the connection mid-upload instead of answering 413
+                status, error, timing = None, str(e), None
+            seconds = time.perf_counter() - start
+            if status != 429:
+                break
+        measurement = {
+            "endpoint": endpoint,
+            "payload_bytes": size,
+            "status": status,
+            "accepted": upload_verdict(status),
+            "upload_seconds": round(seconds, 6),
+            "upload_mbps": round(size / MB / seconds, 3) if seconds > 0 else None,
+            "error": error,
+            "timing": timing,
+        }
+        self.measurements.append(measurement)
+        if self.sink is not None:
+            self.sink.write({"ts": round(time.time(), 6), "kind": PAYLOAD, "method": "POST", **measurement})
+        return measurement
+
+    def sweep(self, endpoint: str, sizes=DEFAULT_SIZES) -> List[Dict[str, Any]]:
+        """Probe each size in turn, stopping at the first rejection"""
+        results = []
+        for size in sizes:
+            results.append(self.probe_size(endpoint, size, reuse=True))
+            if not results[-1]["accepted"]:
+                break
+        return results
+
+    def find_max_payload(self, endpoint: str, low: int = 1 * KB, high: int = 100 * MB,
+                         resolution: int = 1 * KB) -> Dict[str, Any]:
+        """Bisect for the largest accepted body size between low and high
+
+        Sizes double from `low` until one is rejected, then the gap between
+        the last accepted and first rejected size is halved until it is
+        within `resolution` bytes. max_accepted is None if even `low` fails;
+        rejected_at is None if `high` itself was accepted. A probe whose
+        answer says nothing about the size stops the search where it is and
+        is reported as unknown_at, so neither bound is ever guessed.
+        """
+        accepted: Optional[int] = None
+        rejected: Optional[int] = None
+        unknown: Optional[int] = None
+        size = low
+        while True:
+            verdict = self.probe_size(endpoint, size, reuse=True)["accepted"]
+            if verdict is None:
+                unknown = size
+                break
+            if verdict:
+                accepted = size
+                if size >= high:
+                    break
+                size = min(high, size * 2)
+            else:
+                rejected = size
+                break
+
+        if accepted is not None and rejected is not None:
+            while rejected - accepted > resolution:
+                middle = (accepted + rejected) // 2
+                verdict = self.probe_size(endpoint, middle)["accepted"]
+                if verdict is None:
+                    unknown = middle
+                    break
+                if verdict:
+                    accepted = middle
+                else:
+                    rejected = middle
+
+        probes = [m for m in self.measurements if m["endpoint"] == endpoint]
+        rates = [m["upload_mbps"] for m in probes if m["accepted"] and m["upload_mbps"]]
+        return {
+            "endpoint": endpoint,
+            "max_accepted": accepted,
+            "rejected_at": rejected,
+            "unknown_at": unknown,
+            "probes": len(probes),
+            "best_upload_mbps": max(rates) if rates else None,
+        }
+
+
+def format_payload_report(report: Dict[str, Any]) -> str:
+    """One line for a find_max_payload() report"""
+    if report.get("unknown_at") is not None and report["rejected_at"] is None:
+        known = f"accepts {report['max_accepted']:,} bytes, " if report["max_accepted"] is not None else ""
+        limit = f"{known}no size verdict at {report['unknown_at']:,} bytes"
+    elif report["max_accepted"] is None:
+        limit = f"rejects even {report['rejected_at']:,} bytes"
+    elif report["rejected_at"] is None:
+        limit = f"accepts at least {report['max_accepted']:,} bytes"
+    else:
+        limit = f"limit between {report['max_accepted']:,} and {report['rejected_at']:,} bytes"
+    rate = report["best_upload_mbps"]
+    return (f"{report['endpoint']}: {limit} ({report['probes']} probes"
+            f"{f', up to {rate} MB/s' if rate else ''})")
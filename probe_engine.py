@@ -0,0 +1,172 @@
+import asyncio
+import collections
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+
+def result_output(result: Dict) -> Any:
+    """The endpoint's "result" value from a test_endpoint dict, or None"""
+    response = result.get("response")
+    return response.get("result") if isinstance(response, dict) else None
+
+
+class ProbeEngine:
+    """Run batches of probes with bounded concurrency, keeping input order
+
+    If a result sink is given, every result is recorded as soon as it arrives.
+    With a RunCheckpoint, probes that finished in an earlier run are not sent
+    again; their stored results are merged back in place. A Reporter, if
+    given, is told about every finished probe to drive its progress line.
+    """
+
+    def __init__(self, submit: Callable[..., Dict], concurrency: int = 16, sink=None,
+                 checkpoint=None, reporter=None):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.submit = submit
+        self.concurrency = concurrency
+        self.sink = sink
+        self.checkpoint = checkpoint
+        self.reporter = reporter
+        self.resumed = 0
+
+    def _finish(self, probe: Dict, result: Dict) -> Dict:
+        if self.sink is not None:
+            self.sink.record(probe, result)
+        if self.reporter is not None:
+            self.reporter.tick(result)
+        return result
+
+    def _call(self, probe: Dict) -> Dict:
+        return self._finish(probe, self.submit(**probe))
+
+    @staticmethod
+    def probe(endpoint: str, data: Any = None, method: str = "POST") -> Dict:
+        """Build a probe description accepted by submit(**probe)"""
+        if method.upper() == "GET":
+            return {"endpoint": endpoint, "method": "GET", "data": None}
+        return {"endpoint": endpoint, "method": method, "data": {"data": data}}
+
+    async def _run_one(self, loop, executor, semaphore, probe: Dict) -> Dict:
+        async with semaphore:
+            if asyncio.iscoroutinefunction(self.submit):
+                return self._finish(probe, await self.submit(**probe))
+            return await loop.run_in_executor(executor, self._call, probe)
+
+    async def run_async(self, probes: List[Dict]) -> List[Dict]:
+        """Run all probes concurrently and return results in the original order"""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            tasks = [self._run_one(loop, executor, semaphore, probe) for probe in probes]
+            return await asyncio.gather(*tasks)
+
+    def run(self, probes: List[Dict]) -> List[Dict]:
+        """Blocking wrapper around run_async for the synchronous tester classes"""
+        probes = list(probes)
+        if self.reporter is not None:
+            self.reporter.expect(len(probes))
+        if self.checkpoint is None:
+            return self._run(probes)
+
+        results = [self.checkpoint.result_for(probe) for probe in probes]
+        pending = [i for i, result in enumerate(results) if result is None]
+        self.resumed += len(probes) - len(pending)
+        if self.reporter is not None:
+            for result in results:
+                if result is not None:
+                    self.reporter.tick(result)
+        for i, result in zip(pending, self._run([probes[i] for i in pending])):
+            results[i] = result
+        return results
+
+    def _run(self, probes: List[Dict]) -> List[Dict]:
+        if not probes:
+            return []
+        if self.concurrency == 1 and not asyncio.iscoroutinefunction(self.submit):
+            return [self._call(probe) for probe in probes]
+        return asyncio.run(self.run_async(probes))
+
+    def map(self, endpoint: str, inputs: List[Any], method: str = "POST") -> List[Dict]:
+        """Send every input to one endpoint and return the responses in input order"""
+        return self.run([self.probe(endpoint, value, method) for value in inputs])
+
+    def stream(self, probes: Iterable[Dict], window: Optional[int] = None,
+               memo: bool = True) -> Iterator[Tuple[Dict, Dict]]:
+        """Yield (probe, result) pairs in probe order from a lazy iterable of probes
+
+        At most `window` probes (default 4 x concurrency) are pulled from the
+        iterable and held in flight at once, so arbitrarily large corpora run
+        in constant memory. Slots refill as soon as the oldest probe finishes.
+        Pass memo=False for unbounded streams: probes are then submitted with
+        use_memo=False, so the transport's request memo does not churn
+        through every input of the corpus.
+        """
+        window = window or self.concurrency * 4
+        if not memo:
+            probes = ({**probe, "use_memo": False} for probe in probes)
+        if self.reporter is not None:
+            self.reporter.start()
+        if asyncio.iscoroutinefunction(self.submit):
+            # Coroutine submits run wave by wave through the event loop
+            while True:
+                wave = list(itertools.islice(probes, window))
+                if not wave:
+                    return
+                yield from zip(wave, self.run(wave))
+
+        in_flight = collections.deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            def fill():
+                while len(in_flight) < window:
+                    probe = next(probes, None)
+                    if probe is None:
+                        return
+                    stored = self.checkpoint.result_for(probe) if self.checkpoint is not None else None
+                    if stored is not None:
+                        self.resumed += 1
+                        if self.reporter is not None:
+                            self.reporter.tick(stored)
+                        future = Future()
+                        future.set_result(stored)
+                    else:
+                        future = executor.submit(self._call, probe)
+                    in_flight.append((probe, future))
+
+            try:
+                fill()
+                while in_flight:
+                    probe, future = in_flight.popleft()
+                    result = future.result()
+                    fill()
+                    yield probe, result
+            finally:
+                # A consumer that stops early should not wait for queued probes
+                for _, future in in_flight:
+                    future.cancel()
+
+    def map_stream(self, endpoint: str, inputs: Iterable[Any], method: str = "POST",
+                   window: Optional[int] = None, memo: bool = True) -> Iterator[Tuple[Any, Dict]]:
+        """Streaming map(): yield (input, response) pairs without materializing inputs"""
+        probes = (self.probe(endpoint, value, method) for value in inputs)
+        for probe, result in self.stream(probes, window, memo):
+            yield (probe["data"] or {}).get("data"), result
+
+    def run_until(self, probes: Iterable[Dict], on_result: Callable[[Dict, Dict], None],
+                  done: Callable[[], bool]) -> int:
+        """Run probes in waves of `concurrency`, stopping as soon as done() is true
+
+        on_result(probe, result) is called in probe order after each wave.
+        Returns the number of probes actually sent.
+        """
+        probes = iter(probes)
+        sent = 0
+        while not done():
+            wave = list(itertools.islice(probes, self.concurrency))
+            if not wave:
+                break
+            for probe, result in zip(wave, self.run(wave)):
+                on_result(probe, result)
+            sent += len(wave)
+        return sent
@@ -0,0 +1,223 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+# Where a sampled stack is attributed, by source file; the innermost match wins
+CATEGORY_FILES = (
+    ("json", ("/json/",)),
+    ("transport", ("transport.py", "timing.py", "rate_limiter.py", "request_memo.py",
+                   "response_cache.py", "middleware.py", "/requests/", "/urllib3/",
+                   "/http/client.py", "/socket.py", "/ssl.py")),
+    ("analysis", ("feature_table.py", "rule_induction.py", "hypothesis_registry.py",
+                  "hypothesis_matcher.py", "active_scheduler.py", "offline_analysis.py",
+                  "/numpy/")),
+    ("reporting", ("reporter.py", "result_sink.py", "checkpoint.py")),
+)
+# Tester methods in this directory are attributed by name, since the testers mix all categories
+REPO_DIR = os.path.dirname(os.path.abspath(__file__)).replace(os.sep, "/")
+CATEGORY_FUNCTIONS = (
+    ("analysis", ("analyze", "print_induced_rules", "print_feature_correlations", "report_hypotheses")),
+    ("reporting", ("generate_", "report_", "format_", "print_")),
+)
+WAIT_FILES = ("/threading.py", "/queue.py", "/selectors.py", "/concurrent/futures/_base.py")
+CATEGORIES = ("transport", "json", "analysis", "reporting", "waiting", "other")
+
+
+@contextmanager
+def profiled(path: Optional[str] = None) -> Iterator[cProfile.Profile]:
+    """cProfile everything run inside the block, optionally dumping the stats to `path`"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+
+
+def profile_call(func: Callable, *args, path: Optional[str] = None, **kwargs) -> Tuple[Any, pstats.Stats]:
+    """Run func(*args, **kwargs) under cProfile; returns (result, stats)"""
+    with profiled(path) as profiler:
+        result = func(*args, **kwargs)
+    return result, pstats.Stats(profiler)
+
+
+def format_profile(stats: pstats.Stats, sort: str = "cumulative", limit: int = 25) -> List[str]:
+    """The top `limit` functions of a cProfile run as text lines"""
+    out = io.StringIO()
+    stats.stream = out
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return [line for line in out.getvalue().splitlines() if line.strip()]
+
+
+class MemoryPhases:
+    """tracemalloc snapshots taken at the start and end of each named phase
+
+    For every phase the net allocation, the peak during the phase and the
+    source lines that grew the most are kept. Tracing starts with the first
+    phase unless it is already running, and is stopped by stop().
+    """
+
+    def __init__(self, frames: int = 1, top: int = 5):
+        self.frames = frames
+        self.top = top
+        self.phases: List[Dict[str, Any]] = []
+        self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        before = self._snapshot()
+        start_current, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            after = self._snapshot()
+            growth = [stat for stat in after.compare_to(before, "lineno") if stat.size_diff > 0]
+            self.phases.append({
+                "phase": name,
+                "net_bytes": current - start_current,
+                "peak_bytes": peak - start_current,
+                "top": [(str(stat.traceback), stat.size_diff, stat.count_diff)
+                        for stat in growth[:self.top]],
+            })
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        # Leave out what the snapshots and comparisons themselves allocate
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def to_dict(self) -> List[Dict[str, Any]]:
+        return [{**phase, "top": [{"line": line, "size_diff": size, "count_diff": count}
+                                  for line, size, count in phase["top"]]}
+                for phase in self.phases]
+
+    def format(self) -> List[str]:
+        lines = []
+        for phase in self.phases:
+            lines.append(f"  {phase['phase']}: net {phase['net_bytes'] / 1024:+.1f} KiB, "
+                         f"peak {phase['peak_bytes'] / 1024:.1f} KiB")
+            for line, size, count in phase["top"]:
+                lines.append(f"    {size / 1024:+9.1f} KiB {count:+7d} blocks  {line}")
+        return lines
+
+
+def classify_stack(frame) -> str:
+    """The category a thread's current stack is spending its time in
+
+    The innermost frame that belongs to a category decides. Frames blocked
+    in threading, queue or futures waits are skipped; if the first frame
+    outside them matches nothing, the thread is waiting (e.g. on futures or
+    an idle event loop). Pool workers with nothing to do are "idle" and not
+    counted.
+    """
+    blocked = False
+    innermost = True
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename.replace(os.sep, "/")
+        if filename.endswith(WAIT_FILES):
+            blocked = True
+        elif (blocked or innermost) and code.co_name == "_worker" \
+                and filename.endswith("concurrent/futures/thread.py"):
+            # Blocked on the work queue, which is implemented in C
+            return "idle"
+        else:
+            for category, fragments in CATEGORY_FILES:
+                if any(fragment in filename for fragment in fragments):
+                    return category
+            if filename.startswith(REPO_DIR):
+                for category, prefixes in CATEGORY_FUNCTIONS:
+                    if code.co_name.startswith(prefixes):
+                        return category
+            if blocked:
+                return "waiting"
+        innermost = False
+        frame = frame.f_back
+    return "other"
+
+
+class SamplingProfiler:
+    """Attribute wall time to transport, JSON, analysis and reporting by sampling stacks
+
+    A background thread wakes every `interval` seconds, reads every other
+    thread's current frame with sys._current_frames() and counts one sample
+    per busy thread under classify_stack(). Overhead is a few microseconds
+    per thread per sample, so it can stay on for whole runs.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.ticks = 0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.elapsed += time.perf_counter() - self._started
+        return self
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.ticks += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                category = classify_stack(frame)
+                if category != "idle":
+                    self.samples[category] += 1
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """Samples, share of busy samples and estimated thread-seconds per category"""
+        total = sum(self.samples.values())
+        return {category: {"samples": self.samples[category],
+                           "share": round(self.samples[category] / total, 4) if total else 0.0,
+                           "seconds": round(self.samples[category] * self.interval, 3)}
+                for category in CATEGORIES if self.samples[category]}
+
+    def format(self) -> List[str]:
+        lines = [f"  {self.ticks} samples over {self.elapsed:.2f}s wall time"]
+        for category, row in self.breakdown().items():
+            lines.append(f"  {category:<10} {row['share']:>7.1%}  ~{row['seconds']:.2f} thread-s")
+        return lines
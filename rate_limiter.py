@@ -0,0 +1,154 @@
+import email.utils
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_THROTTLE_DELAY = 1.0
+MIN_RATE = 0.1
+
+
+def parse_retry_after(value: Optional[str], now: float = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After value (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+def parse_rate_limit_reset(headers, now: float = None) -> Optional[float]:
+    """Seconds until the rate-limit window resets, from RateLimit-* or X-RateLimit-* headers"""
+    for prefix in ("ratelimit-", "x-ratelimit-"):
+        remaining = headers.get(prefix + "remaining")
+        reset = headers.get(prefix + "reset")
+        if remaining is None or reset is None:
+            continue
+        try:
+            if float(remaining) > 0:
+                return None
+            reset = float(reset)
+        except ValueError:
+            return None
+        now = time.time() if now is None else now
+        # Large values are epoch timestamps, small ones are delta-seconds
+        return max(0.0, reset - now) if reset > 1e9 else reset
+    return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket; rate=None means unlimited, but pauses still apply"""
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None):
+        self.configured_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate or 1))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._paused_until - now
+                if delay <= 0:
+                    if self.rate is None:
+                        return waited
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float):
+        """Let nothing through for the next `seconds`"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = time.monotonic() + seconds
+
+    def slow_down(self, factor: float = 0.5):
+        with self._lock:
+            if self.rate is not None:
+                self.rate = max(MIN_RATE, self.rate * factor)
+
+    def recover(self, step: float = 0.1):
+        """Creep back towards the configured rate after successful requests"""
+        with self._lock:
+            if self.rate is not None and self.configured_rate is not None:
+                self.rate = min(self.configured_rate, self.rate + step * self.configured_rate)
+
+
+class RateLimiter:
+    """Global and per-endpoint token buckets that back off on throttling
+
+    Every request takes a token from the global bucket and from its
+    endpoint's bucket. A 429 pauses the endpoint for the Retry-After delay
+    and halves its rate, a response that reports an exhausted rate-limit
+    window pauses it until the window resets, and successes slowly restore
+    the configured rate.
+    """
+
+    def __init__(self, rate: Optional[float] = None, endpoint_rates: Dict[str, float] = None,
+                 burst: Optional[int] = None, max_requeues: int = 5):
+        self.global_bucket = TokenBucket(rate, burst)
+        self.endpoint_rates = dict(endpoint_rates or {})
+        self.burst = burst
+        self.max_requeues = max_requeues
+        self.throttled = 0
+        self.requeued = 0
+        self.waited = 0.0
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        with self._lock:
+            if endpoint not in self._buckets:
+                self._buckets[endpoint] = TokenBucket(self.endpoint_rates.get(endpoint), self.burst)
+            return self._buckets[endpoint]
+
+    def acquire(self, endpoint: str):
+        waited = self.bucket(endpoint).acquire() + self.global_bucket.acquire()
+        with self._lock:
+            self.waited += waited
+
+    def observe(self, endpoint: str, response) -> bool:
+        """Adjust pacing from a response; True means it was throttled and should be requeued"""
+        bucket = self.bucket(endpoint)
+        if response.status_code == 429:
+            delay = parse_retry_after(response.headers.get("retry-after"))
+            if delay is None:
+                delay = parse_rate_limit_reset(response.headers)
+            bucket.pause(DEFAULT_THROTTLE_DELAY if delay is None else delay)
+            bucket.slow_down()
+            self.global_bucket.slow_down()
+            with self._lock:
+                self.throttled += 1
+            return True
+
+        reset = parse_rate_limit_reset(response.headers)
+        if reset:
+            bucket.pause(reset)
+        else:
+            bucket.recover()
+            self.global_bucket.recover()
+        return False
+
+    def requeue(self):
+        """Count a throttled request that is being sent again"""
+        with self._lock:
+            self.requeued += 1
@@ -0,0 +1,164 @@
+import atexit
+import sys
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, TextIO
+
+QUIET = 0
+SUMMARY = 1
+DETAIL = 2
+DEBUG = 3
+
+# Reporters not closed yet; one exit hook flushes them without keeping them alive
+_open_reporters: "weakref.WeakSet[Reporter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_reporters():
+    for reporter in list(_open_reporters):
+        reporter.flush()
+
+
+def is_error(result: Dict) -> bool:
+    """Whether a test_endpoint result is a failure, across the testers' result shapes"""
+    if result.get("error") is not None or result.get("success") is False:
+        return True
+    status = result.get("status_code")
+    return status is None or status >= 400
+
+
+class Reporter:
+    """Leveled, buffered console output with a rate-limited progress line
+
+    The default level is SUMMARY: headers, findings and conclusions, but not
+    one line per probe (those go to the result sink). Detail and debug lines
+    are buffered and written in batches, or when the next summary line goes
+    out. While probes run, a progress line with live counters is redrawn on
+    stderr at most every `interval` seconds, and only when it is a terminal.
+    Anything still buffered is flushed at exit unless close() ran first.
+    """
+
+    def __init__(self, level: int = SUMMARY, stream: Optional[TextIO] = None,
+                 progress_stream: Optional[TextIO] = None, interval: float = 0.2,
+                 buffer_lines: int = 256, progress: Optional[bool] = None):
+        self.level = level
+        self.interval = interval
+        self.buffer_lines = buffer_lines
+        self._stream = stream
+        self._progress_stream = progress_stream
+        self._show_progress = progress
+        self._buffer: List[str] = []
+        self._lock = threading.RLock()
+        self._bar_width = 0
+        self._drawn = 0.0
+        self.total: Optional[int] = None
+        self.done = 0
+        self.errors = 0
+        self.resumed = 0
+        self._started = time.monotonic()
+        _open_reporters.add(self)
+
+    @property
+    def stream(self) -> TextIO:
+        # Resolved on every write so contextlib.redirect_stdout still applies
+        return self._stream or sys.stdout
+
+    @property
+    def progress_stream(self) -> TextIO:
+        return self._progress_stream or sys.stderr
+
+    def enabled(self, level: int) -> bool:
+        return level <= self.level
+
+    def emit(self, level: int, message: str = ""):
+        if level > self.level:
+            return
+        with self._lock:
+            self._buffer.append(message)
+            if level <= SUMMARY or len(self._buffer) >= self.buffer_lines:
+                self.flush()
+
+    def summary(self, message: str = ""):
+        self.emit(SUMMARY, message)
+
+    def detail(self, message: str = ""):
+        self.emit(DETAIL, message)
+
+    def debug(self, message: str = ""):
+        self.emit(DEBUG, message)
+
+    def flush(self):
+        with self._lock:
+            self._clear_progress()
+            if self._buffer:
+                self.stream.write("\n".join(self._buffer) + "\n")
+                self._buffer.clear()
+            self.stream.flush()
+
+    def close(self):
+        """Flush what is left; the reporter is no longer flushed at exit"""
+        self.flush()
+        _open_reporters.discard(self)
+
+    def __enter__(self) -> "Reporter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self, total: Optional[int] = None):
+        """Reset the live counters for a new batch; total=None for an open-ended stream"""
+        with self._lock:
+            self.total, self.done, self.errors, self.resumed = total, 0, 0, 0
+            self._started = time.monotonic()
+
+    def expect(self, count: int):
+        """Announce `count` more probes, so the progress line can show a total"""
+        with self._lock:
+            if self.total is None or self.done >= self.total:
+                self.start(count)
+            else:
+                self.total += count
+
+    def tick(self, result: Dict):
+        """Count one finished probe and redraw the progress line if it is due"""
+        with self._lock:
+            self.done += 1
+            if result.get("resumed"):
+                self.resumed += 1
+            elif is_error(result):
+                self.errors += 1
+            now = time.monotonic()
+            if now - self._drawn >= self.interval:
+                self._drawn = now
+                self._draw_progress(now)
+
+    def _progress_visible(self) -> bool:
+        if self._show_progress is not None:
+            return self._show_progress and self.level > QUIET
+        return self.level > QUIET and getattr(self.progress_stream, "isatty", lambda: False)()
+
+    def _draw_progress(self, now: float):
+        if not self._progress_visible():
+            return
+        if self._buffer:
+            self.flush()
+        elapsed = max(now - self._started, 1e-9)
+        counters = f"{self.done / elapsed:7.1f}/s  errors {self.errors}"
+        if self.resumed:
+            counters += f"  resumed {self.resumed}"
+        if self.total:
+            filled = int(20 * min(self.done, self.total) / self.total)
+            line = f"[{'#' * filled}{'.' * (20 - filled)}] {self.done}/{self.total}  {counters}"
+        else:
+            line = f"{self.done} probes  {counters}"
+        self.progress_stream.write("\r" + line.ljust(self._bar_width))
+        self.progress_stream.flush()
+        self._bar_width = len(line)
+
+    def _clear_progress(self):
+        if self._bar_width:
+            self.progress_stream.write("\r" + " " * self._bar_width + "\r")
+            self.progress_stream.flush()
+            self._bar_width = 0
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Any, Optional, Tuple
+
+
+def canonical_payload(data: Any) -> str:
+    """Serialize a payload so that equal payloads always hash the same"""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def request_key(method: str, endpoint: str, data: Any) -> str:
+    """Stable identity of a request, shared by the memo and the response cache"""
+    raw = f"{method.upper()} {endpoint} {canonical_payload(data)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class RequestMemo:
+    """In-run memo that sends each identical request only once
+
+    Repeated (method, endpoint, payload) triples are answered from memory,
+    and duplicates that arrive while the first copy is still in flight wait
+    on that request instead of opening their own (single-flight). Only the
+    methods listed in `methods` are memoized, so GET /time keeps sampling.
+    Results that `keep` rejects (e.g. a 429 or 5xx that outlived its
+    retries) are handed to the waiting duplicates but not remembered, and
+    at most `max_entries` results are held, least recently used first out.
+    """
+
+    def __init__(self, methods: Tuple[str, ...] = ("POST",), max_entries: int = 10_000,
+                 keep: Optional[Callable[[Any], bool]] = None):
+        self.methods = tuple(m.upper() for m in methods)
+        self.max_entries = max_entries
+        self.keep = keep
+        self.sent = 0
+        self.reused = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Future]" = OrderedDict()
+
+    @property
+    def saved(self) -> int:
+        """Requests that did not reach the network thanks to the memo"""
+        return self.reused + self.coalesced
+
+    def call(self, method: str, endpoint: str, data: Any, send: Callable[[], Any]) -> Any:
+        """Return send()'s result, calling it at most once per identical request"""
+        if method.upper() not in self.methods:
+            return send()
+
+        key = request_key(method, endpoint, data)
+        with self._lock:
+            future = self._entries.get(key)
+            if future is None:
+                future = Future()
+                self._entries[key] = future
+                self.sent += 1
+                owner = True
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+                if future.done():
+                    self.reused += 1
+                else:
+                    self.coalesced += 1
+                owner = False
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = send()
+        except BaseException as e:
+            # Failures are not memoized, so a later duplicate may try again
+            self._forget(key, future)
+            future.set_exception(e)
+            raise
+        if self.keep is not None and not self.keep(result):
+            self._forget(key, future)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key: str, future: Future):
+        with self._lock:
+            if self._entries.get(key) is future:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.sent = self.reused = self.coalesced = 0
@@ -0,0 +1,136 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from request_memo import request_key
+from transport import TransportResponse
+
+DEFAULT_CACHE_PATH = ".blackbox_cache.sqlite3"
+
+# Seconds a response stays fresh, per endpoint. 0 disables caching and None
+# keeps the entry until it is evicted. /time is expected to change, so it is
+# never cached.
+DEFAULT_TTLS = {"/time": 0}
+
+
+class ResponseCache:
+    """Persistent response cache with per-endpoint TTLs and LRU eviction
+
+    Entries live in a small SQLite file so that reruns of the testers can
+    replay deterministic responses without a network round trip. Entries
+    are keyed by the transport's base URL as well as the request, so one
+    cache file can serve several deployments without mixing their answers.
+    Set refresh=True to ignore stored entries and overwrite them with fresh
+    ones.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 100_000,
+                 default_ttl: Optional[float] = None, ttls: Dict[str, Optional[float]] = None,
+                 refresh: bool = False):
+        self.path = path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " endpoint TEXT NOT NULL,"
+            " status_code INTEGER NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " content BLOB NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " expires_at REAL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._conn.commit()
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def cacheable(self, endpoint: str) -> bool:
+        return self.ttl_for(endpoint) != 0
+
+    @staticmethod
+    def key(base_url: str, method: str, endpoint: str, data: Any) -> str:
+        return request_key(method, f"{base_url.rstrip('/')}{endpoint}", data)
+
+    def get(self, method: str, endpoint: str, data: Any = None,
+            base_url: str = "") -> Optional[TransportResponse]:
+        """Return the stored response, or None on a miss, expiry or refresh"""
+        if self.refresh or not self.cacheable(endpoint):
+            return None
+
+        key = self.key(base_url, method, endpoint, data)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, headers, content, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            status_code, headers, content, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        response = TransportResponse(status_code, json.loads(headers), content)
+        response.cached = True
+        return response
+
+    def put(self, method: str, endpoint: str, data: Any, response: TransportResponse,
+            base_url: str = ""):
+        """Store a successful response and evict the least recently used overflow"""
+        if not self.cacheable(endpoint) or not 200 <= response.status_code < 300:
+            return
+
+        ttl = self.ttl_for(endpoint)
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.key(base_url, method, endpoint, data), endpoint, response.status_code,
+                 json.dumps(dict(response.headers)), response.content, now, expires_at, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Iterator, Optional
+
+from probe_engine import result_output
+
+# Record kinds in a result file; plain probe records carry no "kind" field
+PROBE = "probe"
+PAYLOAD = "payload"
+DIFF = "diff"
+
+
+def probe_record(probe: Dict, result: Dict) -> Dict[str, Any]:
+    """Flatten a probe and its test_endpoint result into one result-sink record"""
+    data = probe.get("data")
+    response = result.get("response")
+    error = result.get("error")
+    if error is None and result.get("success") is False and isinstance(response, dict):
+        error = response.get("error")
+    return {
+        "ts": round(time.time(), 6),
+        "endpoint": probe["endpoint"],
+        "method": probe.get("method", "POST"),
+        "input": data.get("data") if isinstance(data, dict) else None,
+        "status": result.get("status_code"),
+        "output": result_output(result),
+        "error": error,
+        "timing": result.get("timing"),
+    }
+
+
+class JSONLResultSink:
+    """Append each probe result to a JSON Lines file as soon as it arrives
+
+    Writes are buffered and the file is fsynced at most every
+    fsync_interval seconds, so a crash loses at most that much work.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 64 * 1024, fsync_interval: float = 1.0,
+                 append: bool = True):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.written = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "a" if append else "w", encoding="utf-8", buffering=buffer_size)
+        self._synced = time.monotonic()
+
+    def write(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self.written += 1
+            if time.monotonic() - self._synced >= self.fsync_interval:
+                self._sync()
+
+    def record(self, probe: Dict, result: Dict):
+        """Write the record for one completed probe"""
+        self.write(probe_record(probe, result))
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._synced = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def __enter__(self) -> "JSONLResultSink":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_results(path: str, endpoint: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Lazily yield records from a result file, optionally for one endpoint
+
+    A torn last line left behind by a crash is skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if endpoint is None or record.get("endpoint") == endpoint:
+                yield record
+
+
+def record_kind(record: Dict[str, Any]) -> str:
+    """What a result-file record describes: PROBE, PAYLOAD or another tagged kind"""
+    return record.get("kind", PROBE)
+
+
+def read_findings(path: str, endpoint: str) -> Iterator[Dict[str, Any]]:
+    """Yield probe records in the {"input", "output", "status"} shape the analyzers expect"""
+    for record in read_results(path, endpoint):
+        if record_kind(record) != PROBE:
+            continue
+        yield {"input": record["input"], "output": record["output"], "status": record["status"]}
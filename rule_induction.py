@@ -0,0 +1,259 @@
+import re
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from feature_table import FeatureTable
+from hypothesis_registry import GLITCH_KEYWORDS
+
+MODULI = (2, 3, 4, 5, 6, 7)
+NUMBER_MODULI = (2, 3, 5, 15)
+MAX_THRESHOLDS = 16
+MIN_HOLDOUT_SAMPLES = 100
+
+# Substrings worth testing as split conditions for particular endpoints
+ENDPOINT_KEYWORDS = {"/glitch": GLITCH_KEYWORDS}
+
+
+class Condition:
+    """A boolean test on one input, with readable names for both outcomes"""
+
+    def __init__(self, name: str, negated: str, values: np.ndarray):
+        self.name = name
+        self.negated = negated
+        self.values = values
+
+
+def first_numbers(inputs: Sequence[str]) -> np.ndarray:
+    """The first run of digits in each input, or -1 when there is none"""
+    pattern = re.compile(r"\d+")
+    numbers = []
+    for s in inputs:
+        match = pattern.search(s)
+        numbers.append(int(match.group()) if match and len(match.group()) < 18 else -1)
+    return np.array(numbers, dtype=np.int64)
+
+
+def build_conditions(table: FeatureTable, keywords: Sequence[str] = ()) -> List[Condition]:
+    """Candidate split conditions, simplest first so ties favour them
+
+    Boolean columns are used as they are, lengths also modulo small numbers,
+    the first number in the input modulo 2/3/5/15, keyword containment, and
+    numeric columns at up to MAX_THRESHOLDS thresholds each.
+    """
+    conditions = []
+    for name, column in table.columns.items():
+        if column.dtype == bool:
+            conditions.append(Condition(name, f"not {name}", column))
+
+    for k in MODULI:
+        conditions.append(Condition(f"length % {k} == 0", f"length % {k} != 0", table.length % k == 0))
+
+    numbers = first_numbers(table.inputs)
+    has_number = numbers >= 0
+    conditions.append(Condition("has_number", "not has_number", has_number))
+    for k in NUMBER_MODULI:
+        conditions.append(Condition(f"first_number % {k} == 0", f"not first_number % {k} == 0",
+                                    has_number & (numbers % k == 0)))
+
+    for keyword in keywords:
+        conditions.append(Condition(f"contains '{keyword}'", f"not contains '{keyword}'",
+                                    table.contains(keyword)))
+
+    for name, column in table.columns.items():
+        if column.dtype == bool:
+            continue
+        values = np.unique(column)
+        if len(values) > MAX_THRESHOLDS:
+            values = np.unique(np.quantile(column, np.linspace(0, 1, MAX_THRESHOLDS + 1)[1:-1]))
+        for threshold in values[:-1]:
+            t = round(float(threshold), 3)
+            t = int(t) if t == int(t) else t
+            conditions.append(Condition(f"{name} <= {t}", f"{name} > {t}", column <= threshold))
+    return conditions
+
+
+def gini(n: np.ndarray, positives: np.ndarray) -> np.ndarray:
+    p = np.divide(positives, n, out=np.zeros(np.shape(n)), where=n > 0)
+    return 2 * p * (1 - p)
+
+
+class RuleNode:
+    """One node of an induced decision tree; leaves have no condition"""
+
+    def __init__(self, samples: int, positives: int):
+        self.samples = samples
+        self.positives = positives
+        self.condition: Optional[int] = None
+        self.when_true: Optional["RuleNode"] = None
+        self.when_false: Optional["RuleNode"] = None
+
+    @property
+    def prediction(self) -> bool:
+        return self.positives * 2 > self.samples
+
+    @property
+    def leaf(self) -> bool:
+        return self.condition is None
+
+
+class DecisionTree:
+    """Greedy Gini decision tree over a boolean condition matrix
+
+    Every split is scored for all conditions at once with column sums over
+    the node's rows, so fitting stays fast on 100k+ samples.
+    """
+
+    def __init__(self, max_depth: int = 4, min_leaf: int = 1):
+        self.max_depth = max_depth
+        self.min_leaf = min_leaf
+        self.root: Optional[RuleNode] = None
+        self.importance: Dict[int, float] = {}
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> "DecisionTree":
+        self.importance = {}
+        self.root = self._grow(X, y, np.arange(len(y)), 0, len(y))
+        return self
+
+    def _grow(self, X: np.ndarray, y: np.ndarray, rows: np.ndarray, depth: int, total: int) -> RuleNode:
+        labels = y[rows]
+        node = RuleNode(len(rows), int(labels.sum()))
+        if depth >= self.max_depth or node.positives in (0, node.samples):
+            return node
+
+        block = X[rows]
+        true_n = block.sum(axis=0)
+        true_pos = block[labels].sum(axis=0)
+        false_n = node.samples - true_n
+        false_pos = node.positives - true_pos
+        impurity = (true_n * gini(true_n, true_pos) + false_n * gini(false_n, false_pos)) / node.samples
+        impurity[(true_n < self.min_leaf) | (false_n < self.min_leaf)] = np.inf
+        best = int(np.argmin(impurity))
+        gain = gini(node.samples, node.positives) - impurity[best]
+        if not np.isfinite(impurity[best]) or gain <= 1e-12:
+            return node
+
+        node.condition = best
+        self.importance[best] = self.importance.get(best, 0.0) + gain * node.samples / total
+        mask = block[:, best]
+        node.when_true = self._grow(X, y, rows[mask], depth + 1, total)
+        node.when_false = self._grow(X, y, rows[~mask], depth + 1, total)
+        if node.when_true.leaf and node.when_false.leaf and \
+                node.when_true.prediction == node.when_false.prediction:
+            node.condition, node.when_true, node.when_false = None, None, None
+        return node
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        predictions = np.zeros(len(X), dtype=bool)
+        stack = [(self.root, np.arange(len(X)))]
+        while stack:
+            node, rows = stack.pop()
+            if node.leaf:
+                predictions[rows] = node.prediction
+                continue
+            mask = X[rows, node.condition]
+            stack.append((node.when_true, rows[mask]))
+            stack.append((node.when_false, rows[~mask]))
+        return predictions
+
+    def paths(self, node: RuleNode = None, trail: Tuple = ()) -> List[Tuple[Tuple, RuleNode]]:
+        """(conditions, leaf) for every leaf; a condition is (index, outcome)"""
+        node = self.root if node is None else node
+        if node.leaf:
+            return [(trail, node)]
+        return (self.paths(node.when_true, trail + ((node.condition, True),))
+                + self.paths(node.when_false, trail + ((node.condition, False),)))
+
+    def depth(self, node: RuleNode = None) -> int:
+        node = self.root if node is None else node
+        return 0 if node.leaf else 1 + max(self.depth(node.when_true), self.depth(node.when_false))
+
+
+class InducedRules:
+    """A fitted rule set for one boolean endpoint"""
+
+    def __init__(self, tree: DecisionTree, conditions: List[Condition], samples: int,
+                 accuracy: float, holdout_accuracy: Optional[float]):
+        self.tree = tree
+        self.conditions = conditions
+        self.samples = samples
+        self.accuracy = accuracy
+        self.holdout_accuracy = holdout_accuracy
+
+    @property
+    def rules(self) -> List[str]:
+        """Each path to a True leaf, as a conjunction of conditions"""
+        rules = []
+        for trail, leaf in self.tree.paths():
+            if not leaf.prediction:
+                continue
+            terms = [self.conditions[i].name if outcome else self.conditions[i].negated
+                     for i, outcome in trail]
+            rules.append(" and ".join(terms) if terms else "always")
+        return rules or ["never"]
+
+    @property
+    def features(self) -> List[Tuple[str, float]]:
+        """Conditions the tree uses, most important first"""
+        ranked = sorted(self.tree.importance.items(), key=lambda item: -item[1])
+        return [(self.conditions[i].name, round(weight, 4)) for i, weight in ranked]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"samples": self.samples, "accuracy": self.accuracy,
+                "holdout_accuracy": self.holdout_accuracy, "depth": self.tree.depth(),
+                "rules": self.rules, "features": self.features}
+
+
+def induce_rules(table: FeatureTable, keywords: Sequence[str] = (), max_depth: int = 5,
+                 min_leaf: int = 1, holdout: float = 0.2, seed: int = 0) -> Optional[InducedRules]:
+    """Fit the most compact decision tree that explains a table's boolean outputs
+
+    Trees of depth 1..max_depth are fitted on a training split; the
+    shallowest one within half a percent of the best holdout accuracy is
+    refitted on all samples. Below MIN_HOLDOUT_SAMPLES there is no split
+    and depth is chosen on training accuracy. Returns None without
+    boolean outputs.
+    """
+    labeled = np.flatnonzero(table.labeled)
+    if not len(labeled):
+        return None
+    conditions = build_conditions(table, keywords)
+    X = np.column_stack([c.values for c in conditions])[labeled]
+    y = table.label[labeled]
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(y))
+    cut = int(len(y) * (1 - holdout)) if len(y) >= MIN_HOLDOUT_SAMPLES else len(y)
+    train, test = order[:cut], order[cut:]
+
+    scores = []
+    for depth in range(1, max_depth + 1):
+        tree = DecisionTree(depth, min_leaf).fit(X[train], y[train])
+        evaluate = test if len(test) else train
+        scores.append(float((tree.predict(X[evaluate]) == y[evaluate]).mean()))
+        if scores[-1] == 1.0:
+            break
+    depth = next(d for d, score in enumerate(scores, 1) if score >= max(scores) - 0.005)
+
+    tree = DecisionTree(depth, min_leaf).fit(X, y)
+    accuracy = float((tree.predict(X) == y).mean())
+    return InducedRules(tree, conditions, len(y), round(accuracy, 6),
+                        round(scores[depth - 1], 6) if len(test) else None)
+
+
+def explain(endpoint: str, inputs: Sequence[str], outputs: Sequence[Any],
+            table: FeatureTable = None) -> Optional[InducedRules]:
+    """induce_rules for one endpoint's observations, with its keywords"""
+    table = table or FeatureTable(list(inputs), list(outputs))
+    return induce_rules(table, ENDPOINT_KEYWORDS.get(endpoint, ()))
+
+
+def format_rules(induced: InducedRules, top_features: int = 3) -> List[str]:
+    """Human-readable lines for an induced rule set"""
+    holdout = "" if induced.holdout_accuracy is None else f", holdout {induced.holdout_accuracy:.1%}"
+    lines = [f"Induced rule ({induced.samples} samples, accuracy {induced.accuracy:.1%}{holdout}):"]
+    lines += [f"  true if {rule}" for rule in induced.rules]
+    features = ", ".join(name for name, _ in induced.features[:top_features])
+    if features:
+        lines.append(f"Key features: {features}")
+    return lines
@@ -0,0 +1,382 @@
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from hypothesis_matcher import md5_prefix
+from hypothesis_registry import documented_fizzbuzz, documented_glitch
+
+# GET /time is documented to always return the /data hash of "hello"
+TIME_VALUE = md5_prefix("hello")
+
+# Behaviour of each endpoint, as documented in ENDPOINT_ANALYSIS_LOGGING_SHEET.md
+POST_ENDPOINTS: Dict[str, Callable[[str], Any]] = {
+    "/data": md5_prefix,
+    "/fizzbuzz": documented_fizzbuzz,
+    "/glitch": documented_glitch,
+    "/zap": lambda s: s,
+    "/alpha": str.isalpha,
+}
+GET_ENDPOINTS: Dict[str, Callable[[], Any]] = {
+    "/time": lambda: TIME_VALUE,
+}
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+class StandInConfig:
+    """Fault and load knobs for the stand-in server"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, rate_limit: Optional[float] = None,
+                 burst: Optional[int] = None, max_payload: int = 1_000_000,
+                 retry_after: int = 1, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.burst = burst if burst is not None else max(1, int(rate_limit or 1))
+        self.max_payload = max_payload
+        # Whole seconds, as required for the delta-seconds form of Retry-After
+        self.retry_after = max(0, int(retry_after))
+        self.seed = seed
+
+
+class PayloadTooLarge(Exception):
+    pass
+
+
+class StandInApp:
+    """ASGI application that reimplements the six Black Box endpoints locally
+
+    Latency, jitter, random 500s, 429 throttling (random or by token
+    bucket) and a request-body size limit can be injected through
+    StandInConfig so the testers can be exercised offline under load.
+    """
+
+    def __init__(self, config: StandInConfig = None):
+        self.config = config or StandInConfig()
+        self.random = random.Random(self.config.seed)
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0, "rejected": 0}
+        self._tokens = float(self.config.burst)
+        self._refilled = time.monotonic()
+
+    def _take_token(self) -> bool:
+        if self.config.rate_limit is None:
+            return True
+        now = time.monotonic()
+        self._tokens = min(self.config.burst,
+                           self._tokens + (now - self._refilled) * self.config.rate_limit)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def _read_body(self, receive) -> bytes:
+        body = bytearray()
+        more = True
+        while more:
+            message = await receive()
+            body.extend(message.get("body", b""))
+            more = message.get("more_body", False)
+            if len(body) > self.config.max_payload:
+                raise PayloadTooLarge()
+        return bytes(body)
+
+    async def _respond(self, send, status: int, payload: Dict,
+                       headers: List[Tuple[bytes, bytes]] = ()):
+        body = json.dumps(payload).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()), *headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        config = self.config
+        self.stats["requests"] += 1
+        path, method = scope["path"], scope["method"]
+
+        if not self._take_token() or self.random.random() < config.throttle_rate:
+            self.stats["throttled"] += 1
+            limit = str(config.rate_limit or 0).encode()
+            return await self._respond(send, 429, {"error": "rate limited"}, [
+                (b"retry-after", str(config.retry_after).encode()),
+                (b"x-ratelimit-limit", limit),
+                (b"x-ratelimit-remaining", b"0"),
+            ])
+
+        try:
+            body = await self._read_body(receive)
+        except PayloadTooLarge:
+            self.stats["rejected"] += 1
+            return await self._respond(send, 413, {"error": "payload too large"},
+                                       [(b"connection", b"close")])
+
+        delay = config.latency + self.random.uniform(-config.jitter, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.random.random() < config.error_rate:
+            self.stats["errors"] += 1
+            return await self._respond(send, 500, {"error": "injected failure"})
+
+        if path in GET_ENDPOINTS:
+            if method != "GET":
+                return await self._respond(send, 405, {"error": "method not allowed"})
+            return await self._respond(send, 200, {"result": GET_ENDPOINTS[path]()})
+
+        if path not in POST_ENDPOINTS:
+            return await self._respond(send, 404, {"error": "not found"})
+        if method != "POST":
+            return await self._respond(send, 405, {"error": "method not allowed"})
+
+        try:
+            data = json.loads(body)["data"]
+        except (ValueError, KeyError, TypeError):
+            return await self._respond(send, 400, {"error": "expected JSON body with a 'data' field"})
+        if not isinstance(data, str):
+            return await self._respond(send, 400, {"error": "'data' must be a string"})
+
+        return await self._respond(send, 200, {"result": POST_ENDPOINTS[path](data)})
+
+
+class _BodyReader:
+    """Feeds a request body to the ASGI app, honouring Content-Length or chunked encoding"""
+
+    CHUNK = 64 * 1024
+
+    def __init__(self, reader: asyncio.StreamReader, headers: Dict[str, str]):
+        self.reader = reader
+        self.chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+        self.remaining = int(headers.get("content-length", 0) or 0)
+        self.finished = not self.chunked and self.remaining == 0
+
+    async def receive(self) -> Dict:
+        if self.finished:
+            return {"type": "http.request", "body": b"", "more_body": False}
+        if self.chunked:
+            size = int((await self.reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                await self.reader.readline()
+                self.finished = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            chunk = await self.reader.readexactly(size)
+            await self.reader.readline()
+            return {"type": "http.request", "body": chunk, "more_body": True}
+        chunk = await self.reader.readexactly(min(self.remaining, self.CHUNK))
+        self.remaining -= len(chunk)
+        self.finished = self.remaining == 0
+        return {"type": "http.request", "body": chunk, "more_body": not self.finished}
+
+
+async def _handle_connection(app, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            except asyncio.CancelledError:
+                # Idle keep-alive connection at shutdown
+                return
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, _ = lines[0].split(" ", 2)
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            path, _, query = target.partition("?")
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                "method": method.upper(), "path": path, "raw_path": path.encode(),
+                "query_string": query.encode(), "scheme": "http",
+                "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+                "client": writer.get_extra_info("peername"), "server": None,
+            }
+            body = _BodyReader(reader, headers)
+            response = {"status": 500, "headers": [], "body": bytearray()}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    response["status"] = message["status"]
+                    response["headers"] = message.get("headers", [])
+                else:
+                    response["body"].extend(message.get("body", b""))
+
+            await app(scope, body.receive, send)
+
+            status = response["status"]
+            out = [f"HTTP/1.1 {status} {REASONS.get(status, '')}".encode()]
+            names = set()
+            for name, value in response["headers"]:
+                names.add(name.lower())
+                out.append(name + b": " + value)
+            if b"content-length" not in names:
+                out.append(b"content-length: " + str(len(response["body"])).encode())
+            close = (headers.get("connection", "").lower() == "close"
+                     or not body.finished or b"connection" in names)
+            writer.write(b"\r\n".join(out) + b"\r\n\r\n" + bytes(response["body"]))
+            await writer.drain()
+            if close:
+                return
+    finally:
+        writer.close()
+
+
+async def serve(app, host: str = "127.0.0.1", port: int = 8000,
+                ready: Callable[[int], None] = None, stop: asyncio.Event = None):
+    """Serve an ASGI app over plain HTTP/1.1 with keep-alive, using only asyncio"""
+    server = await asyncio.start_server(lambda r, w: _handle_connection(app, r, w),
+                                        host, port, limit=1 << 20, backlog=1024)
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[1])
+    async with server:
+        if stop is None:
+            await server.serve_forever()
+        else:
+            await stop.wait()
+
+
+async def serve_http2(app, host: str = "127.0.0.1", port: int = 8000,
+                      ready: Callable[[int], None] = None, stop: asyncio.Event = None):
+    """Serve an ASGI app over HTTP/1.1 and HTTP/2 with hypercorn (h2 via ALPN or h2c prior knowledge)"""
+    from hypercorn.asyncio import serve as hypercorn_serve
+    from hypercorn.config import Config
+
+    # Bind first so that port 0 can be reported back before hypercorn takes over the socket
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    bound_port = sock.getsockname()[1]
+    config = Config()
+    config.bind = [f"fd://{sock.detach()}"]
+    config.backlog = 1024
+    config.accesslog = None
+    config.errorlog = None
+    if ready is not None:
+        ready(bound_port)
+    await hypercorn_serve(app, config, shutdown_trigger=stop.wait if stop is not None else None)
+
+
+class StandInServer:
+    """Run the stand-in app on a background thread, for testers and benchmarks
+
+        with StandInServer(StandInConfig(latency=0.2)) as server:
+            APIExplorer(server.base_url).run_comprehensive_test()
+
+    With http2=True it is served by hypercorn, which also speaks HTTP/2.
+    """
+
+    def __init__(self, config: StandInConfig = None, host: str = "127.0.0.1", port: int = 0,
+                 http2: bool = False):
+        self.app = StandInApp(config)
+        self.host = host
+        self.port = port
+        self.http2 = http2
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _run(self):
+        async def main():
+            self._loop = asyncio.get_running_loop()
+            self._stop = asyncio.Event()
+
+            def ready(port):
+                self.port = port
+                self._ready.set()
+
+            server = serve_http2 if self.http2 else serve
+            await server(self.app, self.host, self.port, ready=ready, stop=self._stop)
+
+        asyncio.run(main())
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._run, name="stand-in-server", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("stand-in server did not start")
+        return self
+
+    def stop(self):
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Black Box API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="uniform +/- seconds around latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests per second before 429s")
+    parser.add_argument("--burst", type=int, default=None, help="token bucket size for --rate-limit")
+    parser.add_argument("--max-payload", type=int, default=1_000_000, help="largest accepted body in bytes")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--uvicorn", action="store_true", help="serve with uvicorn instead of the built-in server")
+    parser.add_argument("--http2", action="store_true",
+                        help="serve HTTP/1.1 and HTTP/2 (h2c) with hypercorn instead of the built-in server")
+    args = parser.parse_args()
+
+    config = StandInConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           throttle_rate=args.throttle_rate, rate_limit=args.rate_limit,
+                           burst=args.burst, max_payload=args.max_payload, seed=args.seed)
+    app = StandInApp(config)
+    print(f"🚀 Stand-in API listening on http://{args.host}:{args.port}")
+    if args.uvicorn:
+        import uvicorn
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    elif args.http2:
+        try:
+            asyncio.run(serve_http2(app, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        try:
+            asyncio.run(serve(app, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stand_in_server import StandInConfig, StandInServer  # noqa: E402
+from transport import HTTPTransport  # noqa: E402
+
+
+@pytest.fixture
+def stand_in():
+    """Start stand-in servers with the given StandInConfig options; all are stopped afterwards"""
+    servers = []
+
+    def start(**config) -> StandInServer:
+        server = StandInServer(StandInConfig(seed=0, **config)).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def server(stand_in) -> StandInServer:
+    return stand_in()
+
+
+@pytest.fixture
+def transport(server):
+    with HTTPTransport(server.base_url) as transport:
+        yield transport
+
+
+@pytest.fixture
+def submit(transport):
+    """A ProbeEngine submit that sends each probe through `transport`"""
+    def submit(endpoint, method="POST", data=None, use_memo=True):
+        response = transport.request(endpoint, method=method, data=data, use_memo=use_memo)
+        return {"status_code": response.status_code, "response": response.json()}
+    return submit
@@ -0,0 +1,40 @@
+from drift import BaselineSnapshot, DriftMonitor, input_key
+from rate_limiter import RateLimiter
+from transport import HTTPTransport
+
+
+def test_changed_outputs_are_reported_and_stored(transport, tmp_path):
+    inputs = ["alpha", "Bravo", "charlie", "DELTA"]
+    with BaselineSnapshot(str(tmp_path / "baseline.sqlite3")) as snapshot:
+        monitor = DriftMonitor(transport, snapshot, concurrency=4)
+        recorded = monitor.check("/zap", inputs, update=True)
+        assert (recorded.new, recorded.changed, snapshot.count("/zap")) == (4, 0, 4)
+
+        # The deployment is unchanged, so one stale baseline row is the only difference
+        snapshot.store([(input_key("/zap", "Bravo"), "/zap", "Bravo", 200, "bravo")])
+        report = monitor.check("/zap")
+        assert (report.checked, report.unchanged, report.changed, report.errors) == (4, 3, 1, 0)
+        [change] = snapshot.changes(report.run_id, "/zap")
+        assert (change["input"], change["old_output"], change["new_output"]) == ("Bravo", "bravo", "Bravo")
+        assert snapshot.lookup([input_key("/zap", "Bravo")])[input_key("/zap", "Bravo")] == (200, "bravo")
+
+        monitor.check("/zap", update=True)
+        assert monitor.check("/zap").changed == 0
+
+
+def test_drift_probes_always_reach_the_network(server, transport, tmp_path):
+    transport.post("/zap", {"data": "x"})
+    with BaselineSnapshot(str(tmp_path / "baseline.sqlite3")) as snapshot:
+        monitor = DriftMonitor(transport, snapshot)
+        monitor.check("/zap", ["x"], update=True)
+        monitor.check("/zap")
+    assert server.app.stats["requests"] == 3
+
+
+def test_failed_probes_are_errors_not_drift(stand_in, tmp_path):
+    server = stand_in(throttle_rate=1.0, retry_after=0)
+    with HTTPTransport(server.base_url, rate_limiter=RateLimiter(max_requeues=0)) as transport, \
+            BaselineSnapshot(str(tmp_path / "baseline.sqlite3")) as snapshot:
+        snapshot.store([(input_key("/zap", "x"), "/zap", "x", 200, "x")])
+        report = DriftMonitor(transport, snapshot).check("/zap")
+    assert (report.errors, report.changed) == (1, 0)
@@ -0,0 +1,98 @@
+import threading
+import time
+
+from checkpoint import RunCheckpoint
+from corpus import Corpus
+from probe_engine import ProbeEngine
+from result_sink import JSONLResultSink
+from transport import HTTPTransport
+
+
+def test_map_stream_keeps_input_order_within_a_bounded_window(stand_in):
+    server = stand_in(latency=0.01, jitter=0.01)
+    pulled = 0
+
+    def inputs():
+        nonlocal pulled
+        for i in range(200):
+            pulled += 1
+            yield f"probe-{i}"
+
+    with HTTPTransport(server.base_url) as transport:
+        def submit(endpoint, method="POST", data=None, use_memo=True):
+            response = transport.request(endpoint, method=method, data=data, use_memo=use_memo)
+            return {"status_code": response.status_code, "response": response.json()}
+
+        engine = ProbeEngine(submit, concurrency=8)
+        seen = []
+        for i, (value, result) in enumerate(engine.map_stream("/zap", inputs(), window=16)):
+            # Besides the probe being yielded, at most `window` are pulled ahead
+            assert pulled - (i + 1) <= 16
+            seen.append((value, result["response"]["result"]))
+    assert seen == [(f"probe-{i}", f"probe-{i}") for i in range(200)]
+
+
+def test_slow_early_probes_do_not_reorder_results():
+    def submit(endpoint, method="POST", data=None):
+        value = data["data"]
+        time.sleep(0.05 if value < 4 else 0)
+        return {"status_code": 200, "response": {"result": value}}
+
+    engine = ProbeEngine(submit, concurrency=8)
+    assert [value for value, _ in engine.map_stream("/zap", range(40), window=8)] == list(range(40))
+
+
+def test_concurrency_is_bounded():
+    lock = threading.Lock()
+    active = peak = 0
+
+    def submit(endpoint, method="POST", data=None):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return {"status_code": 200, "response": {"result": data["data"]}}
+
+    engine = ProbeEngine(submit, concurrency=4)
+    assert [r["response"]["result"] for r in engine.map("/zap", list(range(30)))] == list(range(30))
+    list(engine.map_stream("/zap", range(30)))
+    assert peak <= 4
+
+
+def test_memo_is_bypassed_only_when_asked(transport, submit):
+    engine = ProbeEngine(submit, concurrency=4)
+    list(engine.map_stream("/zap", ["a", "b", "c"], memo=False))
+    assert len(transport.memo) == 0
+    list(engine.map_stream("/zap", ["a", "b", "c"]))
+    assert len(transport.memo) == 3
+
+
+def test_resumed_run_sends_only_unfinished_probes(server, submit, tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    inputs = [f"probe-{i}" for i in range(20)]
+    with JSONLResultSink(path) as sink:
+        list(ProbeEngine(submit, concurrency=4, sink=sink).map_stream("/zap", inputs[:12], memo=False))
+    sent = server.app.stats["requests"]
+
+    checkpoint = RunCheckpoint(path)
+    assert len(checkpoint) == 12
+    engine = ProbeEngine(submit, concurrency=4, checkpoint=checkpoint)
+    results = list(engine.map_stream("/zap", Corpus(lambda: iter(inputs), len(inputs)), memo=False))
+    assert [(value, result["response"]["result"]) for value, result in results] == list(zip(inputs, inputs))
+    assert engine.resumed == 12
+    assert server.app.stats["requests"] - sent == 8
+
+
+def test_throttled_records_are_not_treated_as_finished(tmp_path):
+    path = tmp_path / "run.jsonl"
+    with JSONLResultSink(str(path)) as sink:
+        sink.record(ProbeEngine.probe("/zap", "a"), {"status_code": 200, "response": {"result": "a"}})
+        sink.record(ProbeEngine.probe("/zap", "b"), {"status_code": 429, "response": {}})
+        sink.record(ProbeEngine.probe("/zap", "c"), {"status_code": 503, "response": {}})
+    checkpoint = RunCheckpoint(str(path))
+    assert checkpoint.done(ProbeEngine.probe("/zap", "a"))
+    assert not checkpoint.done(ProbeEngine.probe("/zap", "b"))
+    assert not checkpoint.done(ProbeEngine.probe("/zap", "c"))
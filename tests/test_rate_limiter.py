@@ -0,0 +1,59 @@
+import email.utils
+import time
+
+from rate_limiter import RateLimiter, parse_retry_after
+from transport import HTTPTransport, TransportResponse
+
+
+def test_throttled_requests_are_requeued_until_answered(stand_in):
+    server = stand_in(throttle_rate=0.3, retry_after=0)
+    limiter = RateLimiter(max_requeues=20)
+    with HTTPTransport(server.base_url, rate_limiter=limiter, dedupe=False) as transport:
+        statuses = [transport.post("/zap", {"data": f"probe-{i}"}).status_code for i in range(50)]
+    assert statuses == [200] * 50
+    assert server.app.stats["throttled"] > 0
+    assert limiter.throttled == limiter.requeued == server.app.stats["throttled"]
+    assert server.app.stats["requests"] == 50 + limiter.requeued
+
+
+def test_requeues_stop_after_max_requeues(stand_in):
+    server = stand_in(throttle_rate=1.0, retry_after=0)
+    limiter = RateLimiter(max_requeues=2)
+    with HTTPTransport(server.base_url, rate_limiter=limiter) as transport:
+        assert transport.post("/zap", {"data": "x"}).status_code == 429
+    assert server.app.stats["requests"] == 3
+    assert limiter.requeued == 2
+
+
+def test_retry_after_pauses_only_the_throttled_endpoint():
+    limiter = RateLimiter()
+    throttled = TransportResponse(429, {"Retry-After": "0.3"}, b"")
+    assert limiter.observe("/zap", throttled)
+
+    start = time.monotonic()
+    limiter.acquire("/alpha")
+    assert time.monotonic() - start < 0.1
+    limiter.acquire("/zap")
+    assert time.monotonic() - start >= 0.25
+
+
+def test_successes_are_not_requeued():
+    limiter = RateLimiter()
+    assert not limiter.observe("/zap", TransportResponse(200, {}, b"{}"))
+    assert limiter.throttled == 0
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    now = time.time()
+    assert parse_retry_after("7") == 7.0
+    assert abs(parse_retry_after(email.utils.formatdate(now + 30, usegmt=True), now=now) - 30) <= 1
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_rate_is_paced_by_the_token_bucket():
+    limiter = RateLimiter(rate=20, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire("/zap")
+    assert time.monotonic() - start >= 0.2
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from rate_limiter import RateLimiter
+from request_memo import RequestMemo
+from transport import HTTPTransport
+
+
+def counting_send(calls, value):
+    def send():
+        calls.append(value)
+        return value
+    return send
+
+
+def test_identical_requests_reach_the_network_once(server, transport):
+    for _ in range(3):
+        assert transport.post("/zap", {"data": "same"}).json() == {"result": "same"}
+    assert server.app.stats["requests"] == 1
+    assert transport.memo.sent == 1
+    assert transport.memo.reused == 2
+
+
+def test_concurrent_duplicates_share_one_request(stand_in):
+    server = stand_in(latency=0.2)
+    with HTTPTransport(server.base_url) as transport:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(lambda _: transport.post("/zap", {"data": "x"}), range(8)))
+    assert [r.json()["result"] for r in responses] == ["x"] * 8
+    assert server.app.stats["requests"] == 1
+    assert transport.memo.saved == 7
+
+
+def test_get_requests_are_not_memoized(server, transport):
+    transport.get("/time")
+    transport.get("/time")
+    assert server.app.stats["requests"] == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    memo = RequestMemo(max_entries=2)
+    calls = []
+    for value in ("a", "b", "a", "c"):
+        memo.call("POST", "/zap", {"data": value}, counting_send(calls, value))
+    assert calls == ["a", "b", "c"]
+    assert len(memo) == 2
+
+    memo.call("POST", "/zap", {"data": "a"}, counting_send(calls, "a"))
+    memo.call("POST", "/zap", {"data": "b"}, counting_send(calls, "b"))
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_results_rejected_by_keep_are_sent_again():
+    memo = RequestMemo(keep=lambda result: result != "throttled")
+    calls = []
+    assert memo.call("POST", "/zap", {"data": "x"}, counting_send(calls, "throttled")) == "throttled"
+    assert len(memo) == 0
+    assert memo.call("POST", "/zap", {"data": "x"}, counting_send(calls, "ok")) == "ok"
+    assert memo.call("POST", "/zap", {"data": "x"}, counting_send(calls, "unused")) == "ok"
+    assert calls == ["throttled", "ok"]
+
+
+def test_throttled_answers_are_not_remembered(stand_in):
+    server = stand_in(throttle_rate=1.0, retry_after=0)
+    with HTTPTransport(server.base_url, rate_limiter=RateLimiter(max_requeues=0)) as transport:
+        assert transport.post("/zap", {"data": "x"}).status_code == 429
+        assert len(transport.memo) == 0
+        transport.post("/zap", {"data": "x"})
+    assert server.app.stats["requests"] == 2
+
+
+def test_failed_sends_are_not_memoized():
+    memo = RequestMemo()
+
+    def fail():
+        raise ConnectionError("reset")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            memo.call("POST", "/zap", {"data": "x"}, fail)
+    assert memo.sent == 2
+    assert len(memo) == 0
@@ -0,0 +1,193 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from probe_engine import result_output
+
+# Sampling /time next to the other probes shares their rate limit, so keep it light:
+# 4 requests per second, and no more than a minute's worth in total
+BACKGROUND_INTERVAL = 0.25
+BACKGROUND_SAMPLES = 240
+
+
+class TimeSample:
+    """One GET /time observation with monotonic send/receive stamps"""
+
+    __slots__ = ("sent", "received", "wall", "value", "status")
+
+    def __init__(self, sent: float, received: float, wall: float, value: Any, status: Optional[int]):
+        self.sent = sent
+        self.received = received
+        self.wall = wall
+        self.value = value
+        self.status = status
+
+    @property
+    def rtt(self) -> float:
+        return self.received - self.sent
+
+
+class TimeSampler:
+    """Poll GET /time on a fixed schedule in the background, alongside other probing
+
+    Requests are issued every `interval` seconds (down to milliseconds)
+    from a small worker pool, so the schedule holds even when a round trip
+    is slower than the spacing. stop() returns analyze_time_series().
+    """
+
+    def __init__(self, transport, endpoint: str = "/time", interval: float = 0.1,
+                 max_in_flight: int = 4, max_samples: Optional[int] = None):
+        self.transport = transport
+        self.endpoint = endpoint
+        self.interval = interval
+        self.max_in_flight = max_in_flight
+        self.max_samples = max_samples
+        self.samples: List[TimeSample] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._slots = threading.Semaphore(max_in_flight)
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        sent = time.monotonic()
+        try:
+            response = self.transport.get(self.endpoint, use_cache=False)
+            status = response.status_code
+            try:
+                value = result_output({"response": response.json()})
+            except ValueError:
+                value = None
+        except Exception:
+            status, value = None, None
+        received = time.monotonic()
+        # Wall clock at the midpoint of the round trip, for offset estimates
+        wall = time.time() - (received - sent) / 2
+        with self._lock:
+            self.samples.append(TimeSample(sent, received, wall, value, status))
+        self._slots.release()
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            next_tick = time.monotonic()
+            issued = 0
+            while not self._stop.is_set():
+                if self.max_samples is not None and issued >= self.max_samples:
+                    break
+                # Skip a tick rather than queue up when every slot is busy
+                if self._slots.acquire(blocking=False):
+                    executor.submit(self._sample)
+                    issued += 1
+                next_tick += self.interval
+                self._stop.wait(max(0.0, next_tick - time.monotonic()))
+
+    @classmethod
+    def background(cls, transport, endpoint: str = "/time") -> "TimeSampler":
+        """A gentle sampler to run alongside other probing: 4 per second, at most BACKGROUND_SAMPLES"""
+        return cls(transport, endpoint, interval=BACKGROUND_INTERVAL, max_in_flight=1,
+                   max_samples=BACKGROUND_SAMPLES)
+
+    def start(self) -> "TimeSampler":
+        self._thread = threading.Thread(target=self._run, name="time-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, min_samples: int = 1, timeout: float = 30.0) -> Dict[str, Any]:
+        """Stop sampling (after at least min_samples) and analyze what was collected"""
+        deadline = time.monotonic() + timeout
+        while len(self.samples) < min_samples and time.monotonic() < deadline:
+            if self._thread is None or not self._thread.is_alive():
+                break
+            time.sleep(self.interval)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return analyze_time_series(self.samples)
+
+    def run_for(self, seconds: float) -> Dict[str, Any]:
+        """Sample in the foreground for a fixed duration"""
+        self.start()
+        time.sleep(seconds)
+        return self.stop()
+
+
+def analyze_time_series(samples: List[TimeSample]) -> Dict[str, Any]:
+    """Change points, periodicity and clock offset of a /time series"""
+    ordered = sorted(samples, key=lambda s: s.sent)
+    valid = [s for s in ordered if isinstance(s.value, (int, float)) and not isinstance(s.value, bool)]
+    rtts = np.array([s.rtt for s in ordered]) * 1000
+    report: Dict[str, Any] = {
+        "samples": len(ordered),
+        "valid": len(valid),
+        "errors": len(ordered) - len(valid),
+        "span_seconds": round(ordered[-1].sent - ordered[0].sent, 4) if ordered else 0.0,
+        "rtt_p50_ms": round(float(np.percentile(rtts, 50)), 3) if len(rtts) else None,
+        "distinct_values": len({s.value for s in valid}),
+        "change_points": [],
+        "period_seconds": None,
+        "period_cv": None,
+        "clock_slope": None,
+        "clock_r2": None,
+        "clock_offset_seconds": None,
+        "change_rate_upper_95": None,
+        "verdict": "no data",
+    }
+    if not valid:
+        return report
+
+    for previous, current in zip(valid, valid[1:]):
+        if current.value != previous.value:
+            report["change_points"].append({"at": round(current.sent - valid[0].sent, 4),
+                                            "from": previous.value, "to": current.value})
+
+    if len(report["change_points"]) >= 2:
+        gaps = np.diff([c["at"] for c in report["change_points"]])
+        report["period_seconds"] = round(float(np.median(gaps)), 4)
+        report["period_cv"] = round(float(np.std(gaps) / np.mean(gaps)), 4) if np.mean(gaps) else None
+
+    if report["distinct_values"] == 1:
+        report["verdict"] = "fixed"
+        # Rule of three: with no change seen over the span, the change rate is
+        # below 3/span per second with 95% confidence
+        if report["span_seconds"]:
+            report["change_rate_upper_95"] = round(3 / report["span_seconds"], 6)
+        return report
+
+    walls = np.array([s.wall for s in valid])
+    values = np.array([s.value for s in valid], dtype=float)
+    slope, intercept = np.polyfit(walls - walls[0], values, 1)
+    predicted = slope * (walls - walls[0]) + intercept
+    residual = float(np.sum((values - predicted) ** 2))
+    total = float(np.sum((values - values.mean()) ** 2))
+    r2 = 1 - residual / total if total else 0.0
+    report["clock_slope"] = round(float(slope), 6)
+    report["clock_r2"] = round(r2, 6)
+
+    if r2 > 0.99 and 0.9 < slope < 1.1:
+        report["verdict"] = "unix seconds clock"
+        report["clock_offset_seconds"] = round(float(np.mean(values - walls)), 4)
+    elif r2 > 0.99 and 900 < slope < 1100:
+        report["verdict"] = "unix milliseconds clock"
+        report["clock_offset_seconds"] = round(float(np.mean(values / 1000 - walls)), 4)
+    else:
+        report["verdict"] = "varying"
+    return report
+
+
+def format_time_report(report: Dict[str, Any]) -> List[str]:
+    """Human-readable lines for an analyze_time_series() report"""
+    lines = [f"Samples: {report['valid']}/{report['samples']} over {report['span_seconds']}s "
+             f"(median RTT {report['rtt_p50_ms']} ms)",
+             f"Distinct values: {report['distinct_values']}, "
+             f"change points: {len(report['change_points'])}"]
+    if report["change_rate_upper_95"] is not None:
+        lines.append(f"No change seen: fewer than {report['change_rate_upper_95']} changes/s (95%)")
+    if report["period_seconds"] is not None:
+        lines.append(f"Period: {report['period_seconds']}s (cv {report['period_cv']})")
+    if report["clock_slope"] is not None:
+        lines.append(f"Clock fit: slope {report['clock_slope']}, r² {report['clock_r2']}")
+    if report["clock_offset_seconds"] is not None:
+        lines.append(f"Offset from local clock: {report['clock_offset_seconds']}s")
+    return lines
@@ -0,0 +1,251 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+PHASES = ("connect", "tls", "ttfb", "total")
+PERCENTILES = (50, 90, 99, 99.9)
+
+_active = threading.local()
+
+
+class RequestTiming:
+    """Phase durations of one HTTP exchange, in seconds from time.perf_counter
+
+    connect covers DNS resolution and the TCP handshake, tls the TLS
+    handshake after it; both stay None when a pooled keep-alive connection
+    is reused. ttfb runs from the start of the request until the response
+    headers are in, total until the body is fully read.
+    """
+
+    __slots__ = ("start", "connect", "tls", "ttfb", "total")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.connect: Optional[float] = None
+        self.tls: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.total: Optional[float] = None
+
+    def add(self, phase: str, seconds: float):
+        # Retries inside urllib3 may connect more than once
+        current = getattr(self, phase)
+        setattr(self, phase, seconds if current is None else current + seconds)
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        """Phase durations in milliseconds"""
+        return {phase: None if getattr(self, phase) is None else round(getattr(self, phase) * 1000, 3)
+                for phase in PHASES}
+
+
+@contextmanager
+def timed_request() -> Iterator[RequestTiming]:
+    """Collect the phase timings of the request sent by this thread inside the block"""
+    timing = RequestTiming()
+    _active.timing = timing
+    try:
+        yield timing
+    finally:
+        _active.timing = None
+        timing.total = time.perf_counter() - timing.start
+
+
+def _current() -> Optional[RequestTiming]:
+    return getattr(_active, "timing", None)
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        timing = _current()
+        if timing is not None:
+            timing.add("connect", time.perf_counter() - start)
+        return sock
+
+    def getresponse(self):
+        response = super().getresponse()
+        timing = _current()
+        if timing is not None:
+            timing.ttfb = time.perf_counter() - timing.start
+        return response
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        self._tcp_seconds = time.perf_counter() - start
+        return sock
+
+    def connect(self):
+        self._tcp_seconds = 0.0
+        start = time.perf_counter()
+        super().connect()
+        timing = _current()
+        if timing is not None:
+            timing.add("connect", self._tcp_seconds)
+            timing.add("tls", time.perf_counter() - start - self._tcp_seconds)
+
+    def getresponse(self):
+        response = super().getresponse()
+        timing = _current()
+        if timing is not None:
+            timing.ttfb = time.perf_counter() - timing.start
+        return response
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report into the active timed_request()"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of durations, in integer microseconds
+
+    Values below 2**sub_bits are counted exactly; above that every power of
+    two is split into 2**(sub_bits - 1) equal buckets, so any recorded value
+    is reported within 1 / 2**(sub_bits - 1) of its true size (under 1% with
+    the default) while memory stays proportional to the number of distinct
+    buckets hit. record() is one bit_length, a shift and a dict update.
+    """
+
+    def __init__(self, sub_bits: int = 8):
+        self.sub_bits = sub_bits
+        self._half = 1 << (sub_bits - 1)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.sub_bits)
+        return shift * self._half + (value >> shift)
+
+    def _highest(self, index: int) -> int:
+        """The largest value that falls into a bucket"""
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        return ((index - shift * self._half + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        value = max(0, int(seconds * 1_000_000))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if other.sub_bits != self.sub_bits:
+            raise ValueError("cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Duration in milliseconds at or below which p percent of the values fall"""
+        if not self.count:
+            return None
+        rank = max(1, int(-(-p * self.count // 100)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest(index), self.max) / 1000
+        return self.max / 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        summary = {"count": self.count, "min_ms": self.min / 1000,
+                   "mean_ms": round(self.sum / self.count / 1000, 3)}
+        for p in PERCENTILES:
+            summary[f"p{p:g}_ms"] = self.percentile(p)
+        summary["max_ms"] = self.max / 1000
+        return summary
+
+
+class TimingStats:
+    """Per-endpoint latency histograms for every phase, shared by all worker threads"""
+
+    def __init__(self):
+        self.histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, timing: RequestTiming):
+        with self._lock:
+            phases = self.histograms.get(endpoint)
+            if phases is None:
+                phases = self.histograms[endpoint] = {phase: LatencyHistogram() for phase in PHASES}
+            for phase in PHASES:
+                seconds = getattr(timing, phase)
+                if seconds is not None:
+                    phases[phase].record(seconds)
+
+    def merge(self, other: "TimingStats") -> "TimingStats":
+        with self._lock:
+            for endpoint, phases in other.histograms.items():
+                mine = self.histograms.setdefault(endpoint, {phase: LatencyHistogram() for phase in PHASES})
+                for phase, histogram in phases.items():
+                    mine[phase].merge(histogram)
+        return self
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            return {endpoint: {phase: histogram.to_dict() for phase, histogram in phases.items()}
+                    for endpoint, phases in sorted(self.histograms.items())}
+
+
+def format_timing_report(stats: TimingStats) -> List[str]:
+    """Human-readable latency table, one row per endpoint and phase"""
+    summary = stats.to_dict()
+    if not summary:
+        return []
+    header = f"  {'endpoint':<10} {'phase':<8} {'count':>7} " + " ".join(
+        f"{'p' + format(p, 'g'):>9}" for p in PERCENTILES) + f" {'max':>9}"
+    lines = [header]
+    for endpoint, phases in summary.items():
+        for phase in PHASES:
+            row = phases[phase]
+            if not row["count"]:
+                continue
+            values = [row[f"p{p:g}_ms"] for p in PERCENTILES] + [row["max_ms"]]
+            lines.append(f"  {endpoint:<10} {phase:<8} {row['count']:>7} "
+                         + " ".join(f"{v:>7.1f}ms" for v in values))
+    return lines
+
+
+def report_latency(transport, reporter):
+    """Print the latency table for everything a transport has sent so far, if anything"""
+    lines = format_timing_report(transport.timings)
+    if lines:
+        reporter.summary("\n⏱️  Latency by endpoint and phase:")
+        for line in lines:
+            reporter.summary(line)
@@ -0,0 +1,202 @@
+import json
+from typing import Dict, Any, Iterable, Optional, Tuple, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from checkpoint import finished
+from middleware import Middleware, MiddlewareChain
+from rate_limiter import RateLimiter
+from request_memo import RequestMemo
+from timing import TimedHTTPAdapter, TimingStats, timed_request
+
+DEFAULT_BASE_URL = "https://blackbox-interface.vercel.app"
+RETRY_STATUSES = (500, 502, 503, 504)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class _ProbeRetry(Retry):
+    # 429s are requeued by the RateLimiter instead of being slept on inside urllib3
+    RETRY_AFTER_STATUS_CODES = frozenset({503})
+
+
+class TransportResponse:
+    """Fully-read HTTP response, detached from the connection it came from"""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.cached = False
+        # Phase durations in ms for responses that came from the network
+        self.timing: Optional[Dict[str, Optional[float]]] = None
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    @classmethod
+    def from_requests(cls, response: requests.Response) -> "TransportResponse":
+        return cls(response.status_code, dict(response.headers), response.content)
+
+
+class HTTPTransport:
+    """Pooled keep-alive HTTP client shared by all tester classes
+
+    Connection errors and 5xx responses are retried with exponential backoff,
+    and every request carries a timeout so one stuck call cannot stall a run.
+    An optional ResponseCache is consulted before the network, and identical
+    requests within one run are sent only once through a RequestMemo. Every
+    network send is paced by a RateLimiter, which also requeues 429s.
+    Every network exchange is timed per phase into `timings`. Middleware
+    hooks run around every request() call, cached or not.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, pool_size: int = 16,
+                 timeout: Timeout = (3.05, 10.0), max_retries: int = 3,
+                 backoff_factor: float = 0.3, cache=None, dedupe: bool = True,
+                 rate_limiter: RateLimiter = None, middleware: Iterable[Middleware] = ()):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache = cache
+        self.memo = RequestMemo(keep=lambda response: finished(response.status_code)) if dedupe else None
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.timings = TimingStats()
+        self.middleware = MiddlewareChain(middleware)
+        self._upload_session: Optional[requests.Session] = None
+        self.session = self._open_session(pool_size, max_retries, backoff_factor)
+
+    def _open_session(self, pool_size: int, max_retries: int, backoff_factor: float):
+        session = requests.Session()
+        session.headers["Connection"] = "keep-alive"
+        retry = _ProbeRetry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            # The probes are side-effect free, so POSTs are safe to retry too
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                   max_retries=retry, pool_block=True)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def url(self, endpoint: str) -> str:
+        return f"{self.base_url}{endpoint}"
+
+    def request(self, endpoint: str, method: str = "POST", data: Dict = None,
+                timeout: Optional[Timeout] = None, use_cache: bool = True,
+                use_memo: bool = True) -> TransportResponse:
+        """Send one request and return the fully-read response
+
+        Pass use_cache=False to bypass the response cache for this call, and
+        use_memo=False to bypass the in-run memo as well (a fresh answer).
+        """
+        method = method.upper()
+        if method == "GET":
+            data = None
+        if not len(self.middleware):
+            return self._dispatch(endpoint, method, data, timeout, use_cache, use_memo)
+        request = {"method": method, "endpoint": endpoint, "data": data}
+        return self.middleware.call(request, lambda r: self._dispatch(
+            r["endpoint"], r["method"].upper(), r["data"], timeout, use_cache, use_memo))
+
+    def _dispatch(self, endpoint: str, method: str, data: Dict, timeout: Optional[Timeout],
+                  use_cache: bool, use_memo: bool = True) -> TransportResponse:
+        if self.memo is not None and use_memo:
+            return self.memo.call(method, endpoint, data,
+                                  lambda: self._fetch(endpoint, method, data, timeout, use_cache))
+        return self._fetch(endpoint, method, data, timeout, use_cache)
+
+    def _fetch(self, endpoint: str, method: str, data: Dict,
+               timeout: Optional[Timeout], use_cache: bool) -> TransportResponse:
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(method, endpoint, data, self.base_url)
+            if cached is not None:
+                return cached
+
+        response = self._paced_send(endpoint, method, data, timeout)
+        if cache is not None:
+            cache.put(method, endpoint, data, response, self.base_url)
+        return response
+
+    def _paced_send(self, endpoint: str, method: str, data: Dict,
+                    timeout: Optional[Timeout]) -> TransportResponse:
+        limiter = self.rate_limiter
+        for attempt in range(limiter.max_requeues + 1):
+            limiter.acquire(endpoint)
+            response = self._send(endpoint, method, data, timeout)
+            if not limiter.observe(endpoint, response) or attempt == limiter.max_requeues:
+                return response
+            limiter.requeue()
+        return response
+
+    def _send(self, endpoint: str, method: str, data: Dict,
+              timeout: Optional[Timeout]) -> TransportResponse:
+        timeout = self.timeout if timeout is None else timeout
+        with timed_request() as timing:
+            if method == "GET":
+                response = self.session.get(self.url(endpoint), timeout=timeout)
+            else:
+                response = self.session.request(method, self.url(endpoint), json=data, timeout=timeout)
+            response = TransportResponse.from_requests(response)
+        self.timings.record(endpoint, timing)
+        response.timing = timing.to_dict()
+        return response
+
+    def send_body(self, endpoint: str, body, method: str = "POST",
+                  content_type: str = "application/json",
+                  timeout: Optional[Timeout] = None) -> TransportResponse:
+        """Send an already-serialized body: bytes, a sized iterable of chunks, or a generator
+
+        Large-payload probes skip the memo and cache and are never retried,
+        since a refused upload would otherwise be sent again in full. They
+        are still paced by the rate limiter.
+        """
+        if self._upload_session is None:
+            self._upload_session = requests.Session()
+            self._upload_session.headers["Connection"] = "keep-alive"
+            adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+            self._upload_session.mount("http://", adapter)
+            self._upload_session.mount("https://", adapter)
+        self.rate_limiter.acquire(endpoint)
+        with timed_request() as timing:
+            response = self._upload_session.request(
+                method.upper(), self.url(endpoint), data=body,
+                headers={"Content-Type": content_type},
+                timeout=self.timeout if timeout is None else timeout)
+            response = TransportResponse.from_requests(response)
+        response.timing = timing.to_dict()
+        self.rate_limiter.observe(endpoint, response)
+        return response
+
+    def get(self, endpoint: str, **kwargs) -> TransportResponse:
+        return self.request(endpoint, method="GET", **kwargs)
+
+    def post(self, endpoint: str, data: Dict = None, **kwargs) -> TransportResponse:
+        return self.request(endpoint, method="POST", data=data, **kwargs)
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+        if self._upload_session is not None:
+            self._upload_session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,25 +1,34 @@
-import requests
 import json
 import time
 import hashlib
 import re
 from typing import Dict, Any, List
 
+from checkpoint import RunCheckpoint
+from probe_engine import ProbeEngine
+from reporter import Reporter
+from result_sink import JSONLResultSink
+from rule_induction import explain, format_rules
+from time_sampler import TimeSampler, format_time_report
+from timing import report_latency
+from transport import DEFAULT_BASE_URL, HTTPTransport
+
 class WorkingAPITester:
-    def __init__(self, base_url: str = "https://blackbox-interface.vercel.app"):
-        self.base_url = base_url
-        self.session = requests.Session()
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, concurrency: int = 16,
+                 transport: HTTPTransport = None, sink: JSONLResultSink = None,
+                 checkpoint: RunCheckpoint = None, reporter: Reporter = None):
+        self.transport = transport or HTTPTransport(base_url, pool_size=concurrency)
+        self.base_url = self.transport.base_url
+        self.reporter = reporter or Reporter()
+        self.engine = ProbeEngine(self.test_endpoint, concurrency=concurrency, sink=sink,
+                                  checkpoint=checkpoint, reporter=self.reporter)
         self.results = {}
     
-    def test_endpoint(self, endpoint: str, method: str = "POST", data: Dict = None) -> Dict:
+    def test_endpoint(self, endpoint: str, method: str = "POST", data: Dict = None,
+                      use_memo: bool = True) -> Dict:
         """Test an endpoint and return the response"""
-        url = f"{self.base_url}{endpoint}"
-        
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url)
-            else:
-                response = self.session.post(url, json=data)
+            response = self.transport.request(endpoint, method=method, data=data, use_memo=use_memo)
             
             # Handle different response types
             if response.status_code == 200:
@@ -28,19 +37,22 @@ class WorkingAPITester:
                     return {
                         "status_code": response.status_code,
                         "response": response_data,
-                        "success": True
+                        "success": True,
+                        "timing": response.timing
                     }
                 except json.JSONDecodeError:
                     return {
                         "status_code": response.status_code,
                         "response": {"text": response.text},
-                        "success": True
+                        "success": True,
+                        "timing": response.timing
                     }
             else:
                 return {
                     "status_code": response.status_code,
                     "response": {"error": response.text},
-                    "success": False
+                    "success": False,
+                    "timing": response.timing
                 }
         except Exception as e:
             return {
@@ -51,8 +63,8 @@ class WorkingAPITester:
     
     def test_data_endpoint(self):
         """Test the /data endpoint with various inputs"""
-        print("🔍 Testing /data endpoint...")
-        print("-" * 40)
+        self.reporter.summary("🔍 Testing /data endpoint...")
+        self.reporter.summary("-" * 40)
         
         test_cases = [
             "hello", "world", "test", "123", "abc", "", "a", "aa", "aaa",
@@ -60,18 +72,18 @@ class WorkingAPITester:
         ]
         
         results = []
-        for test_input in test_cases:
-            result = self.test_endpoint("/data", data={"data": test_input})
+        responses = self.engine.map("/data", test_cases)
+        for test_input, result in zip(test_cases, responses):
             if result["success"]:
                 output = result["response"].get("result")
-                print(f"  Input: '{test_input}' → Output: {output}")
+                self.reporter.detail(f"  Input: '{test_input}' → Output: {output}")
                 results.append({
                     "input": test_input,
                     "output": output,
                     "status": "success"
                 })
             else:
-                print(f"  Input: '{test_input}' → Error: {result['response'].get('error')}")
+                self.reporter.detail(f"  Input: '{test_input}' → Error: {result['response'].get('error')}")
                 results.append({
                     "input": test_input,
                     "output": None,
@@ -81,38 +93,41 @@ class WorkingAPITester:
         
         return results
     
-    def test_time_endpoint(self):
+    def test_time_endpoint(self, sampler: TimeSampler = None, duration: float = 2.0):
         """Test the /time endpoint"""
-        print("\n⏰ Testing /time endpoint...")
-        print("-" * 40)
+        self.reporter.summary("\n⏰ Testing /time endpoint...")
+        self.reporter.summary("-" * 40)
+        
+        if sampler is None:
+            sampler = TimeSampler(self.transport, interval=0.1).start()
+            time.sleep(duration)
+        report = sampler.stop(min_samples=3)
+        for line in format_time_report(report):
+            self.reporter.summary(f"  {line}")
+        self.reporter.summary(f"  Verdict: {report['verdict']}")
         
         results = []
-        for i in range(3):
-            result = self.test_endpoint("/time", method="GET")
-            if result["success"]:
-                output = result["response"].get("result")
-                print(f"  Call {i+1}: {output}")
+        for i, sample in enumerate(sampler.samples):
+            if sample.status == 200:
                 results.append({
                     "call": i+1,
-                    "output": output,
+                    "output": sample.value,
                     "status": "success"
                 })
             else:
-                print(f"  Call {i+1}: Error - {result['response'].get('error')}")
                 results.append({
                     "call": i+1,
                     "output": None,
                     "status": "error",
-                    "error": result["response"].get("error")
+                    "error": f"status {sample.status}"
                 })
-            time.sleep(1)
         
         return results
     
     def test_fizzbuzz_endpoint(self):
         """Test the /fizzbuzz endpoint"""
-        print("\n🎯 Testing /fizzbuzz endpoint...")
-        print("-" * 40)
+        self.reporter.summary("\n🎯 Testing /fizzbuzz endpoint...")
+        self.reporter.summary("-" * 40)
         
         test_cases = [
             "1", "2", "3", "4", "5", "15", "30", "45", "60", "75", "90", "105",
@@ -120,18 +135,18 @@ class WorkingAPITester:
         ]
         
         results = []
-        for test_input in test_cases:
-            result = self.test_endpoint("/fizzbuzz", data={"data": test_input})
+        responses = self.engine.map("/fizzbuzz", test_cases)
+        for test_input, result in zip(test_cases, responses):
             if result["success"]:
                 output = result["response"].get("result")
-                print(f"  Input: '{test_input}' → Output: {output}")
+                self.reporter.detail(f"  Input: '{test_input}' → Output: {output}")
                 results.append({
                     "input": test_input,
                     "output": output,
                     "status": "success"
                 })
             else:
-                print(f"  Input: '{test_input}' → Error: {result['response'].get('error')}")
+                self.reporter.detail(f"  Input: '{test_input}' → Error: {result['response'].get('error')}")
                 results.append({
                     "input": test_input,
                     "output": None,
@@ -143,8 +158,8 @@ class WorkingAPITester:
     
     def test_glitch_endpoint(self):
         """Test the /glitch endpoint"""
-        print("\n⚡ Testing /glitch endpoint...")
-        print("-" * 40)
+        self.reporter.summary("\n⚡ Testing /glitch endpoint...")
+        self.reporter.summary("-" * 40)
         
         test_cases = [
             "hello", "world", "test", "123", "abc", "", "a", "aa", "aaa",
@@ -152,18 +167,18 @@ class WorkingAPITester:
         ]
         
         results = []
-        for test_input in test_cases:
-            result = self.test_endpoint("/glitch", data={"data": test_input})
+        responses = self.engine.map("/glitch", test_cases)
+        for test_input, result in zip(test_cases, responses):
             if result["success"]:
                 output = result["response"].get("result")
-                print(f"  Input: '{test_input}' → Output: {output}")
+                self.reporter.detail(f"  Input: '{test_input}' → Output: {output}")
                 results.append({
                     "input": test_input,
                     "output": output,
                     "status": "success"
                 })
             else:
-                print(f"  Input: '{test_input}' → Error: {result['response'].get('error')}")
+                self.reporter.detail(f"  Input: '{test_input}' → Error: {result['response'].get('error')}")
                 results.append({
                     "input": test_input,
                     "output": None,
@@ -175,8 +190,8 @@ class WorkingAPITester:
     
     def test_zap_endpoint(self):
         """Test the /zap endpoint"""
-        print("\n⚡ Testing /zap endpoint...")
-        print("-" * 40)
+        self.reporter.summary("\n⚡ Testing /zap endpoint...")
+        self.reporter.summary("-" * 40)
         
         test_cases = [
             "hello", "world", "test", "123", "abc", "", "a", "aa", "aaa",
@@ -184,18 +199,18 @@ class WorkingAPITester:
         ]
         
         results = []
-        for test_input in test_cases:
-            result = self.test_endpoint("/zap", data={"data": test_input})
+        responses = self.engine.map("/zap", test_cases)
+        for test_input, result in zip(test_cases, responses):
             if result["success"]:
                 output = result["response"].get("result")
-                print(f"  Input: '{test_input}' → Output: '{output}'")
+                self.reporter.detail(f"  Input: '{test_input}' → Output: '{output}'")
                 results.append({
                     "input": test_input,
                     "output": output,
                     "status": "success"
                 })
             else:
-                print(f"  Input: '{test_input}' → Error: {result['response'].get('error')}")
+                self.reporter.detail(f"  Input: '{test_input}' → Error: {result['response'].get('error')}")
                 results.append({
                     "input": test_input,
                     "output": None,
@@ -207,8 +222,8 @@ class WorkingAPITester:
     
     def test_alpha_endpoint(self):
         """Test the /alpha endpoint"""
-        print("\n🔤 Testing /alpha endpoint...")
-        print("-" * 40)
+        self.reporter.summary("\n🔤 Testing /alpha endpoint...")
+        self.reporter.summary("-" * 40)
         
         # Test with various inputs
         test_cases = [
@@ -219,18 +234,18 @@ class WorkingAPITester:
         ]
         
         results = []
-        for test_input in test_cases:
-            result = self.test_endpoint("/alpha", data={"data": test_input})
+        responses = self.engine.map("/alpha", test_cases)
+        for test_input, result in zip(test_cases, responses):
             if result["success"]:
                 output = result["response"].get("result")
-                print(f"  Input: '{test_input}' → Output: {output}")
+                self.reporter.detail(f"  Input: '{test_input}' → Output: {output}")
                 results.append({
                     "input": test_input,
                     "output": output,
                     "status": "success"
                 })
             else:
-                print(f"  Input: '{test_input}' → Error: {result['response'].get('error')}")
+                self.reporter.detail(f"  Input: '{test_input}' → Error: {result['response'].get('error')}")
                 results.append({
                     "input": test_input,
                     "output": None,
@@ -244,7 +259,7 @@ class WorkingAPITester:
     
     def analyze_alpha_patterns(self, results: List[Dict]):
         """Analyze patterns in /alpha endpoint responses"""
-        print("\n📊 Analyzing /alpha patterns:")
+        self.reporter.summary("\n📊 Analyzing /alpha patterns:")
         
         # Check for alphabetical patterns
         alpha_true = 0
@@ -266,85 +281,98 @@ class WorkingAPITester:
                     else:
                         non_alpha_false += 1
         
-        print(f"  Alphabetic strings - True: {alpha_true}, False: {alpha_false}")
-        print(f"  Non-alphabetic strings - True: {non_alpha_true}, False: {non_alpha_false}")
+        self.reporter.summary(f"  Alphabetic strings - True: {alpha_true}, False: {alpha_false}")
+        self.reporter.summary(f"  Non-alphabetic strings - True: {non_alpha_true}, False: {non_alpha_false}")
         
         # Check for specific patterns
         if alpha_true > 0 and non_alpha_false > 0:
-            print("  ✅ Pattern: Returns true for alphabetic strings only")
+            self.reporter.summary("  ✅ Pattern: Returns true for alphabetic strings only")
         else:
-            print("  ❓ Pattern not immediately obvious - needs more investigation")
+            answered = [r for r in results if r["status"] == "success" and r["output"] is not None]
+            induced = explain("/alpha", [r["input"] for r in answered], [r["output"] for r in answered])
+            if induced is None:
+                self.reporter.summary("  ❓ Pattern not immediately obvious - needs more investigation")
+            else:
+                for line in format_rules(induced):
+                    self.reporter.summary(f"  🧠 {line}")
     
     def analyze_patterns(self):
         """Analyze patterns in the collected results"""
-        print("\n📊 Pattern Analysis")
-        print("=" * 50)
+        self.reporter.summary("\n📊 Pattern Analysis")
+        self.reporter.summary("=" * 50)
         
         # Analyze /data patterns
         if "data" in self.results:
-            print("\n📊 /data endpoint patterns:")
+            self.reporter.summary("\n📊 /data endpoint patterns:")
             data_results = [r for r in self.results["data"] if r["status"] == "success"]
             if data_results:
-                print(f"  - {len(data_results)} successful responses")
-                print(f"  - Output type: {type(data_results[0]['output']).__name__}")
+                self.reporter.summary(f"  - {len(data_results)} successful responses")
+                self.reporter.summary(f"  - Output type: {type(data_results[0]['output']).__name__}")
                 # Check if it's a hash function
                 for result in data_results[:3]:  # Check first 3
                     input_str = result["input"]
                     output = result["output"]
-                    print(f"  - '{input_str}' → {output}")
+                    self.reporter.detail(f"  - '{input_str}' → {output}")
         
         # Analyze /fizzbuzz patterns
         if "fizzbuzz" in self.results:
-            print("\n🎯 /fizzbuzz endpoint patterns:")
+            self.reporter.summary("\n🎯 /fizzbuzz endpoint patterns:")
             fizzbuzz_results = [r for r in self.results["fizzbuzz"] if r["status"] == "success"]
             if fizzbuzz_results:
                 true_count = sum(1 for r in fizzbuzz_results if r["output"] is True)
                 false_count = sum(1 for r in fizzbuzz_results if r["output"] is False)
-                print(f"  - True responses: {true_count}")
-                print(f"  - False responses: {false_count}")
+                self.reporter.summary(f"  - True responses: {true_count}")
+                self.reporter.summary(f"  - False responses: {false_count}")
                 
                 # Check for FizzBuzz pattern
                 for result in fizzbuzz_results:
                     if result["output"] is True:
-                        print(f"  - TRUE for: '{result['input']}'")
+                        self.reporter.detail(f"  - TRUE for: '{result['input']}'")
         
         # Analyze /zap patterns
         if "zap" in self.results:
-            print("\n⚡ /zap endpoint patterns:")
+            self.reporter.summary("\n⚡ /zap endpoint patterns:")
             zap_results = [r for r in self.results["zap"] if r["status"] == "success"]
             if zap_results:
                 echo_count = sum(1 for r in zap_results if r["input"] == r["output"])
-                print(f"  - Echo responses: {echo_count}/{len(zap_results)}")
+                self.reporter.summary(f"  - Echo responses: {echo_count}/{len(zap_results)}")
                 if echo_count == len(zap_results):
-                    print("  - ✅ Perfect echo function confirmed!")
+                    self.reporter.summary("  - ✅ Perfect echo function confirmed!")
         
         # Analyze /glitch patterns
         if "glitch" in self.results:
-            print("\n⚡ /glitch endpoint patterns:")
+            self.reporter.summary("\n⚡ /glitch endpoint patterns:")
             glitch_results = [r for r in self.results["glitch"] if r["status"] == "success"]
             if glitch_results:
                 true_count = sum(1 for r in glitch_results if r["output"] is True)
                 false_count = sum(1 for r in glitch_results if r["output"] is False)
-                print(f"  - True responses: {true_count}")
-                print(f"  - False responses: {false_count}")
+                self.reporter.summary(f"  - True responses: {true_count}")
+                self.reporter.summary(f"  - False responses: {false_count}")
                 
                 # Check for length-based patterns
                 for result in glitch_results:
                     if result["output"] is True:
-                        print(f"  - TRUE for length {len(result['input'])}: '{result['input']}'")
+                        self.reporter.detail(f"  - TRUE for length {len(result['input'])}: '{result['input']}'")
     
     def run_comprehensive_test(self):
         """Run comprehensive tests on all endpoints"""
-        print("🚀 Starting comprehensive API testing...")
-        print("=" * 60)
+        self.reporter.summary("🚀 Starting comprehensive API testing...")
+        self.reporter.summary("=" * 60)
+        
+        # Sample /time in the background while the other endpoints are tested
+        time_sampler = TimeSampler.background(self.transport).start()
         
         # Test all endpoints
-        self.results["data"] = self.test_data_endpoint()
-        self.results["time"] = self.test_time_endpoint()
-        self.results["fizzbuzz"] = self.test_fizzbuzz_endpoint()
-        self.results["glitch"] = self.test_glitch_endpoint()
-        self.results["zap"] = self.test_zap_endpoint()
-        self.results["alpha"] = self.test_alpha_endpoint()
+        try:
+            self.results["data"] = self.test_data_endpoint()
+            self.results["fizzbuzz"] = self.test_fizzbuzz_endpoint()
+            self.results["glitch"] = self.test_glitch_endpoint()
+            self.results["zap"] = self.test_zap_endpoint()
+            self.results["alpha"] = self.test_alpha_endpoint()
+        except BaseException:
+            time_sampler.stop(min_samples=0)
+            raise
+        self.results["time"] = self.test_time_endpoint(time_sampler)
         
         # Analyze patterns
         self.analyze_patterns()
@@ -354,25 +382,29 @@ class WorkingAPITester:
     
     def generate_summary(self):
         """Generate a summary of findings"""
-        print("\n📋 Summary of Findings")
-        print("=" * 50)
+        self.reporter.summary("\n📋 Summary of Findings")
+        self.reporter.summary("=" * 50)
         
         total_endpoints = len(self.results)
         successful_endpoints = sum(1 for endpoint, results in self.results.items() 
                                  if any(r["status"] == "success" for r in results))
         
-        print(f"Endpoints tested: {total_endpoints}")
-        print(f"Endpoints with successful responses: {successful_endpoints}")
+        self.reporter.summary(f"Endpoints tested: {total_endpoints}")
+        self.reporter.summary(f"Endpoints with successful responses: {successful_endpoints}")
+        if self.transport.memo is not None:
+            self.reporter.summary(f"Duplicate requests saved: {self.transport.memo.saved}")
         
         for endpoint, results in self.results.items():
             success_count = sum(1 for r in results if r["status"] == "success")
             error_count = sum(1 for r in results if r["status"] == "error")
-            print(f"\n{endpoint}: {success_count} success, {error_count} errors")
+            self.reporter.summary(f"\n{endpoint}: {success_count} success, {error_count} errors")
             
             if success_count > 0:
                 # Show sample successful response
                 sample = next(r for r in results if r["status"] == "success")
-                print(f"  Sample: '{sample['input']}' → {sample['output']}")
+                label = sample["input"] if "input" in sample else f"call {sample['call']}"
+                self.reporter.detail(f"  Sample: '{label}' → {sample['output']}")
+        report_latency(self.transport, self.reporter)
 
 if __name__ == "__main__":
     tester = WorkingAPITester()